@@ -1,5 +1,5 @@
 import os
-from typing import Any, ClassVar
+from typing import Any, ClassVar, Literal
 
 from asyncpg.exceptions import \
     ConnectionDoesNotExistError as PGConnectionDoesNotExistError
@@ -81,6 +81,14 @@ class Settings(BaseSettings):
     login_url: str = "/api/v1/auth/users/login"
     token_revoke: ClassVar[bytes] = b"revoked"
     token_active: ClassVar[bytes] = b"active"
+    # Набор (ZSET) отпечатков отозванных токенов со временем их истечения
+    revoked_tokens_key: str = Field(
+        "revoked_tokens", alias="REVOKED_TOKENS_KEY"
+    )
+    # Канал Redis pub/sub для уведомления других сервисов об отзыве токенов
+    token_revocation_channel: str = Field(
+        "auth:tokens:revoked", alias="TOKEN_REVOCATION_CHANNEL"
+    )
     secret_key: str = Field(default="practix", alias="SECRET_KEY")
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 15
@@ -88,6 +96,27 @@ class Settings(BaseSettings):
 
     rate_limit: int = Field(5, alias="RATE_LIMIT")
     rate_limit_window: int = Field(60, alias="RATE_LIMIT_WINDOW")
+    # Стратегия RateLimit: fixed_window, sliding_window или token_bucket
+    rate_limit_strategy: Literal[
+        "fixed_window", "sliding_window", "token_bucket"
+    ] = Field("sliding_window", alias="RATE_LIMIT_STRATEGY")
+    # Локальные маркерные вёдра с пакетной синхронизацией в Redis (только
+    # для стратегии sliding_window)
+    rate_limit_local_enabled: bool = Field(
+        False, alias="RATE_LIMIT_LOCAL_ENABLED"
+    )
+    # Количество воркеров всех экземпляров сервиса: лимит делится между
+    # их локальными вёдрами
+    rate_limit_local_workers: int = Field(
+        1, alias="RATE_LIMIT_LOCAL_WORKERS"
+    )
+    rate_limit_sync_interval: float = Field(
+        0.2, alias="RATE_LIMIT_SYNC_INTERVAL"
+    )
+    rate_limit_hot_ratio: float = Field(0.8, alias="RATE_LIMIT_HOT_RATIO")
+    redis_rate_limit_max_connections: int = Field(
+        50, alias="REDIS_RATE_LIMIT_MAX_CONNECTIONS"
+    )
 
     @computed_field
     @property
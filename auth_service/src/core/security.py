@@ -1,3 +1,4 @@
+import hashlib
 from datetime import UTC, datetime, timedelta
 from typing import Any
 from uuid import UUID
@@ -66,3 +67,12 @@ def verify_token(token: str) -> dict:
                     detail="Invalid token"
                 )
         return payload
+
+
+def token_fingerprint(token: str) -> str:
+    """
+    Отпечаток токена (SHA-256): идентификатор токена в наборе отозванных
+    токенов, по которому другие сервисы проверяют отзыв без хранения и
+    передачи самого токена.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
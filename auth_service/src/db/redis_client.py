@@ -1,5 +1,4 @@
 import logging
-from contextlib import asynccontextmanager
 
 from redis.asyncio import Redis
 from redis.exceptions import ConnectionError
@@ -11,6 +10,7 @@ from src.services.auth_service import AuthService
 logger = logging.getLogger(__name__)
 
 redis_auth: AuthService | None = None
+redis_rate_limit: Redis | None = None
 
 
 async def get_redis_auth() -> AuthService:
@@ -44,21 +44,30 @@ async def get_redis_auth() -> AuthService:
     return redis_auth
 
 
-@asynccontextmanager
-async def redis_client_by_rate_limit():
+def get_redis_rate_limit() -> Redis:
     """
-    Асинхронный контекстный менеджер Redis для RateLimit.
+    Возвращает общий клиент Redis для RateLimit. Соединения берутся из пула
+    клиента и переиспользуются между запросами.
 
-    @rtype: AsyncGenerator[Redis | None | Redis[bytes], Any]
+    @rtype: Redis
     @return: redis_client
     """
-    redis_client = Redis.from_url(url=settings.redis_rate_limit_url)
+    global redis_rate_limit
+
+    if redis_rate_limit is None:
+        redis_rate_limit = Redis.from_url(
+            url=settings.redis_rate_limit_url,
+            max_connections=settings.redis_rate_limit_max_connections,
+        )
+
+    return redis_rate_limit
 
-    try:
-        if not await redis_client.ping():
-            raise ConnectionError("Redis недоступен!")
 
-        yield redis_client
+async def close_redis_rate_limit() -> None:
+    """Закрытие пула соединений клиента Redis для RateLimit."""
+    global redis_rate_limit
 
-    finally:
-        await redis_client.close()
+    if redis_rate_limit is not None:
+        await redis_rate_limit.close()
+        await redis_rate_limit.connection_pool.disconnect()
+        redis_rate_limit = None
@@ -10,7 +10,7 @@ from src.api.v1 import healthcheck, user, user_role, validate
 from src.api.internal.v1 import user as internal_user
 from src.core.config import settings
 from src.db.postgres import async_session
-from src.db.redis_client import get_redis_auth
+from src.db.redis_client import close_redis_rate_limit, get_redis_auth
 from src.dependencies import check_request_id
 from src.middleware import AsyncRateLimitMiddleware
 
@@ -93,6 +93,9 @@ async def shutdown():
     if redis_auth:
         await redis_auth.close()
 
+    # Закрытие пула соединений с Redis для RateLimit
+    await close_redis_rate_limit()
+
 
 # Подключение Route - внешних
 api_router.include_router(
@@ -1,11 +1,12 @@
 import logging
 from datetime import UTC, datetime
 
+import orjson
 from redis.asyncio import Redis
 
 from src.core.config import settings
 from src.core.exceptions import RedisUnavailable
-from src.core.security import verify_token
+from src.core.security import token_fingerprint, verify_token
 from src.utils.decorators import with_retry
 
 logger = logging.getLogger(__name__)
@@ -102,6 +103,54 @@ class AuthService:
 
             if ttl > 0:
                 await self.set(token, settings.token_revoke, ttl, log_info)
+                await self.add_to_revoked_set(token, int(exp), log_info)
+
+    @with_retry()
+    async def add_to_revoked_set(
+        self, token: str, exp: int, log_info: str = ""
+    ) -> None:
+        """
+        Добавляет отпечаток токена в набор отозванных токенов (ZSET, score -
+        время истечения токена), удаляет из набора истёкшие токены и
+        публикует уведомление об отзыве в канал token_revocation_channel.
+
+        Набор используется другими сервисами для локальной проверки токенов
+        без обращения к auth-сервису, а уведомление - для удаления токена из
+        их in-process кешей проверенных токенов.
+        """
+        fingerprint = token_fingerprint(token)
+        logger.debug(
+            "Добавление токена в набор отозванных: fingerprint=%s. %s",
+            fingerprint, log_info
+        )
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.zadd(settings.revoked_tokens_key, {fingerprint: exp})
+                pipe.zremrangebyscore(
+                    settings.revoked_tokens_key,
+                    "-inf",
+                    int(datetime.now(UTC).timestamp()),
+                )
+                pipe.publish(
+                    settings.token_revocation_channel,
+                    orjson.dumps({
+                        "sender": "auth", "keys": [f"token:{fingerprint}"]
+                    }),
+                )
+                await pipe.execute()
+
+        except settings.redis_exceptions as e:
+            logger.error(
+                "Ошибка при добавлении токена в набор отозванных: "
+                "fingerprint=%s, error=%s. %s",
+                fingerprint, e, log_info
+            )
+            raise RedisUnavailable()
+
+        logger.info(
+            "Токен добавлен в набор отозванных: fingerprint=%s. %s",
+            fingerprint, log_info
+        )
 
     async def close(self):
         """Закрывает соединение с Redis."""
@@ -20,6 +20,21 @@ class Settings(BaseSettings):
     redis_password: str = Field(default="password", alias="REDIS_PASSWORD")
     redis_db_movies: int = Field(default=3, alias="REDIS_ETL_DB_MOVIES")
     redis_db_events: int = Field(default=4, alias="REDIS_ETL_DB_EVENTS")
+    # БД Redis кеша movies_service (материализованные топ-списки фильмов)
+    redis_db_movies_cache: int = Field(
+        default=1, alias="REDIS_MOVIES_CACHE_DB"
+    )
+    # Поток изменений индексов для инвалидации кеша movies_service
+    movies_cache_changes_stream: str = Field(
+        default="movies:cache:changes", alias="CACHE_CHANGES_STREAM"
+    )
+    movies_cache_changes_stream_maxlen: int = Field(
+        default=10000, alias="CACHE_CHANGES_STREAM_MAXLEN"
+    )
+    # Максимальное количество ID в одном сообщении потока изменений
+    movies_cache_changes_message_size: int = Field(
+        default=500, alias="CACHE_CHANGES_MESSAGE_SIZE"
+    )
 
     elastic_schema: str = Field(default="film_work", alias="ELASTIC_SCHEME")
     elastic_name: str = Field(default="elastic", alias="ELASTIC_USERNAME")
@@ -73,6 +88,48 @@ class Settings(BaseSettings):
     etl_events_select_limit: int = Field(
         default=2 * 250, alias="ETL_EVENTS_SELECT_LIMIT"
     )
+    # Размер пачки сообщений потоков этапов ETL (чтение и подтверждение)
+    etl_movies_stream_batch_size: int = Field(
+        default=500, alias="ETL_MOVIES_STREAM_BATCH_SIZE"
+    )
+    # Допустимое количество пачек необработанных сообщений модели в потоках
+    # этапов ETL; при превышении Producer и Fanout ждут их обработки
+    etl_movies_stream_max_pending_batches: int = Field(
+        default=4, alias="ETL_MOVIES_STREAM_MAX_PENDING_BATCHES"
+    )
+    # Имя потребителя в группах потоков этапов ETL (не подтверждённые
+    # сообщения перечитываются тем же потребителем после перезапуска)
+    etl_movies_stream_consumer: str = Field(
+        default="etl", alias="ETL_MOVIES_STREAM_CONSUMER"
+    )
+    # Распространение изменений персон и жанров на фильмы: количество ID
+    # персон/жанров на запрос связей и ограничение количества фильмов,
+    # отправляемых на повторное обогащение за один запуск
+    etl_movies_fanout_batch_size: int = Field(
+        default=500, alias="ETL_MOVIES_FANOUT_BATCH_SIZE"
+    )
+    etl_movies_fanout_films_per_run: int = Field(
+        default=1000, alias="ETL_MOVIES_FANOUT_FILMS_PER_RUN"
+    )
+    # Загрузка в ES через _bulk API: размер пачки (документов и байт),
+    # количество одновременных запросов, повторы элементов с ошибкой
+    etl_es_bulk_chunk_size: int = Field(
+        default=500, alias="ETL_ES_BULK_CHUNK_SIZE"
+    )
+    etl_es_bulk_max_bytes: int = Field(
+        default=10 * 1024 * 1024, alias="ETL_ES_BULK_MAX_BYTES"
+    )
+    etl_es_bulk_concurrency: int = Field(
+        default=4, alias="ETL_ES_BULK_CONCURRENCY"
+    )
+    etl_es_bulk_retries: int = Field(default=3, alias="ETL_ES_BULK_RETRIES")
+    etl_es_bulk_retry_backoff: float = Field(
+        default=1.0, alias="ETL_ES_BULK_RETRY_BACKOFF"
+    )
+    # Размер топ-списков фильмов по жанрам (для страниц жанров)
+    etl_genre_top_size: int = Field(
+        default=1000, alias="ETL_GENRE_TOP_SIZE"
+    )
 
 
 config = Settings()
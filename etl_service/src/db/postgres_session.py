@@ -50,8 +50,18 @@ class AsyncScopedSession(BaseAsyncSession):
 
     @asynccontextmanager
     async def context_session(self):
-        session = self.scoped_session()
+        async with self._session_context(self.scoped_session()) as session:
+            yield session
+
+    def context_new_session(self):
+        """
+        Контекст отдельной сессии (не привязанной к текущей задаче asyncio):
+        для обработчиков, которые выполняются одновременно.
+        """
+        return self._session_context(self._async_session_factory())
 
+    @asynccontextmanager
+    async def _session_context(self, session):
         try:
             if not session:
                 raise RuntimeError("Session factory not initialized")
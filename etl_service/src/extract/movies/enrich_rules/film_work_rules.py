@@ -1,12 +1,14 @@
 import socket
+from collections import defaultdict
 
 from sqlalchemy import select
 
-from models.movies.pg_models import (FilmWork, Genre, GenreFilmWork, Person,
+from models.movies.pg_models import (Genre, GenreFilmWork, Person,
                                      PersonFilmWork)
 from schemas.movies_schemas.film_work_models import (FilmWorkModel, GenreModel,
                                                      PersonModel)
 from utils import backoff_by_connection
+from utils.movies_utils.pg_utils import any_of_ids
 
 
 class FilmWorkRules:
@@ -16,52 +18,57 @@ class FilmWorkRules:
         exceptions=(ConnectionRefusedError, socket.gaierror)
     )
     async def film_work_selection_data_rule(
-        cls, pg_session, obj_id: int
-    ) -> dict:
+        cls, pg_session, obj_ids: list[str]
+    ) -> dict[str, dict]:
+        """
+        Сущности-связки пачки фильмов: один запрос на связь (персоны,
+        жанры) для всех ID пачки, строки группируются по ID фильма.
+        """
         query_person = await pg_session.execute(
             select(
-                FilmWork.id.label("film_work_id"),
+                PersonFilmWork.film_work_id.label("film_work_id"),
                 PersonFilmWork.role.label("person_role"),
                 Person.id.label("person_id"),
                 Person.full_name.label("person_full_name"),
             )
-            .join(
-                PersonFilmWork,
-                FilmWork.id == PersonFilmWork.film_work_id,
-            )
             .join(
                 Person,
                 PersonFilmWork.person_id == Person.id,
             )
             .where(
-                FilmWork.id == obj_id,
+                PersonFilmWork.film_work_id == any_of_ids(obj_ids),
             )
         )
 
         query_genre = await pg_session.execute(
             select(
-                FilmWork.id.label("film_work_id"),
+                GenreFilmWork.film_work_id.label("film_work_id"),
                 Genre.id.label("genre_id"),
                 Genre.name.label("genre_name"),
                 Genre.description.label("genre_description"),
             )
-            .join(
-                GenreFilmWork,
-                FilmWork.id == GenreFilmWork.film_work_id,
-            )
             .join(
                 Genre,
                 GenreFilmWork.genre_id == Genre.id,
             )
             .where(
-                FilmWork.id == obj_id,
+                GenreFilmWork.film_work_id == any_of_ids(obj_ids),
             )
         )
 
-        film_works_data = {
-            Person.model_name(): query_person.all(),
-            Genre.model_name(): query_genre.all(),
-        }
+        film_works_data = defaultdict(
+            lambda: {Person.model_name(): [], Genre.model_name(): []}
+        )
+
+        for row in query_person.all():
+            film_works_data[str(row.film_work_id)][
+                Person.model_name()
+            ].append(row)
+
+        for row in query_genre.all():
+            film_works_data[str(row.film_work_id)][
+                Genre.model_name()
+            ].append(row)
 
         return film_works_data
 
@@ -6,6 +6,7 @@ from sqlalchemy import select
 from models.movies.pg_models import PersonFilmWork
 from schemas.movies_schemas.person_models import FilmWorkModel, PersonModel
 from utils import backoff_by_connection
+from utils.movies_utils.pg_utils import any_of_ids
 
 
 class PersonRules:
@@ -15,20 +16,28 @@ class PersonRules:
         exceptions=(ConnectionRefusedError, socket.gaierror)
     )
     async def person_selection_data_rule(
-        cls, pg_session, obj_id: int
-    ) -> dict:
+        cls, pg_session, obj_ids: list[str]
+    ) -> dict[str, dict]:
+        """
+        Фильмы пачки персон одним запросом для всех ID пачки, строки
+        группируются по ID персоны.
+        """
         query_person_film_work = await pg_session.execute(
             select(
+                PersonFilmWork.person_id.label("person_id"),
                 PersonFilmWork.film_work_id.label("film_work_id"),
                 PersonFilmWork.role.label("person_role"),
             ).where(
-                PersonFilmWork.person_id == obj_id,
+                PersonFilmWork.person_id == any_of_ids(obj_ids),
             )
         )
 
-        persons_data = {
-            PersonFilmWork.model_name(): query_person_film_work.all(),
-        }
+        persons_data = defaultdict(lambda: {PersonFilmWork.model_name(): []})
+
+        for row in query_person_film_work.all():
+            persons_data[str(row.person_id)][
+                PersonFilmWork.model_name()
+            ].append(row)
 
         return persons_data
 
@@ -1,12 +1,13 @@
 import json
 
+from core import config
 from core.logger import logger
 from extract.movies.enrich_rules import FilmWorkRules, PersonRules
 from interface import ESClient_T, RedisStorage_T
 from models.movies.pg_models import Base as BaseModel
 from models.movies.pg_models import FilmWork, Person
-from schemas import Base as BaseSchema
-from utils.movies_utils.etl_enum import RuleTypes
+from utils.movies_utils.etl_enum import RuleTypes, StreamStages
+from utils.movies_utils.etl_streams import get_stream_name, stream_message
 
 
 class Enricher:
@@ -15,6 +16,8 @@ class Enricher:
     """
 
     CONCAT = 1
+    # Группа потребителей потоков этапа Producer
+    STREAM_GROUP = "enricher"
 
     def __init__(
         self,
@@ -60,66 +63,64 @@ class Enricher:
         Точка запуска. Этапы:
         - Получение правил для выборки и нормализации сущностей-связок по
         базовой модели из DB.
-        - Получение из Storage базовые сущности.
-        - Выборка и нормализация сущностей-связок из DB.
+        - Чтение пачками базовых сущностей из потока Storage (этап Producer).
+        - Выборка сущностей-связок из DB для всей пачки (один запрос на
+        связь) и их нормализация.
         - Связка базовой сущности с сущностями-связками.
-        - Сохранение данных в Storage.
+        - Запись пачки в поток следующего этапа и подтверждение прочитанных
+        сообщений.
 
         :return None:
         """
         for model_, rules in self.model_rules.items():
-            enrich_count = 0
+            enrich_count = read_count = 0
             selection_rule, enrich_rule = (
                 rules[RuleTypes.SELECTION_RULE.value],
                 rules[RuleTypes.ENRICH_RULE.value],
             )
 
             key_rule = self.get_key_of_rule(model_=model_)
-            scan_lst = await self.redis_storage.scan_iter(f"{key_rule}_*")
-
-            if scan_lst:
-                logger.info(
-                    f"{key_rule}: start enrich(count: {len(scan_lst)})"
-                )
+            stream_name = get_stream_name(
+                key_rule=key_rule, stage=StreamStages.PRODUCED
+            )
 
-            for obj_key_rule in scan_lst:
-                obj_ = await self._get_object_data_by_key_rule(
-                    obj_key_rule=obj_key_rule
+            async for batch in self.redis_storage.iter_stream_batches(
+                name=stream_name,
+                group=self.STREAM_GROUP,
+                consumer=config.etl_movies_stream_consumer,
+                count=config.etl_movies_stream_batch_size,
+            ):
+                read_count += len(batch)
+                enriched_values = []
+                selection_data = await selection_rule(
+                    pg_session=self.pg_session,
+                    obj_ids=list({fields["id"] for _, fields in batch}),
                 )
 
-                if obj_ and not obj_.get("was_enrich") and not obj_.get(
-                        "was_convert"
-                ):
-                    obj_id = obj_key_rule.split(f"{key_rule}_")[-1]
+                for _, fields in batch:
+                    obj_id, obj_ = fields["id"], json.loads(fields["data"])
 
-                    selection_data = await selection_rule(
-                        pg_session=self.pg_session, obj_id=obj_id
-                    )
                     enriched_data = await enrich_rule(
-                        obj_data=obj_, selection_data=selection_data
+                        obj_data=obj_,
+                        selection_data=selection_data.get(obj_id, {}),
                     )
 
-                    await self._save_enrich_data(
-                        obj_key_rule=obj_key_rule, enriched_data=enriched_data
-                    )
+                    enriched_values.append(stream_message(
+                        obj_id=obj_id, data=enriched_data.model_dump_json()
+                    ))
                     enrich_count += self.CONCAT
                     logger.debug(f"{key_rule}: id={obj_id} was enrich")
 
+                await self.redis_storage.move_stream_batch(
+                    name=stream_name,
+                    group=self.STREAM_GROUP,
+                    message_ids=[message_id for message_id, _ in batch],
+                    next_name=get_stream_name(
+                        key_rule=key_rule, stage=StreamStages.ENRICHED
+                    ),
+                    values=enriched_values,
+                )
+
             logger.info(
-                f"{key_rule}: was enrich({enrich_count} from {len(scan_lst)})"
+                f"{key_rule}: was enrich({enrich_count} from {read_count})"
             )
-
-    async def _get_object_data_by_key_rule(self, obj_key_rule: str) -> dict:
-        if obj_data := await self.redis_storage.retrieve_state(
-                key_=obj_key_rule
-        ):
-            obj_deserialize_data = json.loads(obj_data)
-
-            return obj_deserialize_data
-
-    async def _save_enrich_data(
-            self, obj_key_rule: str, enriched_data: BaseSchema
-    ):
-        await self.redis_storage.save_state(
-            key_=obj_key_rule, value=enriched_data.model_dump_json()
-        )
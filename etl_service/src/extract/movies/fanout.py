@@ -0,0 +1,161 @@
+from core import config
+from core.logger import logger
+from extract.movies.fanout_rules import DependencyRules
+from extract.movies.producer_rules import FilmWorkRules
+from interface import ESClient_T, RedisStorage_T, check_free_size_storage
+from models.movies.pg_models import Base as BaseModel
+from models.movies.pg_models import FilmWork, Genre, Person
+from schemas import Base as BaseSchema
+from utils.movies_utils.etl_enum import StreamStages
+from utils.movies_utils.etl_streams import (get_fanout_set_name,
+                                            get_stream_name, stream_message)
+
+
+class Fanout:
+    """
+    Класс по распространению изменений персон и жанров на фильмы.
+
+    В документах индекса film_work хранятся копии данных персон и жанров,
+    поэтому фильмы изменённых персон/жанров нужно обогатить повторно.
+    Producer добавляет ID изменённых персон/жанров в множества Storage;
+    Fanout находит их фильмы (одним запросом на пачку) и добавляет ID
+    фильмов в множество фильмов (повторные ID не добавляются). За один
+    запуск на повторное обогащение отправляется не более
+    etl_movies_fanout_films_per_run фильмов, остальные - при следующих
+    запусках.
+    """
+
+    def __init__(
+        self,
+        redis_storage: RedisStorage_T,
+        pg_session,
+        es_client: ESClient_T,
+    ):
+        self._redis_storage: RedisStorage_T = redis_storage
+        self._pg_session = pg_session
+        self._es_client: ESClient_T = es_client
+
+    @property
+    def redis_storage(self) -> RedisStorage_T:
+        return self._redis_storage
+
+    @property
+    def pg_session(self):
+        return self._pg_session
+
+    @property
+    def model_rules(self) -> dict:
+        return {
+            Person: DependencyRules.person_film_work_ids_rule,
+            Genre: DependencyRules.genre_film_work_ids_rule,
+        }
+
+    @staticmethod
+    def get_key_of_rule(model_: BaseModel) -> str:
+        return model_.model_name()
+
+    async def run(self) -> None:
+        """
+        Точка запуска. Этапы:
+        - Получение пачками ID изменённых персон/жанров из Storage.
+        - Выборка ID их фильмов из DB и добавление в множество фильмов.
+        - Выборка и нормализация ограниченного количества фильмов из
+        множества и сохранение их в поток Storage (этап Producer) для
+        повторного обогащения.
+
+        :return None:
+        """
+        for model_, film_work_ids_rule in self.model_rules.items():
+            await self._resolve_film_works(
+                model_=model_, film_work_ids_rule=film_work_ids_rule
+            )
+
+        await self._produce_film_works()
+
+    async def _resolve_film_works(
+        self, model_: BaseModel, film_work_ids_rule
+    ) -> None:
+        key_rule = self.get_key_of_rule(model_=model_)
+        set_name = get_fanout_set_name(key_rule=key_rule)
+        film_works_set_name = get_fanout_set_name(
+            key_rule=self.get_key_of_rule(model_=FilmWork)
+        )
+        resolve_count = add_count = 0
+
+        while obj_ids := await self.redis_storage.get_set_members(
+            name=set_name, count=config.etl_movies_fanout_batch_size
+        ):
+            film_work_ids = await film_work_ids_rule(
+                pg_session=self.pg_session, obj_ids=obj_ids
+            )
+            add_count += await self.redis_storage.add_to_set(
+                name=film_works_set_name, values=film_work_ids
+            )
+            await self.redis_storage.remove_from_set(
+                name=set_name, values=obj_ids
+            )
+            resolve_count += len(obj_ids)
+
+        if resolve_count:
+            logger.info(
+                f"{key_rule}: film works of changed objects were queued for "
+                f"enrich({add_count} new for {resolve_count} objects)"
+            )
+
+    async def _produce_film_works(self) -> None:
+        key_rule = self.get_key_of_rule(model_=FilmWork)
+        set_name = get_fanout_set_name(key_rule=key_rule)
+
+        if not (film_work_ids := await self.redis_storage.get_set_members(
+            name=set_name, count=config.etl_movies_fanout_films_per_run
+        )):
+            return
+
+        for i in range(
+            0, len(film_work_ids), config.etl_movies_select_limit
+        ):
+            ids_ = film_work_ids[i:i + config.etl_movies_select_limit]
+            selection_data = (
+                await DependencyRules.film_work_selection_data_rule(
+                    pg_session=self.pg_session, obj_ids=ids_
+                )
+            )
+
+            if selection_data:
+                await self._insert_data_in_storage(
+                    model_=FilmWork,
+                    normalized_data=(
+                        FilmWorkRules.film_work_normalize_data_rule(
+                            selection_data=selection_data
+                        )
+                    ),
+                )
+
+            await self.redis_storage.remove_from_set(
+                name=set_name, values=ids_
+            )
+
+        logger.info(
+            f"{key_rule}: dependent film works were produce"
+            f"({len(film_work_ids)})"
+        )
+
+    @check_free_size_storage()
+    async def _insert_data_in_storage(
+        self,
+        model_: BaseModel,
+        normalized_data: list[BaseSchema],
+    ) -> None:
+        key_rule = self.get_key_of_rule(model_=model_)
+
+        await self.redis_storage.add_batch_to_stream(
+            name=get_stream_name(
+                key_rule=key_rule, stage=StreamStages.PRODUCED
+            ),
+            values=[
+                stream_message(
+                    obj_id=str(data_.id), data=data_.model_dump_json()
+                )
+                for data_ in normalized_data
+            ],
+        )
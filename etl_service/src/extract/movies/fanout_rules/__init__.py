@@ -0,0 +1 @@
+from .dependency_rules import DependencyRules
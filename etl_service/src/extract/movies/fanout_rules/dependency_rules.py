@@ -0,0 +1,55 @@
+import socket
+
+from sqlalchemy import select
+
+from models.movies.pg_models import FilmWork, GenreFilmWork, PersonFilmWork
+from utils import backoff_by_connection
+from utils.movies_utils.pg_utils import any_of_ids
+
+
+class DependencyRules:
+
+    @classmethod
+    @backoff_by_connection(
+        exceptions=(ConnectionRefusedError, socket.gaierror)
+    )
+    async def person_film_work_ids_rule(
+        cls, pg_session, obj_ids: list[str]
+    ) -> list[str]:
+        """ID фильмов пачки персон (одним запросом)."""
+        query_ = await pg_session.scalars(
+            select(PersonFilmWork.film_work_id)
+            .where(PersonFilmWork.person_id == any_of_ids(obj_ids))
+            .distinct()
+        )
+
+        return [str(film_work_id) for film_work_id in query_.all()]
+
+    @classmethod
+    @backoff_by_connection(
+        exceptions=(ConnectionRefusedError, socket.gaierror)
+    )
+    async def genre_film_work_ids_rule(
+        cls, pg_session, obj_ids: list[str]
+    ) -> list[str]:
+        """ID фильмов пачки жанров (одним запросом)."""
+        query_ = await pg_session.scalars(
+            select(GenreFilmWork.film_work_id)
+            .where(GenreFilmWork.genre_id == any_of_ids(obj_ids))
+            .distinct()
+        )
+
+        return [str(film_work_id) for film_work_id in query_.all()]
+
+    @classmethod
+    @backoff_by_connection(
+        exceptions=(ConnectionRefusedError, socket.gaierror)
+    )
+    async def film_work_selection_data_rule(
+        cls, pg_session, obj_ids: list[str]
+    ) -> list[FilmWork]:
+        query_ = await pg_session.scalars(
+            select(FilmWork).where(FilmWork.id == any_of_ids(obj_ids))
+        )
+
+        return query_.all()
@@ -1,8 +1,10 @@
 import socket
 from datetime import datetime
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import func, select
 
+from core import config
 from core.logger import logger
 from extract.movies.producer_rules import (FilmWorkRules, GenreRules,
                                            PersonRules)
@@ -11,13 +13,22 @@ from models.movies.pg_models import (BaseWithTimeStampedType, FilmWork, Genre,
                                      Person)
 from schemas import Base as BaseSchema
 from utils import EntitiesNotFoundInDBError, backoff_by_connection
-from utils.movies_utils.etl_enum import RuleTypes
+from utils.movies_utils.etl_enum import RuleTypes, StreamStages
+from utils.movies_utils.etl_streams import (get_fanout_set_name,
+                                            get_stream_name, stream_message)
+
+# Водяной знак выборки изменений: (modified, id) последней выбранной записи
+WATERMARK_SEPARATOR = "|"
+# Наименьший UUID: начальный водяной знак включает все записи с modified
+MIN_UUID = UUID(int=0)
 
 
 class Producer:
     """Класс по получению данных базовых сущностей из DB."""
 
-    DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+    # Модели, копии данных которых хранятся в документах фильмов: ID
+    # изменённых записей передаются этапу Fanout
+    FANOUT_MODELS = (Person, Genre)
 
     def __init__(
         self,
@@ -64,20 +75,33 @@ class Producer:
     def get_key_of_rule(model_: BaseWithTimeStampedType) -> str:
         return model_.model_name()
 
-    def str_to_datetime(self, datetime_str: str) -> datetime:
-        return datetime.strptime(datetime_str, self.DATETIME_FORMAT)
+    @staticmethod
+    def watermark_to_str(date_modified: datetime, last_id: UUID) -> str:
+        return f"{date_modified.isoformat()}{WATERMARK_SEPARATOR}{last_id}"
+
+    @staticmethod
+    def str_to_watermark(watermark_str: str) -> tuple[datetime, UUID]:
+        """
+        Водяной знак из Storage. Значение старого формата (только дата
+        modified) соответствует условию modified >= даты.
+        """
+        date_str, _, last_id = watermark_str.partition(WATERMARK_SEPARATOR)
 
-    def datetime_to_str(self, datetime_: datetime) -> str:
-        return datetime.strftime(datetime_, self.DATETIME_FORMAT)
+        return (
+            datetime.fromisoformat(date_str),
+            UUID(last_id) if last_id else MIN_UUID,
+        )
 
     async def run(self) -> None:
         """
         Точка запуска. Этапы:
         - Получение правил для выборки и нормализации данных по модели из DB.
-        - Получение date_modified.
-        - Выборка и нормализация данных из DB.
-        - Сохранение данных в Storage.
-        - Обновление date_modified для модели DB.
+        - Получение водяного знака (modified, id).
+        - Выборка и нормализация страницы данных после водяного знака.
+        - Сохранение данных в Storage (ID изменённых персон/жанров - также
+        для распространения изменений на фильмы).
+        - Сдвиг водяного знака на последнюю запись страницы.
+        - Повтор, пока изменения модели не будут выбраны полностью.
 
         :return None:
         """
@@ -86,69 +110,91 @@ class Producer:
             normalize_rule = rules[RuleTypes.NORMALIZE_RULE.value]
 
             try:
-                date_modified = await self._get_date_modified(model_=model_)
+                (
+                    date_modified, last_id, initial_load
+                ) = await self._get_watermark(model_=model_)
 
             except EntitiesNotFoundInDBError as ex:
                 logger.warning(f"{ex} (model was skip)")
                 continue
 
-            if selection_data := await selection_rule(
-                pg_session=self.pg_session, date_modified=date_modified
+            produce_count = 0
+            # При начальной выгрузке фильмы выгружаются полностью, поэтому
+            # изменения персон/жанров на фильмы не распространяются
+            need_fanout = model_ in self.FANOUT_MODELS and not initial_load
+
+            while selection_data := await selection_rule(
+                pg_session=self.pg_session,
+                date_modified=date_modified,
+                last_id=last_id,
             ):
                 logger.info(
-                    f"{model_.model_name()}, received date modified: "
-                    f"{date_modified}"
+                    f"{model_.model_name()}, received watermark: "
+                    f"({date_modified}, {last_id})"
                 )
 
                 normalized_data = normalize_rule(selection_data=selection_data)
                 logger.debug(
                     f"{model_.model_name()}, select and normalize data for "
-                    f"date modified: {date_modified}"
+                    f"watermark: ({date_modified}, {last_id})"
                 )
 
                 await self._insert_data_in_storage(
                     model_=model_, normalized_data=normalized_data
                 )
-                await self._update_date_modified(
+                if need_fanout:
+                    await self.redis_storage.add_to_set(
+                        name=get_fanout_set_name(
+                            key_rule=self.get_key_of_rule(model_=model_)
+                        ),
+                        values=[str(d.id) for d in selection_data],
+                    )
+
+                date_modified, last_id = await self._update_watermark(
                     model_=model_, selection_data=selection_data
                 )
+                produce_count += len(selection_data)
 
-                logger.info(
+                logger.debug(
                     f"{model_.model_name()}, ids({len(selection_data)})="
                     f"{[d.id for d in selection_data]} was produce"
                 )
 
+                # Неполная страница: изменений после неё нет
+                if len(selection_data) < config.etl_movies_select_limit:
+                    break
+
+            if produce_count:
+                logger.info(
+                    f"{model_.model_name()}, was produce({produce_count})"
+                )
+
             else:
                 logger.info(
                     f"{model_.model_name()}, not found data for modified"
                 )
 
-    async def _get_date_modified(
+    async def _get_watermark(
             self, model_: BaseWithTimeStampedType
-    ) -> datetime:
+    ) -> tuple[datetime, UUID, bool]:
         """
-        Получение modified по модели из DB. Если данной информации по модели
-        нет в Storage, получаем ее из DB и записываем в Storage.
+        Получение водяного знака (modified, id) по модели. Если данной
+        информации по модели нет в Storage (начальная выгрузка), начальный
+        водяной знак - минимальный modified модели в DB; в Storage
+        записывается водяной знак первой выбранной страницы.
 
         :param BaseWithTimeStampedType model_:
-        :return datetime date_modified:
+        :return tuple[datetime, UUID, bool]: водяной знак и признак
+        начальной выгрузки
         """
         key_rule = self.get_key_of_rule(model_=model_)
 
-        if date_from_storage := await self.redis_storage.get_(name=key_rule):
-            date_modified = self.str_to_datetime(
-                datetime_str=date_from_storage
-            )
+        if watermark_str := await self.redis_storage.get_(name=key_rule):
+            return *self.str_to_watermark(watermark_str=watermark_str), False
 
-        else:
-            date_modified = await self._get_date_modified_from_db(
-                model_=model_
-            )
-            await self._set_date_modified(
-                key_rule=key_rule, date_modified=date_modified
-            )
+        date_modified = await self._get_date_modified_from_db(model_=model_)
 
-        return date_modified
+        return date_modified, MIN_UUID, True
 
     @backoff_by_connection(
         exceptions=(ConnectionRefusedError, socket.gaierror)
@@ -156,40 +202,44 @@ class Producer:
     async def _get_date_modified_from_db(
         self, model_: BaseWithTimeStampedType
     ) -> datetime:
-        query_ = await self.pg_session.execute(
-            select(model_).order_by(model_.modified.asc())
+        date_modified = await self.pg_session.scalar(
+            select(func.min(model_.modified))
         )
-        last_modified_entity = query_.scalar()
 
-        if not last_modified_entity:
+        if not date_modified:
             raise EntitiesNotFoundInDBError(message=(
                 f"not found records in DB for model '{model_.model_name()}'"
             ))
 
-        return last_modified_entity.modified
-
-    async def _update_date_modified(
-        self, model_: BaseWithTimeStampedType, selection_data: list[BaseSchema]
-    ) -> None:
-        ord_selection_data = sorted(
-            selection_data, key=lambda d: d.modified, reverse=False
-        )
+        return date_modified
 
-        date_modified, key_rule = ord_selection_data[-1].modified
+    async def _update_watermark(
+        self, model_: BaseWithTimeStampedType, selection_data: list
+    ) -> tuple[datetime, UUID]:
+        """Водяной знак - последняя запись страницы (в порядке выборки)."""
+        last_entity = selection_data[-1]
         key_rule = self.get_key_of_rule(model_=model_)
-        await self._set_date_modified(
-            key_rule=key_rule, date_modified=date_modified
+        await self._set_watermark(
+            key_rule=key_rule,
+            date_modified=last_entity.modified,
+            last_id=last_entity.id,
         )
 
         logger.debug(
-            f"{model_.model_name()}: set new date modified({date_modified})"
+            f"{model_.model_name()}: set new watermark"
+            f"({last_entity.modified}, {last_entity.id})"
         )
 
-    async def _set_date_modified(
-            self, key_rule: str, date_modified: datetime
+        return last_entity.modified, last_entity.id
+
+    async def _set_watermark(
+            self, key_rule: str, date_modified: datetime, last_id: UUID
     ) -> None:
         await self.redis_storage.set_(
-            name=key_rule, value=self.datetime_to_str(datetime_=date_modified)
+            name=key_rule,
+            value=self.watermark_to_str(
+                date_modified=date_modified, last_id=last_id
+            ),
         )
 
     @check_free_size_storage()
@@ -200,11 +250,17 @@ class Producer:
     ) -> None:
         key_rule = self.get_key_of_rule(model_=model_)
 
-        for data_ in normalized_data:
-            key_ = "{}_{}".format(key_rule, data_.id)
-            await self.redis_storage.save_state(
-                key_=key_, value=data_.model_dump_json()
-            )
+        await self.redis_storage.add_batch_to_stream(
+            name=get_stream_name(
+                key_rule=key_rule, stage=StreamStages.PRODUCED
+            ),
+            values=[
+                stream_message(
+                    obj_id=str(data_.id), data=data_.model_dump_json()
+                )
+                for data_ in normalized_data
+            ],
+        )
 
         logger.debug(
             f"{model_.model_name()}: normalized data was insert in storage"
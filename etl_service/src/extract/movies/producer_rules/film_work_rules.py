@@ -1,7 +1,8 @@
 import socket
 from datetime import datetime
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 
 from core import config
 from models.movies.pg_models import FilmWork
@@ -16,14 +17,22 @@ class FilmWorkRules:
         exceptions=(ConnectionRefusedError, socket.gaierror)
     )
     async def film_work_selection_data_rule(
-        cls, pg_session, date_modified: datetime
+        cls, pg_session, date_modified: datetime, last_id: UUID
     ) -> list[FilmWork]:
+        """
+        Страница записей после водяного знака (modified, id) в порядке
+        (modified, id) (keyset-пагинация): записи с одинаковым modified не
+        читаются повторно и не пропускаются.
+        """
         limit = config.etl_movies_select_limit
 
         query_ = await pg_session.scalars(
             select(FilmWork)
-            .where(FilmWork.modified >= date_modified)
-            .order_by(FilmWork.modified)
+            .where(
+                tuple_(FilmWork.modified, FilmWork.id)
+                > (date_modified, last_id)
+            )
+            .order_by(FilmWork.modified, FilmWork.id)
             .limit(limit)
         )
         film_works = query_.all()
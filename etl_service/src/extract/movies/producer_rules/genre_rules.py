@@ -1,7 +1,8 @@
 import socket
 from datetime import datetime
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 
 from core import config
 from models.movies.pg_models import Genre
@@ -16,14 +17,22 @@ class GenreRules:
         exceptions=(ConnectionRefusedError, socket.gaierror)
     )
     async def genre_selection_data_rule(
-        cls, pg_session, date_modified: datetime
+        cls, pg_session, date_modified: datetime, last_id: UUID
     ) -> list[Genre]:
+        """
+        Страница записей после водяного знака (modified, id) в порядке
+        (modified, id) (keyset-пагинация): записи с одинаковым modified не
+        читаются повторно и не пропускаются.
+        """
         limit = config.etl_movies_select_limit
 
         query_ = await pg_session.scalars(
             select(Genre)
-            .where(Genre.modified >= date_modified)
-            .order_by(Genre.modified)
+            .where(
+                tuple_(Genre.modified, Genre.id)
+                > (date_modified, last_id)
+            )
+            .order_by(Genre.modified, Genre.id)
             .limit(limit)
         )
         genres = query_.all()
@@ -1,7 +1,8 @@
 import socket
 from datetime import datetime
+from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, tuple_
 
 from core import config
 from models.movies.pg_models import Person
@@ -16,16 +17,22 @@ class PersonRules:
         exceptions=(ConnectionRefusedError, socket.gaierror)
     )
     async def person_selection_data_rule(
-        cls,
-        pg_session,
-        date_modified: datetime,
+        cls, pg_session, date_modified: datetime, last_id: UUID
     ) -> list[Person]:
+        """
+        Страница записей после водяного знака (modified, id) в порядке
+        (modified, id) (keyset-пагинация): записи с одинаковым modified не
+        читаются повторно и не пропускаются.
+        """
         limit = config.etl_movies_select_limit
 
         query_ = await pg_session.scalars(
             select(Person)
-            .where(Person.modified >= date_modified)
-            .order_by(Person.modified)
+            .where(
+                tuple_(Person.modified, Person.id)
+                > (date_modified, last_id)
+            )
+            .order_by(Person.modified, Person.id)
             .limit(limit)
         )
         persons = query_.all()
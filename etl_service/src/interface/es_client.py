@@ -1,11 +1,14 @@
+import asyncio
 from typing import TypeVar
 
 from aiohttp import ClientConnectorError
 from elasticsearch import AsyncElasticsearch
 from elasticsearch import ConnectionError as ConnectionErrorES
 from elasticsearch import NotFoundError
+from elasticsearch.helpers import async_streaming_bulk
 
 from core import config
+from core.logger import logger
 from utils import backoff_by_connection
 
 ESClient_T = TypeVar("ESClient_T", bound="AsyncESClient")
@@ -14,6 +17,10 @@ ESClient_T = TypeVar("ESClient_T", bound="AsyncESClient")
 class AsyncESClient:
     """Async-клиент Elasticsearch."""
 
+    # Статусы ошибок элементов _bulk, после которых элемент загружается
+    # повторно (перегрузка или недоступность узлов кластера)
+    BULK_RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
     def __init__(self):
         self.__host = config.elastic_host
         self.__port = config.elastic_port
@@ -31,6 +38,11 @@ class AsyncESClient:
         exceptions=(ConnectionErrorES, ClientConnectorError)
     )
     async def create_index_with_ignore(self, index_: str, body: dict = None):
+        """
+        Создание индекса по схеме, если он не существует. В существующий
+        индекс добавляются новые поля схемы (изменение типов существующих
+        полей Elasticsearch не допускает).
+        """
         if body:
             try:
                 await self._client.search(index=index_)
@@ -38,6 +50,12 @@ class AsyncESClient:
             except NotFoundError:
                 await self._client.indices.create(index=index_, body=body)
 
+            else:
+                if properties := body.get("mappings", {}).get("properties"):
+                    await self._client.indices.put_mapping(
+                        index=index_, properties=properties
+                    )
+
     @backoff_by_connection(
         exceptions=(ConnectionErrorES, ClientConnectorError)
     )
@@ -55,6 +73,114 @@ class AsyncESClient:
 
         return result
 
+    @backoff_by_connection(
+        exceptions=(ConnectionErrorES, ClientConnectorError)
+    )
+    async def bulk_index(
+        self, index_: str, documents: dict[str, dict]
+    ) -> dict[str, dict]:
+        """
+        Загрузка документов (id -> документ) в индекс через _bulk API.
+
+        Документы делятся на пачки по количеству (etl_es_bulk_chunk_size),
+        async_streaming_bulk дополнительно ограничивает пачку по размеру
+        (etl_es_bulk_max_bytes); одновременно выполняется не более
+        etl_es_bulk_concurrency запросов. Элементы с ошибкой из
+        BULK_RETRY_STATUSES загружаются повторно (только они) до
+        etl_es_bulk_retries раз с экспоненциальной задержкой.
+
+        :return dict: ошибки по id документов (status, error); пустой
+        словарь, если все документы загружены.
+        """
+        errors, pending = {}, documents
+        semaphore = asyncio.Semaphore(config.etl_es_bulk_concurrency)
+
+        for attempt in range(config.etl_es_bulk_retries + 1):
+            if attempt:
+                delay = config.etl_es_bulk_retry_backoff * 2 ** (attempt - 1)
+                logger.warning(
+                    f"{index_}: retry bulk load of failed documents "
+                    f"(count: {len(pending)}) after {delay} sec."
+                )
+                await asyncio.sleep(delay)
+
+            ids = list(pending)
+            chunk_size = config.etl_es_bulk_chunk_size
+            chunks_errors = await asyncio.gather(*(
+                self._bulk_index_chunk(
+                    index_=index_,
+                    documents={id_: pending[id_] for id_ in chunk_ids},
+                    semaphore=semaphore,
+                )
+                for chunk_ids in (
+                    ids[i:i + chunk_size]
+                    for i in range(0, len(ids), chunk_size)
+                )
+            ))
+            # Ошибки документов из предыдущей попытки заменяются результатом
+            # повторной загрузки
+            for id_ in ids:
+                errors.pop(id_, None)
+
+            for chunk_errors in chunks_errors:
+                errors.update(chunk_errors)
+
+            pending = {
+                id_: documents[id_]
+                for id_, error in errors.items()
+                if error["status"] in self.BULK_RETRY_STATUSES
+            }
+
+            if not pending:
+                break
+
+        return errors
+
+    async def _bulk_index_chunk(
+        self,
+        index_: str,
+        documents: dict[str, dict],
+        semaphore: asyncio.Semaphore,
+    ) -> dict[str, dict]:
+        errors = {}
+
+        async with semaphore:
+            async for ok, item in async_streaming_bulk(
+                client=self._client,
+                actions=(
+                    {"_index": index_, "_id": id_, "_source": document}
+                    for id_, document in documents.items()
+                ),
+                chunk_size=config.etl_es_bulk_chunk_size,
+                max_chunk_bytes=config.etl_es_bulk_max_bytes,
+                raise_on_error=False,
+                raise_on_exception=False,
+            ):
+                if not ok:
+                    info = item["index"]
+                    errors[info["_id"]] = {
+                        "status": info.get("status"),
+                        "error": info.get("error"),
+                    }
+
+        return errors
+
+    @backoff_by_connection(
+        exceptions=(ConnectionErrorES, ClientConnectorError)
+    )
+    async def refresh_index(self, index_: str) -> None:
+        """
+        Обновление индекса: загруженные документы становятся видны поиску
+        (не дожидаясь периодического refresh).
+        """
+        await self._client.indices.refresh(index=index_)
+
+    @backoff_by_connection(
+        exceptions=(ConnectionErrorES, ClientConnectorError)
+    )
+    async def search(self, index_: str, body: dict) -> dict:
+        return await self._client.search(index=index_, body=body)
+
 
 class ESContextManager:
     """Контекстный менеджер по работе с RedisStorage."""
@@ -4,10 +4,12 @@ from typing import TypeVar
 
 from redis.asyncio import Redis
 from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import ResponseError
 
 from core import config
 from core.logger import logger
 from interface.storage.base import BaseStorage
+from utils.movies_utils.etl_streams import get_stream_names
 
 __all__ = [
     "RedisStorage_T",
@@ -49,23 +51,36 @@ def backoff_async_storage(start_sleep_time=2, factor=2, border_sleep_time=20):
     return wrapper_storage
 
 
+def get_storage_max_unfinished() -> int:
+    """
+    Допустимое количество необработанных сообщений модели во всех потоках
+    этапов ETL: несколько пачек этапов и не меньше двух страниц выборки
+    Producer, чтобы выборка страницы не ждала полной обработки предыдущей.
+    """
+    return max(
+        config.etl_movies_stream_max_pending_batches
+        * config.etl_movies_stream_batch_size,
+        2 * config.etl_movies_select_limit,
+    )
+
+
 def check_free_size_storage(
-        start_sleep_time=2, factor=2, border_sleep_time=20, select_limit=100
+        start_sleep_time=2, factor=2, border_sleep_time=20, select_limit=None
 ):
     def wrapper(func):
         @functools.wraps(func)
         async def wrapped(*args, **kwargs):
             producer_, model_ = next(iter(args)), kwargs.get("model_")
+            max_unfinished = select_limit or get_storage_max_unfinished()
             key_rule = producer_.get_key_of_rule(model_=model_)
 
             need_timeout, n, t = True, 1, start_sleep_time
             while need_timeout:
-                gen_scan_iter_ = await producer_.redis_storage.scan_iter(
-                    f"{key_rule}_*"
+                num_obj_in_stor = await producer_.redis_storage.streams_len(
+                    names=get_stream_names(key_rule=key_rule)
                 )
-                num_obj_in_stor = len(gen_scan_iter_)
 
-                if num_obj_in_stor >= select_limit:
+                if num_obj_in_stor >= max_unfinished:
                     t = (
                         t * (factor ^ n)
                         if t < border_sleep_time else border_sleep_time
@@ -122,5 +137,214 @@ class RedisStorage(BaseStorage):
         if names:
             await self._redis.delete(*names)
 
+    @backoff_async_storage()
+    async def replace_sorted_set(
+        self, name: str, mapping: dict[str, float], registry: str = None
+    ) -> None:
+        """
+        Атомарная замена содержимого sorted set (MULTI/EXEC). Если задан
+        registry, имя непустого sorted set добавляется в это множество, а
+        пустого (удалённого) - удаляется из него.
+        """
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(name)
+
+            if mapping:
+                pipe.zadd(name, mapping)
+
+            if registry and mapping:
+                pipe.sadd(registry, name)
+
+            elif registry:
+                pipe.srem(registry, name)
+
+            await pipe.execute()
+
+    @backoff_async_storage()
+    async def find_sorted_sets_with_members(
+        self, names: list[str], members: list[str]
+    ) -> list[str]:
+        """
+        Имена sorted set, содержащих хотя бы одно из значений members (один
+        запрос ZMSCORE на sorted set, одним pipeline).
+        """
+        if not names or not members:
+            return []
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for name in names:
+                pipe.zmscore(name, members)
+
+            scores = await pipe.execute()
+
+        return [
+            name
+            for name, name_scores in zip(names, scores)
+            if any(score is not None for score in name_scores or [])
+        ]
+
+    @backoff_async_storage()
+    async def get_set_all(self, name: str) -> list[str]:
+        return list(await self._redis.smembers(name))
+
+    @backoff_async_storage()
+    async def incr_(self, name: str) -> int:
+        return await self._redis.incr(name)
+
+    @backoff_async_storage()
+    async def add_to_stream(
+        self, name: str, fields: dict, maxlen: int | None = None
+    ) -> str:
+        return await self._redis.xadd(
+            name, fields, maxlen=maxlen, approximate=True
+        )
+
+    @backoff_async_storage()
+    async def add_to_set(self, name: str, values: list[str]) -> int:
+        """Добавление значений в множество (повторные не добавляются)."""
+        if not values:
+            return 0
+
+        return await self._redis.sadd(name, *values)
+
+    @backoff_async_storage()
+    async def get_set_members(self, name: str, count: int) -> list[str]:
+        """Не более count значений множества (без удаления)."""
+        return await self._redis.srandmember(name, count)
+
+    @backoff_async_storage()
+    async def remove_from_set(self, name: str, values: list[str]) -> None:
+        if values:
+            await self._redis.srem(name, *values)
+
+    @backoff_async_storage()
+    async def add_batch_to_stream(self, name: str, values: list[dict]) -> None:
+        """Добавление пачки сообщений в поток одним запросом (pipeline)."""
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for fields in values:
+                pipe.xadd(name, fields)
+
+            await pipe.execute()
+
+    @backoff_async_storage()
+    async def create_stream_group(self, name: str, group: str) -> None:
+        """Создание группы потребителей потока (и потока) при отсутствии."""
+        try:
+            await self._redis.xgroup_create(
+                name=name, groupname=group, id="0", mkstream=True
+            )
+
+        except ResponseError as ex:
+            if "BUSYGROUP" not in str(ex):
+                raise
+
+    @backoff_async_storage()
+    async def read_stream_group(
+        self,
+        name: str,
+        group: str,
+        consumer: str,
+        count: int,
+        last_id: str = ">",
+        with_deleted: bool = False,
+    ) -> list[tuple[str, dict]]:
+        """
+        Чтение пачки сообщений потока группой потребителей: новых
+        (last_id=">") либо ранее полученных этим потребителем, но не
+        подтверждённых (pending), с ID больше last_id.
+
+        Не подтверждённые сообщения, удалённые из потока, возвращаются без
+        данных, только при with_deleted=True.
+        """
+        response = await self._redis.xreadgroup(
+            groupname=group,
+            consumername=consumer,
+            streams={name: last_id},
+            count=count,
+        )
+
+        return [
+            (message_id, fields)
+            for _, messages in response
+            for message_id, fields in messages
+            if fields or with_deleted
+        ]
+
+    async def iter_stream_batches(
+        self, name: str, group: str, consumer: str, count: int
+    ):
+        """
+        Пачки сообщений потока для группы потребителей: сначала не
+        подтверждённые этим потребителем (остались после сбоя или ошибки
+        обработки), затем новые, пока поток не будет вычитан.
+        """
+        await self.create_stream_group(name=name, group=group)
+        last_id = "0"
+
+        while messages := await self.read_stream_group(
+            name=name,
+            group=group,
+            consumer=consumer,
+            count=count,
+            last_id=last_id,
+            with_deleted=True,
+        ):
+            last_id = messages[-1][0]
+
+            # Удалённые из потока сообщения только подтверждаются: пачка
+            # может состоять из одних таких сообщений, поэтому чтение
+            # продолжается, пока не подтверждённые сообщения не закончатся
+            if deleted_ids := [
+                message_id for message_id, fields in messages if not fields
+            ]:
+                await self.move_stream_batch(
+                    name=name, group=group, message_ids=deleted_ids
+                )
+
+            if batch := [
+                (message_id, fields)
+                for message_id, fields in messages
+                if fields
+            ]:
+                yield batch
+
+        while batch := await self.read_stream_group(
+            name=name, group=group, consumer=consumer, count=count
+        ):
+            yield batch
+
+    @backoff_async_storage()
+    async def move_stream_batch(
+        self,
+        name: str,
+        group: str,
+        message_ids: list[str],
+        next_name: str | None = None,
+        values: list[dict] | None = None,
+    ) -> None:
+        """
+        Передача пачки следующему этапу: добавление сообщений в поток
+        next_name, подтверждение (XACK) и удаление (XDEL) обработанных
+        сообщений потока name одной транзакцией (MULTI/EXEC).
+        """
+        async with self._redis.pipeline(transaction=True) as pipe:
+            for fields in values or []:
+                pipe.xadd(next_name, fields)
+
+            if message_ids:
+                pipe.xack(name, group, *message_ids)
+                pipe.xdel(name, *message_ids)
+
+            await pipe.execute()
+
+    @backoff_async_storage()
+    async def streams_len(self, names: list[str]) -> int:
+        """Суммарное количество сообщений в потоках."""
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for name in names:
+                pipe.xlen(name)
+
+            return sum(await pipe.execute())
+
     async def close_(self) -> None:
         await self._redis.close()
@@ -3,13 +3,16 @@ import os
 
 from core import config
 from core.logger import logger
-from interface import RedisStorage_T
-from interface.es_client import ESClient_T
+from interface import RedisContextManager, RedisStorage_T
+from interface.es_client import AsyncESClient, ESClient_T
 from models.movies.pg_models import Base as BaseModel
 from models.movies.pg_models import FilmWork, Genre, Person
 from schemas.movies_schemas.film_work_models import FilmWorkESModel
 from schemas.movies_schemas.genre_models import GenreModel
 from schemas.movies_schemas.person_models import PersonModel
+from utils.movies_utils.etl_enum import StreamStages
+from utils.movies_utils.etl_streams import (get_dead_letter_stream_name,
+                                            get_stream_name, stream_message)
 
 
 class Loader:
@@ -19,6 +22,34 @@ class Loader:
     MOVIES_MODELS_PATH = "movies"
     ES_INDICES_PATH = "es_indices"
     CONCAT = 1
+    # Группа потребителей потоков этапа Convertor
+    STREAM_GROUP = "loader"
+    # Временные ошибки загрузки в ES (см. AsyncESClient.bulk_index)
+    ES_RETRY_STATUSES = AsyncESClient.BULK_RETRY_STATUSES
+    # Поля автодополнения (completion) индексов: (поле с текстом, поле
+    # автодополнения); вес подсказки — популярность записи
+    SUGGEST_FIELDS = {
+        "film_work": ("title", "title_suggest"),
+        "person": ("full_name", "full_name_suggest"),
+    }
+    # Максимальное количество слов, с которых может начинаться подсказка
+    SUGGEST_MAX_WORDS = 5
+    # Топ-списки фильмов по жанрам (sorted set в кеше movies_service):
+    # member - id фильма, score - значение поля сортировки
+    GENRE_TOP_KEY = "genre_top:{genre_id}:{sort}"
+    GENRE_TOP_SORT = "-imdb_rating"
+    # Множество ключей топ-списков фильмов по жанрам (реестр)
+    GENRE_TOP_REGISTRY_KEY = "genre_top_keys"
+    # Score фильмов без рейтинга (в выдаче они идут последними)
+    GENRE_TOP_MISSING_SCORE = -1.0
+    # Семейства ключей кеша movies_service для записей по ID
+    CACHE_KEY_PREFIXES = {
+        "film_work": "film",
+        "person": "person",
+        "genre": "genre",
+    }
+    # Номер поколения кеша списков movies_service по индексу
+    CACHE_GENERATION_KEY = "cache_generation:{index}"
 
     def __init__(
         self,
@@ -57,102 +88,354 @@ class Loader:
 
         return es_model_dict
 
+    @staticmethod
+    def _get_suggest_weight(key_rule: str, es_model_dict: dict) -> int:
+        """
+        Вес подсказки: фильмы ранжируются по рейтингу, персоны — по
+        количеству фильмов.
+        """
+        if key_rule == "film_work":
+            return int((es_model_dict.get("imdb_rating") or 0) * 10)
+
+        return len(es_model_dict.get("films") or [])
+
+    def _add_suggest_field(self, key_rule: str, es_model_dict: dict) -> dict:
+        """
+        Заполнение поля автодополнения: подсказка находится по началу
+        текста и по началу каждого из первых SUGGEST_MAX_WORDS слов
+        ("star wars" -> ["star wars", "wars"]).
+        """
+        if key_rule not in self.SUGGEST_FIELDS:
+            return es_model_dict
+
+        text_field, suggest_field = self.SUGGEST_FIELDS[key_rule]
+        words = (es_model_dict.get(text_field) or "").split()
+
+        es_model_dict[suggest_field] = {
+            "input": [
+                " ".join(words[i:])
+                for i in range(min(len(words), self.SUGGEST_MAX_WORDS))
+            ],
+            "weight": self._get_suggest_weight(key_rule, es_model_dict),
+        }
+
+        return es_model_dict
+
     async def run(self) -> None:
         """
         Точка запуска. Этапы:
-        - Получение из Storage сущности.
+        - Чтение пачками сущностей из потока Storage (этап Convertor).
         - Проверяем сущность на валидность pydantic-модели.
         - Очистка и сериализация сущности.
-        - Сохранение данных в ES.
-        - Очистка Storage.
+        - Сохранение пачки данных в ES (_bulk API).
+        - Подтверждение и удаление из потока пачки обработанных сущностей
+        (не загруженные из-за временной ошибки ES остаются не
+        подтверждёнными и читаются повторно при следующем запуске, а из-за
+        постоянной ошибки - переносятся в поток недоставленных сообщений
+        etl:{key_rule}:dead).
 
         :return None:
         """
+        loaded_ids = {}
+        # Жанры загруженных фильмов (для обновления топ-списков жанров)
+        loaded_genre_ids = set()
+
         for model_, es_model_cls in self.models.items():
-            load_count = 0
+            load_count = read_count = 0
             key_rule = self.get_key_of_rule(model_=model_)
+            loaded_ids[key_rule] = []
+            stream_name = get_stream_name(
+                key_rule=key_rule, stage=StreamStages.CONVERTED
+            )
+            dead_letter_stream_name = get_dead_letter_stream_name(
+                key_rule=key_rule
+            )
 
             await self._es_client.create_index_with_ignore(
                 index_=key_rule, body=self._get_es_schema(name=key_rule)
             )
-            scan_lst = await self.redis_storage.scan_iter(f"{key_rule}_es_*")
 
-            if scan_lst:
-                logger.debug(
-                    f"{key_rule}: start load to ES(count: {len(scan_lst)})"
-                )
+            async for batch in self.redis_storage.iter_stream_batches(
+                name=stream_name,
+                group=self.STREAM_GROUP,
+                consumer=config.etl_movies_stream_consumer,
+                count=(
+                    config.etl_es_bulk_chunk_size
+                    * config.etl_es_bulk_concurrency
+                ),
+            ):
+                read_count += len(batch)
+                documents, message_ids, processed_message_ids = {}, {}, []
+                messages, dead_letters = {}, []
 
-            for obj_key_rule in scan_lst:
-                obj_id = obj_key_rule.split(f"{key_rule}_es_")[-1]
-                obj_ = await self._get_object_data_by_key_rule(
-                    obj_key_rule=obj_key_rule
-                )
+                # Повторные сообщения объекта в пачке: загружается последнее
+                for message_id, fields in batch:
+                    obj_id = fields["id"]
+                    es_model_dict = es_model_cls(
+                        **json.loads(fields["data"])
+                    ).model_dump(mode="json")
 
-                es_model_dict = es_model_cls(**obj_).model_dump(mode="json")
+                    if not (
+                        es_model_dict
+                        and es_model_dict.get("was_enrich")
+                        and es_model_dict.get("was_convert")
+                    ):
+                        processed_message_ids.append(message_id)
+                        continue
 
-                if (
-                    es_model_dict
-                    and es_model_dict.get("was_enrich")
-                    and es_model_dict.get("was_convert")
-                ):
-                    result_ = await self._es_client.insert_document(
-                        index_=key_rule,
-                        document=self._get_clear_es_dict(
+                    documents[obj_id] = self._add_suggest_field(
+                        key_rule=key_rule,
+                        es_model_dict=self._get_clear_es_dict(
                             es_model_dict=es_model_dict
                         ),
-                        id_=obj_id,
                     )
+                    message_ids.setdefault(obj_id, []).append(message_id)
+                    messages[obj_id] = fields
+
+                errors = {}
 
-                    if result_.get("status") is False:
+                if documents:
+                    errors = await self._es_client.bulk_index(
+                        index_=key_rule, documents=documents
+                    )
+
+                for obj_id in documents:
+                    if error := errors.get(obj_id):
                         logger.error(
                             f"{key_rule}: error insert data(id={obj_id}) in "
-                            f"ES: {result_.get('message')}"
+                            f"ES({error['status']}): {error['error']}"
                         )
+
+                        # Сообщения с временной ошибкой ES не
+                        # подтверждаются: они будут загружены при следующем
+                        # запуске. Остальные (ошибка маппинга, слишком
+                        # большой запрос и т.п.) переносятся в поток
+                        # недоставленных сообщений
+                        if error["status"] in self.ES_RETRY_STATUSES:
+                            continue
+
+                        dead_letters.append(self._dead_letter(
+                            fields=messages[obj_id], error=error
+                        ))
+
                     else:
                         load_count += self.CONCAT
-                        logger.debug(
-                            f"{key_rule}: id={obj_id}, data was save in ES"
+                        loaded_ids[key_rule].append(obj_id)
+                        loaded_genre_ids.update(
+                            genre["id"]
+                            for genre in documents[obj_id].get("genres") or []
                         )
 
-                        await self._delete_objects_by_obj_id(
-                            obj_id=obj_id, key_rule=key_rule
-                        )
+                    processed_message_ids.extend(message_ids[obj_id])
+
+                logger.debug(
+                    f"{key_rule}: batch was save in ES(count: "
+                    f"{len(documents) - len(errors)} from {len(documents)})"
+                )
+
+                if dead_letters:
+                    logger.error(
+                        f"{key_rule}: documents were not load in ES and "
+                        f"moved to {dead_letter_stream_name}"
+                        f"(count: {len(dead_letters)})"
+                    )
+
+                await self.redis_storage.move_stream_batch(
+                    name=stream_name,
+                    group=self.STREAM_GROUP,
+                    message_ids=processed_message_ids,
+                    next_name=dead_letter_stream_name,
+                    values=dead_letters,
+                )
 
             logger.info(
                 f"{key_rule}: was load in ES({load_count} from "
-                f"{len(scan_lst)})"
+                f"{read_count})"
+            )
+
+        # Топ-списки обновляются до смены поколения кеша: иначе запрос
+        # страницы жанра между ними закеширует старый список под новым
+        # поколением
+        film_work_ids = loaded_ids[self.get_key_of_rule(model_=FilmWork)]
+
+        if film_work_ids:
+            # Списки строятся поиском по индексу: загруженные фильмы должны
+            # быть видны поиску
+            await self._es_client.refresh_index(
+                index_=self.get_key_of_rule(model_=FilmWork)
+            )
+            await self._refresh_genre_top_lists(
+                film_work_ids=film_work_ids, genre_ids=loaded_genre_ids
             )
 
-    async def _get_object_data_by_key_rule(self, obj_key_rule: str) -> dict:
-        obj_data = await self.redis_storage.retrieve_state(key_=obj_key_rule)
-        obj_deserialize_data = json.loads(obj_data)
+        if any(loaded_ids.values()):
+            await self._publish_movies_changes(loaded_ids=loaded_ids)
 
-        return obj_deserialize_data
+    @staticmethod
+    def _dead_letter(fields: dict, error: dict) -> dict:
+        """
+        Сообщение потока недоставленных сообщений: исходное сообщение и
+        ошибка ES.
+        """
+        return {
+            **stream_message(obj_id=fields["id"], data=fields["data"]),
+            "status": str(error["status"]),
+            "error": json.dumps(error["error"], default=str),
+        }
 
-    async def _delete_objects_by_obj_id(
-            self, obj_id: str, key_rule: str
+    async def _publish_movies_changes(
+            self, loaded_ids: dict[str, list[str]]
     ) -> None:
         """
-        Удаление объектов из Storage:
-        - Удаление обогащенных сущностей.
-        - Удаление сущностей, приведенных к нормали для сохранения в ES.
+        Публикация изменений индексов для инвалидации кеша movies_service:
+        записи кеша загруженных объектов по ID (в том числе записи-надгробия)
+        удаляются из Redis, для каждого изменённого индекса увеличивается
+        номер поколения кеша списков, а в поток изменений добавляются ID
+        загруженных объектов (сообщениями не более
+        movies_cache_changes_message_size ID). По сообщениям потока воркеры
+        movies_service удаляют эти записи из локальных кешей и переходят на
+        новое поколение ключей списков.
 
-        :param str obj_id:
-        :param str key_rule:
-        :return None:
+        Записи удаляются из Redis здесь, а не только воркерами по потоку,
+        чтобы они не пережили загрузку, пока поток никто не читает
+        (например, во время перезапуска movies_service).
+        """
+        async with RedisContextManager(
+            redis_db=config.redis_db_movies_cache
+        ) as cache_storage:
+            # Ключи вычисляются до смены номеров поколений
+            cache_keys = []
+
+            for key_rule, ids in loaded_ids.items():
+                if ids:
+                    cache_keys.extend(await self._get_cache_keys_by_ids(
+                        cache_storage=cache_storage,
+                        key_rule=key_rule,
+                        ids=ids,
+                    ))
+
+            await cache_storage.delete_(names=cache_keys)
+
+            for key_rule, ids in loaded_ids.items():
+                if not ids:
+                    continue
+
+                generation = await cache_storage.incr_(
+                    name=self.CACHE_GENERATION_KEY.format(index=key_rule)
+                )
+                message_size = config.movies_cache_changes_message_size
+
+                for i in range(0, len(ids), message_size):
+                    await cache_storage.add_to_stream(
+                        name=config.movies_cache_changes_stream,
+                        fields={
+                            "index": key_rule,
+                            "ids": json.dumps(ids[i:i + message_size]),
+                            "generation": generation,
+                        },
+                        maxlen=config.movies_cache_changes_stream_maxlen,
+                    )
+
+                logger.debug(
+                    f"{key_rule}: changes were published to movies cache "
+                    f"(count: {len(ids)}, generation: {generation})"
+                )
+
+    async def _get_cache_keys_by_ids(
+        self, cache_storage: RedisStorage_T, key_rule: str, ids: list[str]
+    ) -> list[str]:
+        """
+        Ключи кеша movies_service записей по ID загруженных объектов (см.
+        CacheGenerations.get_changed_keys в movies_service).
         """
-        base_name = f"{key_rule}_{obj_id}"
-        await self.redis_storage.delete_(name=base_name)
-        logger.debug(
-            f"{key_rule}: id={obj_id}, BASE data was delete from Storage"
-            # nosec B608
+        prefix = self.CACHE_KEY_PREFIXES[key_rule]
+        keys = [f"{prefix}:{id_}" for id_ in ids]
+
+        if key_rule == "person":
+            # Фильмы персоны кешируются в поколении индекса film_work
+            generation = await cache_storage.get_(
+                name=self.CACHE_GENERATION_KEY.format(index="film_work")
+            ) or 0
+            keys.extend(f"person_films:{generation}:{id_}" for id_ in ids)
+
+        return keys
+
+    async def _get_genre_top(self, genre_id: str) -> dict[str, float]:
+        """
+        Топ фильмов жанра: id фильма -> значение поля сортировки.
+
+        Фильмы с равным значением поля сортировки упорядочиваются по id по
+        убыванию: в таком же порядке их возвращает ZREVRANGE в
+        movies_service, и так же сортирует страницы фильмов Elasticsearch.
+        """
+        sort_field = self.GENRE_TOP_SORT.lstrip("-")
+        sort_order = "desc" if self.GENRE_TOP_SORT.startswith("-") else "asc"
+        response = await self._es_client.search(
+            index_=self.get_key_of_rule(model_=FilmWork),
+            body={
+                "size": config.etl_genre_top_size,
+                "_source": ["id", sort_field],
+                "query": {"bool": {"filter": [{"nested": {
+                    "path": "genres",
+                    "query": {"term": {"genres.id": genre_id}},
+                }}]}},
+                "sort": [
+                    {sort_field: {"order": sort_order, "missing": "_last"}},
+                    {"id": {"order": "desc"}},
+                ],
+            },
         )
 
-        es_name = f"{key_rule}_es_{obj_id}"
-        await self.redis_storage.delete_(name=es_name)
-        logger.debug(
-            f"{key_rule}: id={obj_id}, ES data was delete from Storage"
-            # nosec B608
+        top = {}
+        for hit in response["hits"]["hits"]:
+            score = hit["_source"].get(sort_field)
+            top[hit["_source"]["id"]] = (
+                self.GENRE_TOP_MISSING_SCORE if score is None else score
+            )
+
+        return top
+
+    async def _refresh_genre_top_lists(
+        self, film_work_ids: list[str], genre_ids: set[str]
+    ) -> None:
+        """
+        Пересчёт материализованных топ-списков фильмов по жанрам после
+        загрузки фильмов в ES. Списки читает movies_service для страниц
+        жанров вместо nested-запроса с сортировкой в ES; каждый список
+        заменяется атомарно.
+
+        Пересчитываются только списки жанров загруженных фильмов и списки,
+        в которых загруженные фильмы уже есть (фильм мог потерять жанр).
+        Ключи списков хранятся в множестве-реестре GENRE_TOP_REGISTRY_KEY;
+        списки жанров без фильмов удаляются вместе с записью в реестре.
+        """
+        genre_ids = set(genre_ids)
+
+        async with RedisContextManager(
+            redis_db=config.redis_db_movies_cache
+        ) as cache_storage:
+            for key in await cache_storage.find_sorted_sets_with_members(
+                names=await cache_storage.get_set_all(
+                    name=self.GENRE_TOP_REGISTRY_KEY
+                ),
+                members=film_work_ids,
+            ):
+                genre_id, sort = key.split(":")[1:3]
+
+                if sort == self.GENRE_TOP_SORT:
+                    genre_ids.add(genre_id)
+
+            for genre_id in genre_ids:
+                await cache_storage.replace_sorted_set(
+                    name=self.GENRE_TOP_KEY.format(
+                        genre_id=genre_id, sort=self.GENRE_TOP_SORT
+                    ),
+                    mapping=await self._get_genre_top(genre_id),
+                    registry=self.GENRE_TOP_REGISTRY_KEY,
+                )
+
+        logger.info(
+            f"genre top lists were refreshed(count: {len(genre_ids)})"
         )
 
     def _get_es_schema(self, name: str):
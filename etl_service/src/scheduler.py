@@ -1,3 +1,5 @@
+from contextlib import AsyncExitStack
+
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from core import config
@@ -5,6 +7,7 @@ from db.clickhouse_session import clickhouse_session
 from db.postgres_session import pg_scoped_session
 from extract.events.producer import Producer as EventsProducer
 from extract.movies.enricher import Enricher as MoviesEnricher
+from extract.movies.fanout import Fanout as MoviesFanout
 from extract.movies.producer import Producer as MoviesProducer
 from interface import RedisContextManager, es_context_manager
 from loader.events_loader import Loader as EventsLoader
@@ -29,6 +32,16 @@ class MoviesETLScheduler(ETLSchedulerInterface):
                     "misfire_grace_time": None,
                 },
             },
+            {
+                "cls_job": MoviesFanout,
+                "job_params": {
+                    "trigger": config.etl_task_trigger,
+                    "seconds": config.etl_movies_task_interval_sec,
+                    "coalesce": True,
+                    "max_instances": 1,
+                    "misfire_grace_time": None,
+                },
+            },
             {
                 "cls_job": MoviesEnricher,
                 "job_params": {
@@ -69,10 +82,16 @@ class MoviesETLScheduler(ETLSchedulerInterface):
             RedisContextManager(
                 redis_db=config.redis_db_movies
             ) as redis_storage,
-            pg_scoped_session.context_session() as pg_session,
             es_context_manager as es_client,
+            AsyncExitStack() as pg_sessions,
         ):
             for job_ in cls.jobs():
+                # Обработчики выполняются одновременно, а AsyncSession не
+                # допускает конкурентного использования: у каждого
+                # обработчика своя сессия
+                pg_session = await pg_sessions.enter_async_context(
+                    pg_scoped_session.context_new_session()
+                )
                 scheduler_.add_job(
                     func=job_["cls_job"](
                         redis_storage, pg_session, es_client
@@ -1,18 +1,24 @@
 import json
 
+from core import config
 from core.logger import logger
 from interface import ESClient_T, RedisStorage_T
 from models.movies.pg_models import Base as BaseModel
 from models.movies.pg_models import FilmWork, Genre, Person
-from schemas import Base as BaseSchema
 from transfer.movies.convert_rules import (FilmWorkRules, GenreRules,
                                            PersonRules)
+from utils.movies_utils.etl_enum import StreamStages
+from utils.movies_utils.etl_streams import get_stream_name, stream_message
 
 
 class Convertor:
     """Класс по приведению данных к соответствию схеме индекса."""
 
     CONCAT = 1
+    # Группа потребителей потоков этапов Producer и Enricher
+    STREAM_GROUP = "convertor"
+    # Модели, сущности которых не обогащаются (Enricher их не читает)
+    NOT_ENRICHED_MODELS = (Genre,)
 
     def __init__(
         self,
@@ -44,68 +50,76 @@ class Convertor:
     def get_key_of_rule(model_: BaseModel) -> str:
         return model_.model_name()
 
+    def get_input_stage(self, model_: BaseModel) -> StreamStages:
+        """
+        Этап, результаты которого преобразуются: жанры не обогащаются и
+        читаются из потока этапа Producer.
+        """
+        if model_ in self.NOT_ENRICHED_MODELS:
+            return StreamStages.PRODUCED
+
+        return StreamStages.ENRICHED
+
     async def run(self) -> None:
         """
         Точка запуска. Этапы:
-        - Получение из Storage сущности.
+        - Чтение пачками сущностей из потока Storage (этап Enricher).
         - Преобразование сущностей в валидный для схемы индекса ES формат
         данных.
-        - Сохранение валидных для схемы индекса ES данных в Storage.
+        - Запись пачки валидных для схемы индекса ES данных в поток
+        следующего этапа и подтверждение прочитанных сообщений.
 
         :return None:
         """
         for model_, transformation_rule in self.model_rules.items():
-            convert_count = 0
+            convert_count = read_count = 0
             key_rule = self.get_key_of_rule(model_=model_)
-            scan_lst = await self.redis_storage.scan_iter(f"{key_rule}_*")
-
-            if scan_lst:
-                logger.info(
-                    f"{key_rule}: start convert enrich data(count: "
-                    f"{len(scan_lst)})"
-                )
-
-            for obj_key_rule in scan_lst:
-                obj_ = await self._get_object_data_by_key_rule(
-                    obj_key_rule=obj_key_rule
-                )
+            stream_name = get_stream_name(
+                key_rule=key_rule, stage=self.get_input_stage(model_=model_)
+            )
 
-                if obj_ and obj_.get("was_enrich") and (
-                        not obj_.get("was_convert")
-                ):
-                    obj_id = obj_key_rule.split(f"{key_rule}_")[-1]
+            async for batch in self.redis_storage.iter_stream_batches(
+                name=stream_name,
+                group=self.STREAM_GROUP,
+                consumer=config.etl_movies_stream_consumer,
+                count=config.etl_movies_stream_batch_size,
+            ):
+                read_count += len(batch)
+                transformation_values = []
+
+                for _, fields in batch:
+                    obj_id, obj_ = fields["id"], json.loads(fields["data"])
+
+                    if not obj_.get("was_enrich"):
+                        logger.warning(
+                            f"{key_rule}: id={obj_id}, data was not enrich "
+                            f"(skip)"
+                        )
+                        continue
 
                     transformation_data = await transformation_rule(
                         obj_data=obj_
                     )
-                    await self._save_transformation_data(
-                        model_=model_,
+                    transformation_values.append(stream_message(
                         obj_id=obj_id,
-                        transformation_data=transformation_data,
-                    )
+                        data=transformation_data.model_dump_json(),
+                    ))
                     convert_count += self.CONCAT
                     logger.debug(
                         f"{key_rule}: id={obj_id}, enrich data was convert"
                     )
 
+                await self.redis_storage.move_stream_batch(
+                    name=stream_name,
+                    group=self.STREAM_GROUP,
+                    message_ids=[message_id for message_id, _ in batch],
+                    next_name=get_stream_name(
+                        key_rule=key_rule, stage=StreamStages.CONVERTED
+                    ),
+                    values=transformation_values,
+                )
+
             logger.info(
                 f"{key_rule}: enrich data was convert({convert_count} from "
-                f"{len(scan_lst)})"
+                f"{read_count})"
             )
-
-    async def _get_object_data_by_key_rule(self, obj_key_rule: str) -> dict:
-        if obj_data := await self.redis_storage.retrieve_state(
-                key_=obj_key_rule
-        ):
-            obj_deserialize_data = json.loads(obj_data)
-
-            return obj_deserialize_data
-
-    async def _save_transformation_data(
-        self, model_: BaseModel, obj_id: int, transformation_data: BaseSchema
-    ) -> None:
-        key_ = f"{model_.model_name()}_es_{obj_id}"
-
-        await self.redis_storage.save_state(
-            key_=key_, value=transformation_data.model_dump_json()
-        )
@@ -16,3 +16,11 @@ class PersonRoles(enum.Enum):
     ACTOR = "actor"
     DIRECTOR = "director"
     WRITER = "writer"
+
+
+class StreamStages(enum.Enum):
+    """Этапы ETL: поток Redis каждого этапа содержит его результаты."""
+
+    PRODUCED = "produced"
+    ENRICHED = "enriched"
+    CONVERTED = "converted"
@@ -0,0 +1,33 @@
+from utils.movies_utils.etl_enum import StreamStages
+
+# Поток Redis с результатами этапа ETL по модели (вход следующего этапа)
+STREAM_NAME = "etl:{key_rule}:{stage}"
+# Множество Redis ID объектов модели, изменения которых нужно
+# распространить на зависимые фильмы (для film_work - ID фильмов для
+# повторного обогащения)
+FANOUT_SET_NAME = "etl:{key_rule}:fanout"
+# Поток Redis сообщений модели, которые не удалось загрузить в ES из-за
+# постоянной ошибки (для разбора и повторной отправки вручную)
+DEAD_LETTER_STREAM_NAME = "etl:{key_rule}:dead"
+
+
+def get_stream_name(key_rule: str, stage: StreamStages) -> str:
+    return STREAM_NAME.format(key_rule=key_rule, stage=stage.value)
+
+
+def get_stream_names(key_rule: str) -> list[str]:
+    """Потоки всех этапов ETL по модели."""
+    return [get_stream_name(key_rule, stage) for stage in StreamStages]
+
+
+def stream_message(obj_id: str, data: str) -> dict:
+    """Сообщение потока этапа ETL: ID объекта и его данные (JSON)."""
+    return {"id": obj_id, "data": data}
+
+
+def get_fanout_set_name(key_rule: str) -> str:
+    return FANOUT_SET_NAME.format(key_rule=key_rule)
+
+
+def get_dead_letter_stream_name(key_rule: str) -> str:
+    return DEAD_LETTER_STREAM_NAME.format(key_rule=key_rule)
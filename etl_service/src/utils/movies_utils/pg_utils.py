@@ -0,0 +1,19 @@
+from uuid import UUID
+
+from sqlalchemy import UUID as UUID_SQLALCHEMY
+from sqlalchemy import any_, bindparam
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql.elements import ColumnElement
+
+
+def any_of_ids(obj_ids: list[str | UUID]) -> ColumnElement:
+    """
+    Список ID одним параметром-массивом для условия "column = ANY(:ids)":
+    текст запроса не зависит от количества ID (в отличие от IN).
+    """
+    return any_(bindparam(
+        "ids",
+        value=[UUID(str(obj_id)) for obj_id in obj_ids],
+        type_=ARRAY(UUID_SQLALCHEMY),
+        unique=True,
+    ))
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Depends
+
+from src.utils.local_cache import LocalCache, get_local_cache
+
+router = APIRouter()
+
+
+@router.get("/stats")
+async def cache_stats(
+    local_cache: LocalCache = Depends(get_local_cache),
+) -> dict:
+    """
+    Эндпоинт для получения статистики локального кеша процесса (счётчики
+    попаданий/промахов по префиксам ключей).
+    """
+    return local_cache.stats()
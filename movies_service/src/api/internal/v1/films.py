@@ -1,9 +1,15 @@
 import logging
+from http import HTTPStatus
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import (APIRouter, Depends, HTTPException, Query, Request,
+                     Response)
 
-from src.models.models import Film, FilmBase, SearchParams
+from src.core.exceptions import CursorPageError, InvalidCursorError
+from src.models.models import Film, FilmBase, FilmBatchRequest, SearchParams
+from src.services import film_service as cached_film_service
 from src.services.internal_film_service import FilmService, get_film_service
+from src.utils.cached_response import CachedJSONResponse
+from src.utils.cursor import CursorPage, set_next_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +21,7 @@ router = APIRouter()
     response_model=list[FilmBase],
 )
 async def search_films(
+    response: Response,
     search_params: SearchParams,
     page_size: int = Query(
         10,
@@ -27,8 +34,58 @@ async def search_films(
         ge=1,
         description="Смещение для пагинации (больше ноля)",
     ),
+    cursor: str | None = Query(
+        None,
+        description=(
+            "Курсор постраничной выдачи: '*' для первой страницы, далее "
+            "значение заголовка X-Next-Cursor (page_number игнорируется)"
+        ),
+    ),
     film_service: FilmService = Depends(get_film_service),
 ) -> list[FilmBase]:
-    films = await film_service.search_films(search_params=search_params, page_size=page_size, page_number=page_number)
+    try:
+        films = await film_service.search_films(
+            search_params=search_params,
+            page_size=page_size,
+            page_number=page_number,
+            cursor=cursor,
+        )
+
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Invalid or expired cursor",
+        )
+
+    except CursorPageError:
+        raise HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail="Search service unavailable",
+        )
+
+    if isinstance(films, CursorPage):
+        return set_next_cursor(response, films)
+
+    return films if films else []
+
+
+@router.post(
+    "/batch",
+    response_model=list[Film],
+)
+async def films_batch(
+    request: Request,
+    batch: FilmBatchRequest,
+    film_service: cached_film_service.FilmService = Depends(
+        cached_film_service.get_film_service
+    ),
+) -> CachedJSONResponse:
+    """
+    Эндпоинт для получения фильмов по списку ID одним запросом (для
+    других сервисов). Отсутствующие фильмы пропускаются.
+    """
+    films = await film_service.get_films_by_ids(
+        [str(film_id) for film_id in batch.ids], raw=True
+    )
 
-    return films if films else []
\ No newline at end of file
+    return CachedJSONResponse(films, request)
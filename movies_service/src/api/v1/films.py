@@ -2,12 +2,16 @@ import logging
 from http import HTTPStatus
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import (APIRouter, Depends, HTTPException, Query, Request,
+                     Response)
 
+from src.core.exceptions import CursorPageError, InvalidCursorError
 from src.dependencies.auth import role_dependency
-from src.models.models import Film, FilmBase
+from src.models.models import Film, FilmBase, FilmBatchRequest
 from src.schemas.user_role_enum import UserRoleEnum
 from src.services.film_service import FilmService, get_film_service
+from src.utils.cached_response import CachedJSONResponse
+from src.utils.cursor import CursorPage, set_next_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +24,8 @@ router = APIRouter()
     dependencies=[Depends(role_dependency(UserRoleEnum.get_all_roles()))],
 )
 async def search_films(
+    request: Request,
+    response: Response,
     query: str | None = Query(None, description="Поисковый запрос по фильмам"),
     page_size: int = Query(
         10,
@@ -32,15 +38,80 @@ async def search_films(
         ge=1,
         description="Смещение для пагинации (больше ноля)",
     ),
+    cursor: str | None = Query(
+        None,
+        description=(
+            "Курсор постраничной выдачи: '*' для первой страницы, далее "
+            "значение заголовка X-Next-Cursor (page_number игнорируется)"
+        ),
+    ),
     film_service: FilmService = Depends(get_film_service),
-) -> list[FilmBase]:
+) -> CachedJSONResponse | list[FilmBase]:
     """
     Эндпоинт для поиска фильмов с поддержкой поиска по названию
-    и пагинацией.
+    и пагинацией (по смещению или по курсору).
     """
-    films = await film_service.search_films(
-        query=query, page_size=page_size, page_number=page_number
-    )
+    try:
+        films = await film_service.search_films(
+            query=query,
+            page_size=page_size,
+            page_number=page_number,
+            cursor=cursor,
+            raw=True,
+        )
+
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Invalid or expired cursor",
+        )
+
+    except CursorPageError:
+        raise HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail="Search service unavailable",
+        )
+
+    if isinstance(films, CursorPage):
+        return set_next_cursor(response, films)
+
+    if not films or not films.count:
+        # Выбрасываем HTTP-исключение с кодом 404
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail="Films not found",
+        )
+
+    return CachedJSONResponse(films, request)
+
+
+@router.get(
+    "/suggest",
+    response_model=list[FilmBase],
+    dependencies=[Depends(role_dependency(UserRoleEnum.get_all_roles()))],
+)
+async def suggest_films(
+    request: Request,
+    query: str = Query(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="Начало названия для автодополнения",
+    ),
+    size: int = Query(
+        10,
+        ge=1,
+        le=20,
+        description="Количество подсказок (от 1 до 20)",
+    ),
+    film_service: FilmService = Depends(get_film_service),
+) -> CachedJSONResponse:
+    """
+    Эндпоинт автодополнения фильмов по началу названия (или одного из
+    слов названия). Если подсказок нет, возвращается пустой список.
+    """
+    films = await film_service.suggest_films(query=query, size=size, raw=True)
+
     if not films:
         # Выбрасываем HTTP-исключение с кодом 404
         raise HTTPException(
@@ -48,11 +119,13 @@ async def search_films(
             detail="Films not found",
         )
 
-    return films
+    return CachedJSONResponse(films, request)
 
 
 @router.get("", response_model=list[FilmBase])
 async def get_films(
+        request: Request,
+        response: Response,
         genre: UUID | None = Query(
             None, description="UUID жанра для фильтрации"
         ),
@@ -71,27 +144,73 @@ async def get_films(
             ge=1,
             description="Смещение для пагинации (больше ноля)",
         ),
+        cursor: str | None = Query(
+            None,
+            description=(
+                "Курсор постраничной выдачи: '*' для первой страницы, далее "
+                "значение заголовка X-Next-Cursor (page_number игнорируется)"
+            ),
+        ),
         film_service: FilmService = Depends(get_film_service),
-) -> list[FilmBase]:
+) -> CachedJSONResponse | list[FilmBase]:
     """
     Эндпоинт для получения фильмов с поддержкой сортировки по рейтингу,
-    фильтрации по жанру и пагинацией.
+    фильтрации по жанру и пагинацией (по смещению или по курсору).
     """
-    films = await film_service.get_films(
-        sort=sort,
-        genre=genre,
-        page_size=page_size,
-        page_number=page_number,
-    )
+    try:
+        films = await film_service.get_films(
+            sort=sort,
+            genre=genre,
+            page_size=page_size,
+            page_number=page_number,
+            raw=True,
+            cursor=cursor,
+        )
 
-    if not films:
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Invalid or expired cursor",
+        )
+
+    except CursorPageError:
+        raise HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail="Search service unavailable",
+        )
+
+    if isinstance(films, CursorPage):
+        return set_next_cursor(response, films)
+
+    if not films or not films.count:
         # Выбрасываем HTTP-исключение с кодом 404
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail="Films not found",
         )
 
-    return films
+    return CachedJSONResponse(films, request)
+
+
+@router.post(
+    "/batch",
+    response_model=list[Film],
+    dependencies=[Depends(role_dependency(UserRoleEnum.get_all_roles()))],
+)
+async def films_batch(
+    request: Request,
+    batch: FilmBatchRequest,
+    film_service: FilmService = Depends(get_film_service),
+) -> CachedJSONResponse:
+    """
+    Эндпоинт для получения фильмов по списку ID одним запросом.
+    Отсутствующие фильмы пропускаются.
+    """
+    films = await film_service.get_films_by_ids(
+        [str(film_id) for film_id in batch.ids], raw=True
+    )
+
+    return CachedJSONResponse(films, request)
 
 
 @router.get(
@@ -101,12 +220,12 @@ async def get_films(
 async def film_is_exist(
     film_id: UUID,
     film_service: FilmService = Depends(get_film_service),
-) -> Film:
+) -> bool:
     """Эндпоинт для проверки наличия фильма по ID."""
     film_id = str(film_id)
-    film = await film_service.get_film_by_id(film_id)
+    film = await film_service.get_film_by_id(film_id, raw=True)
 
-    return True if film else False
+    return True if film and film.count else False
 
 
 @router.get(
@@ -115,18 +234,19 @@ async def film_is_exist(
     dependencies=[Depends(role_dependency(UserRoleEnum.get_all_roles()))],
 )
 async def film_details(
+    request: Request,
     film_id: UUID,
     film_service: FilmService = Depends(get_film_service),
-) -> Film:
+) -> CachedJSONResponse:
     """Эндпоинт для получения фильма по ID."""
     film_id = str(film_id)
-    film = await film_service.get_film_by_id(film_id)
+    film = await film_service.get_film_by_id(film_id, raw=True)
 
-    if not film:
+    if not film or not film.count:
         # Выбрасываем HTTP-исключение с кодом 404
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail="Film not found",
         )
 
-    return film[0]
+    return CachedJSONResponse(film, request)
@@ -2,12 +2,13 @@ import logging
 from http import HTTPStatus
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 
 from src.dependencies.auth import role_dependency
 from src.models.models import GenreBase
 from src.schemas.user_role_enum import UserRoleEnum
 from src.services.genre_service import GenreService, get_genre_service
+from src.utils.cached_response import CachedJSONResponse
 
 logger = logging.getLogger(__name__)
 
@@ -38,19 +39,20 @@ async def search_genres(
 
 @router.get("", response_model=list[GenreBase])
 async def get_genres(
+    request: Request,
     genre_service: GenreService = Depends(get_genre_service),
-) -> list[GenreBase]:
+) -> CachedJSONResponse:
     """Эндпоинт для получения всех жанров."""
-    genres = await genre_service.get_genres()
+    genres = await genre_service.get_genres(raw=True)
 
-    if not genres:
+    if not genres or not genres.count:
         # Выбрасываем HTTP-исключение с кодом 404
         raise HTTPException(
             status_code=HTTPStatus.NOT_FOUND,
             detail="Genres not found",
         )
 
-    return genres
+    return CachedJSONResponse(genres, request)
 
 
 @router.get(
@@ -59,14 +61,15 @@ async def get_genres(
     dependencies=[Depends(role_dependency(UserRoleEnum.get_all_roles()))],
 )
 async def genre_details(
+    request: Request,
     genre_id: UUID,
     genre_service: GenreService = Depends(get_genre_service),
-) -> GenreBase:
+) -> CachedJSONResponse:
     """Эндпоинт для получения конкретного жанра по ID."""
     genre_id = str(genre_id)
-    genre = await genre_service.get_genre_by_id(genre_id)
+    genre = await genre_service.get_genre_by_id(genre_id, raw=True)
 
-    if not genre:
+    if not genre or not genre.count:
         logger.info("Жанра с ID: %s не найден.", genre_id)
         # Выбрасываем HTTP-исключение с кодом 404
         raise HTTPException(
@@ -74,4 +77,4 @@ async def genre_details(
             detail="Genre not found",
         )
 
-    return genre[0]
+    return CachedJSONResponse(genre, request)
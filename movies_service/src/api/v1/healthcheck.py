@@ -1,4 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, status
+from fastapi.responses import ORJSONResponse
+
+from src.utils.health_checker import HealthChecker, get_health_checker
 
 router = APIRouter()
 
@@ -6,3 +9,23 @@ router = APIRouter()
 @router.get("")
 async def root():
     return {"message": "Movies API is running"}
+
+
+@router.get("/ready")
+async def ready(
+    health_checker: HealthChecker = Depends(get_health_checker),
+) -> ORJSONResponse:
+    """
+    Эндпоинт готовности: результат последней фоновой проверки доступности
+    Redis и Elasticsearch (без обращения к ним).
+    """
+    return ORJSONResponse(
+        status_code=(
+            status.HTTP_200_OK if health_checker.ready
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+        content={
+            "ready": health_checker.ready,
+            "services": health_checker.status,
+        },
+    )
@@ -2,12 +2,16 @@ import logging
 from http import HTTPStatus
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import (APIRouter, Depends, HTTPException, Query, Request,
+                     Response)
 
+from src.core.exceptions import CursorPageError, InvalidCursorError
 from src.dependencies.auth import role_dependency
-from src.models.models import FilmBase, Person
+from src.models.models import FilmBase, Person, PersonBase
 from src.schemas.user_role_enum import UserRoleEnum
 from src.services.person_service import PersonService, get_person_service
+from src.utils.cached_response import CachedJSONResponse
+from src.utils.cursor import CursorPage, set_next_cursor
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +22,8 @@ router = APIRouter(
 
 @router.get("/search", response_model=list[Person])
 async def search_persons(
+    request: Request,
+    response: Response,
     query: str | None = Query(
         None, description="Поисковый запрос по персонам"
     ),
@@ -32,15 +38,81 @@ async def search_persons(
         ge=1,
         description="Смещение для пагинации (больше ноля)",
     ),
+    cursor: str | None = Query(
+        None,
+        description=(
+            "Курсор постраничной выдачи: '*' для первой страницы, далее "
+            "значение заголовка X-Next-Cursor (page_number игнорируется)"
+        ),
+    ),
     person_service: PersonService = Depends(get_person_service),
-) -> list[Person]:
+) -> CachedJSONResponse | list[Person]:
     """
     Эндпоинт для поиска персон с поддержкой поиска по названию
-    и пагинацией.
+    и пагинацией (по смещению или по курсору).
     """
-    persons = await person_service.search_persons(
-        query=query, page_size=page_size, page_number=page_number
+    try:
+        persons = await person_service.search_persons(
+            query=query,
+            page_size=page_size,
+            page_number=page_number,
+            cursor=cursor,
+            raw=True,
+        )
+
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Invalid or expired cursor",
+        )
+
+    except CursorPageError:
+        raise HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail="Search service unavailable",
+        )
+
+    if isinstance(persons, CursorPage):
+        return set_next_cursor(response, persons)
+
+    if not persons or not persons.count:
+        # Выбрасываем HTTP-исключение с кодом 404
+        raise HTTPException(
+            status_code=HTTPStatus.NOT_FOUND,
+            detail="Persons not found",
+        )
+
+    return CachedJSONResponse(persons, request)
+
+
+@router.get(
+    "/suggest",
+    response_model=list[PersonBase],
+)
+async def suggest_persons(
+    request: Request,
+    query: str = Query(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="Начало имени для автодополнения",
+    ),
+    size: int = Query(
+        10,
+        ge=1,
+        le=20,
+        description="Количество подсказок (от 1 до 20)",
+    ),
+    person_service: PersonService = Depends(get_person_service),
+) -> CachedJSONResponse:
+    """
+    Эндпоинт автодополнения персон по началу имени (или одного из
+    слов имени). Если подсказок нет, возвращается пустой список.
+    """
+    persons = await person_service.suggest_persons(
+        query=query, size=size, raw=True
     )
+
     if not persons:
         # Выбрасываем HTTP-исключение с кодом 404
         raise HTTPException(
@@ -48,20 +120,21 @@ async def search_persons(
             detail="Persons not found",
         )
 
-    return persons
+    return CachedJSONResponse(persons, request)
 
 
 @router.get("/{person_id}/film", response_model=list[FilmBase])
 async def person_films(
+    request: Request,
     person_id: UUID,
     person_service: PersonService = Depends(get_person_service),
-) -> list[FilmBase]:
+) -> CachedJSONResponse:
     """
     Эндпоинт для получения фильмов в производстве которых участвовала персона.
     """
-    films = await person_service.get_person_films(person_id)
+    films = await person_service.get_person_films(person_id, raw=True)
 
-    if not films:
+    if not films or not films.count:
         logger.info("Фильмы для персоны с ID: %s не найдены.", person_id)
         # Выбрасываем HTTP-исключение с кодом 404
         raise HTTPException(
@@ -69,19 +142,20 @@ async def person_films(
             detail="Films not found",
         )
 
-    return films
+    return CachedJSONResponse(films, request)
 
 
 @router.get("/{person_id}", response_model=Person)
 async def person_details(
+    request: Request,
     person_id: UUID,
     person_service: PersonService = Depends(get_person_service),
-) -> Person:
+) -> CachedJSONResponse:
     """Эндпоинт для получения полной информации о персоне по ID."""
     person_id = str(person_id)
-    person = await person_service.get_person_by_id(person_id)
+    person = await person_service.get_person_by_id(person_id, raw=True)
 
-    if not person:
+    if not person or not person.count:
         logger.info("Персона с ID: %s не найдена.", person_id)
         # Выбрасываем HTTP-исключение с кодом 404
         raise HTTPException(
@@ -89,4 +163,4 @@ async def person_details(
             detail="Person not found",
         )
 
-    return person[0]
+    return CachedJSONResponse(person, request)
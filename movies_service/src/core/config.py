@@ -1,6 +1,6 @@
 import os
 from functools import cached_property
-from typing import Any
+from typing import Any, Literal
 
 from asyncpg.exceptions import \
     ConnectionDoesNotExistError as PGConnectionDoesNotExistError
@@ -8,11 +8,31 @@ from asyncpg.exceptions import PostgresError
 from asyncpg.exceptions import SyntaxOrAccessError as PGSyntaxOrAccessError
 from elastic_transport import TransportError as ESTransportError
 from elasticsearch import ApiError as ESApiError
-from pydantic import Field, computed_field
+from pydantic import BaseModel, Field, computed_field
 from pydantic_settings import BaseSettings
 from redis.exceptions import RedisError
 
 
+class CachePolicy(BaseModel):
+    """
+    Политика кеширования для семейства ключей (film, films, genre, ...).
+
+    - ttl: мягкий TTL, после которого запись считается устаревшей.
+    - stale_ttl: сколько ещё секунд устаревшая запись отдаётся клиентам, пока
+    идёт её обновление в фоне.
+    - beta: коэффициент вероятностного раннего обновления (XFetch), 0 —
+    отключено.
+    """
+    ttl: int = Field(300, ge=1)
+    stale_ttl: int = Field(0, ge=0)
+    beta: float = Field(1.0, ge=0)
+
+    @property
+    def expire(self) -> int:
+        """Жёсткий TTL записи в Redis."""
+        return self.ttl + self.stale_ttl
+
+
 class Settings(BaseSettings):
     project_name: str = Field("movies", alias="PROJECT_NAME")
     service_name: str = Field("movies_service", alias="MOVIES_SERVICE_NAME")
@@ -38,17 +58,50 @@ class Settings(BaseSettings):
 
     auth_service_host: str = Field(alias="AUTH_SERVICE_HOST")
     auth_service_port: int = Field(alias="AUTH_SERVICE_PORT")
+    # Пул HTTP-соединений (HTTP/2, keep-alive) с auth-сервисом
+    auth_http2: bool = Field(True, alias="AUTH_HTTP2")
+    auth_http_max_connections: int = Field(
+        100, alias="AUTH_HTTP_MAX_CONNECTIONS"
+    )
+    auth_http_keepalive_expiry: float = Field(
+        30.0, alias="AUTH_HTTP_KEEPALIVE_EXPIRY"
+    )
+    auth_http_timeout: float = Field(1.0, alias="AUTH_HTTP_TIMEOUT")
+    # Локальная проверка подписи JWT и отзыва токена (без auth-сервиса)
+    auth_verify_locally: bool = Field(False, alias="AUTH_VERIFY_LOCALLY")
+    # БД Redis auth-сервиса и ключ набора отозванных токенов в ней
+    auth_redis_db: int = Field(0, alias="AUTH_REDIS_DB")
+    revoked_tokens_key: str = Field(
+        "revoked_tokens", alias="REVOKED_TOKENS_KEY"
+    )
+    # In-process кеш проверенных токенов и канал уведомлений об их отзыве
+    token_cache_max_size: int = Field(10000, alias="TOKEN_CACHE_MAX_SIZE")
+    token_revocation_channel: str = Field(
+        "auth:tokens:revoked", alias="TOKEN_REVOCATION_CHANNEL"
+    )
 
     redis_host: str = Field("redis", alias="REDIS_HOST")
     redis_port: int = Field(6379, alias="REDIS_PORT")
     redis_password: str = Field("password", alias="REDIS_PASSWORD")
     redis_rate_limit_db: int = Field(1, alias="REDIS_RATE_LIMIT_DB")
+    # Пул соединений Redis для кеша
+    redis_max_connections: int = Field(100, alias="REDIS_MAX_CONNECTIONS")
+    redis_health_check_interval: int = Field(
+        30, alias="REDIS_HEALTH_CHECK_INTERVAL"
+    )
 
     elastic_host: str = Field(default="elasticsearch", alias="ELASTIC_HOST")
     elastic_port: int = Field(default=9200, alias="ELASTIC_PORT")
     elastic_scheme: str = Field(default="http", alias="ELASTIC_SCHEME")
     elastic_name: str = Field(default="elastic", alias="ELASTIC_USERNAME")
     elastic_password: str = Field(default="123qwe", alias="ELASTIC_PASSWORD")
+    # Пул соединений Elasticsearch (keep-alive соединения на узел)
+    elastic_connections_per_node: int = Field(
+        default=10, alias="ELASTIC_CONNECTIONS_PER_NODE"
+    )
+    elastic_request_timeout: float = Field(
+        default=10.0, alias="ELASTIC_REQUEST_TIMEOUT"
+    )
 
     pg_user: str = Field(default="user", alias="PG_USER")
     pg_password: str = Field(default="password", alias="PG_PASSWORD")
@@ -77,10 +130,104 @@ class Settings(BaseSettings):
     algorithm: str = "HS256"
 
     elastic_response_size: int = 1000
+    # Время жизни контекста point-in-time для курсорной пагинации
+    elastic_pit_keep_alive: str = Field(
+        "1m", alias="ELASTIC_PIT_KEEP_ALIVE"
+    )
     cache_expire_in_seconds: int = 300
 
+    cache_policies: dict[str, CachePolicy] = Field(
+        default_factory=lambda: {
+            "film": CachePolicy(ttl=300, stale_ttl=600),
+            "films": CachePolicy(ttl=300, stale_ttl=300),
+            "genre": CachePolicy(ttl=3600, stale_ttl=3600),
+            "genres": CachePolicy(ttl=3600, stale_ttl=3600),
+            "person": CachePolicy(ttl=600, stale_ttl=600),
+            "person_films": CachePolicy(ttl=600, stale_ttl=600),
+            "film_search": CachePolicy(ttl=60, stale_ttl=60),
+            "person_search": CachePolicy(ttl=60, stale_ttl=60),
+            "film_suggest": CachePolicy(ttl=300, stale_ttl=300),
+            "person_suggest": CachePolicy(ttl=300, stale_ttl=300),
+        },
+        alias="CACHE_POLICIES",
+    )
+
+    # TTL записей-надгробий (tombstone) для отсутствующих в источнике ID
+    cache_negative_ttl: int = Field(30, alias="CACHE_NEGATIVE_TTL")
+
+    # Локальный (in-process) кеш первого уровня перед Redis
+    local_cache_max_size: int = Field(10000, alias="LOCAL_CACHE_MAX_SIZE")
+    local_cache_ttl_seconds: int = Field(30, alias="LOCAL_CACHE_TTL_SECONDS")
+    # Семейства ключей, допускаемые в заполненный кеш по частоте (TinyLFU)
+    local_cache_admission_prefixes: list[str] = Field(
+        default_factory=lambda: [
+            "film_search", "person_search", "film_suggest", "person_suggest",
+        ],
+        alias="LOCAL_CACHE_ADMISSION_PREFIXES",
+    )
+    cache_invalidation_channel: str = Field(
+        "movies:cache:invalidate", alias="CACHE_INVALIDATION_CHANNEL"
+    )
+    # Поток Redis с изменениями индексов, которые публикует ETL
+    cache_changes_stream: str = Field(
+        "movies:cache:changes", alias="CACHE_CHANGES_STREAM"
+    )
+
+    # Размер топ-списков фильмов по жанрам, которые ведёт ETL (sorted set)
+    genre_top_size: int = Field(1000, alias="GENRE_TOP_SIZE")
+
+    # Кодек записей кеша в Redis: json или msgpack (колоночные списки).
+    # Записи хранят версию кодека, поэтому смена не требует очистки кеша
+    cache_codec: Literal["json", "msgpack"] = Field(
+        "json", alias="CACHE_CODEC"
+    )
+
+    # Кодировка предварительно сжатого варианта ответов в кеше: gzip, br
+    # или zstd (пустое значение отключает сжатие)
+    cache_compression_encoding: str | None = Field(
+        "gzip", alias="CACHE_COMPRESSION_ENCODING"
+    )
+    cache_compression_min_size: int = Field(
+        1024, alias="CACHE_COMPRESSION_MIN_SIZE"
+    )
+
+    # Распределённая блокировка при промахе кеша (между воркерами и подами)
+    cache_lock_enabled: bool = Field(False, alias="CACHE_LOCK_ENABLED")
+    cache_lock_timeout: int = Field(10, alias="CACHE_LOCK_TIMEOUT")
+    cache_lock_blocking_timeout: float = Field(
+        2.0, alias="CACHE_LOCK_BLOCKING_TIMEOUT"
+    )
+
+    # Фоновая проверка доступности Redis и Elasticsearch (готовность)
+    health_check_interval: float = Field(5.0, alias="HEALTH_CHECK_INTERVAL")
+    health_check_timeout: float = Field(2.0, alias="HEALTH_CHECK_TIMEOUT")
+    health_check_failure_threshold: int = Field(
+        3, alias="HEALTH_CHECK_FAILURE_THRESHOLD"
+    )
+
     rate_limit: int = Field(5, alias="RATE_LIMIT")
     rate_limit_window: int = Field(60, alias="RATE_LIMIT_WINDOW")
+    # Стратегия RateLimit: fixed_window, sliding_window или token_bucket
+    rate_limit_strategy: Literal[
+        "fixed_window", "sliding_window", "token_bucket"
+    ] = Field("sliding_window", alias="RATE_LIMIT_STRATEGY")
+    # Локальные маркерные вёдра с пакетной синхронизацией в Redis (только
+    # для стратегии sliding_window)
+    rate_limit_local_enabled: bool = Field(
+        False, alias="RATE_LIMIT_LOCAL_ENABLED"
+    )
+    # Количество воркеров всех экземпляров сервиса: лимит делится между
+    # их локальными вёдрами
+    rate_limit_local_workers: int = Field(
+        1, alias="RATE_LIMIT_LOCAL_WORKERS"
+    )
+    rate_limit_sync_interval: float = Field(
+        0.2, alias="RATE_LIMIT_SYNC_INTERVAL"
+    )
+    rate_limit_hot_ratio: float = Field(0.8, alias="RATE_LIMIT_HOT_RATIO")
+    redis_rate_limit_max_connections: int = Field(
+        50, alias="REDIS_RATE_LIMIT_MAX_CONNECTIONS"
+    )
 
     @computed_field
     @property
@@ -90,6 +237,14 @@ class Settings(BaseSettings):
             f"{self.redis_port}/{self.redis_rate_limit_db}"
         )
 
+    def get_cache_policy(self, cache_key: str) -> CachePolicy:
+        """Политика кеширования по семейству (префиксу) ключа."""
+        family = cache_key.split(":", 1)[0]
+
+        return self.cache_policies.get(family) or CachePolicy(
+            ttl=self.cache_expire_in_seconds
+        )
+
     @cached_property
     def auth_service_url(self) -> str:
         return (
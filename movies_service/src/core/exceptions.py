@@ -53,3 +53,18 @@ class JsonLoadsError(BaseServiceError):
 class CheckCacheError(BaseServiceError):
     """Исключение для ошибок, связанных с проверкой записи в кеше."""
     pass
+
+
+class InvalidCursorError(BaseServiceError):
+    """
+    Исключение для некорректного или истёкшего курсора постраничной выдачи.
+    """
+    pass
+
+
+class CursorPageError(BaseServiceError):
+    """
+    Исключение для ошибок получения страницы выдачи по курсору из
+    Elasticsearch.
+    """
+    pass
@@ -1,6 +1,6 @@
 import logging
 
-from elasticsearch import ApiError, AsyncElasticsearch, ConnectionError
+from elasticsearch import AsyncElasticsearch
 
 from src.core.config import settings
 from src.utils.elastic_service import ElasticService
@@ -11,46 +11,58 @@ logging.basicConfig(level=logging.INFO)
 es: ElasticService | None = None
 
 
+def _create_elastic_client() -> AsyncElasticsearch:
+    """
+    Создание клиента Elasticsearch с пулом keep-alive соединений.
+    Соединения устанавливаются при первом запросе.
+    """
+    return AsyncElasticsearch(
+        hosts=[
+            f"{settings.elastic_scheme}://{settings.elastic_host}:"
+            f"{settings.elastic_port}"
+        ],
+        basic_auth=(settings.elastic_name, settings.elastic_password),
+        connections_per_node=settings.elastic_connections_per_node,
+        request_timeout=settings.elastic_request_timeout,
+    )
+
+
 async def get_elastic() -> ElasticService:
+    """
+    Возвращает экземпляр ElasticService. Клиент создаётся один раз;
+    доступность Elasticsearch проверяется не при каждом запросе, а в фоне
+    (HealthChecker).
+    """
     global es
-    # Проверка, существует ли es и активно ли соединение
-    if not es or not await es.es_client.ping():
+
+    if not es:
         logger.info("Создание клиента Elasticsearch...")
-        es_client = None
-        try:
-            es_client = AsyncElasticsearch(
-                hosts=[
-                    f"{settings.elastic_scheme}://{settings.elastic_host}:"
-                    f"{settings.elastic_port}"
-                ],
-                basic_auth=(settings.elastic_name, settings.elastic_password),
-            )
-            if not await es_client.ping():
-                raise ConnectionError("Elasticsearch недоступен.")
-
-            logger.info("Клиент Elasticsearch успешно создан.")
-
-            es = ElasticService(es_client)
-
-        except ConnectionError as ce:
-            logger.error(f"Ошибка подключения к Elasticsearch: {ce}")
-            if es_client:
-                await es_client.close()
-            raise
-        except ApiError as ae:
-            logger.error(f"Ошибка API Elasticsearch: {ae}")
-            if es_client:
-                await es_client.close()
-            raise
-        except Exception as e:
-            logger.error(f"Ошибка при создании клиента Elasticsearch: {e}")
-            if es_client:
-                await es_client.close()
-            raise
+        es = ElasticService(_create_elastic_client())
+        logger.info("Клиент Elasticsearch успешно создан.")
 
     return es
 
 
+async def reconnect_elastic() -> None:
+    """
+    Пересоздание клиента Elasticsearch (с новым пулом соединений) без
+    замены экземпляра ElasticService, который используется сервисами.
+    """
+    if not es:
+        return
+
+    logger.info("Переподключение к Elasticsearch...")
+    old_client, es.es_client = es.es_client, _create_elastic_client()
+
+    try:
+        await old_client.close()
+
+    except Exception as e:
+        logger.warning(
+            "Ошибка при закрытии прежнего клиента Elasticsearch: %s", e
+        )
+
+
 async def close_elastic():
     """
     Закрывает соединение с Elasticsearch.
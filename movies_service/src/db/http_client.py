@@ -0,0 +1,45 @@
+import logging
+
+import httpx
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+auth_http_client: httpx.AsyncClient | None = None
+
+
+def get_auth_http_client() -> httpx.AsyncClient:
+    """
+    Возвращает общий HTTP-клиент для запросов к auth-сервису. Клиент
+    создаётся один раз: соединения (HTTP/2, keep-alive) берутся из пула и
+    переиспользуются между запросами.
+
+    @rtype: httpx.AsyncClient
+    @return: http_client
+    """
+    global auth_http_client
+
+    if auth_http_client is None:
+        logger.info("Создание HTTP-клиента для auth-сервиса...")
+        auth_http_client = httpx.AsyncClient(
+            base_url=settings.auth_service_url,
+            http2=settings.auth_http2,
+            limits=httpx.Limits(
+                max_connections=settings.auth_http_max_connections,
+                max_keepalive_connections=settings.auth_http_max_connections,
+                keepalive_expiry=settings.auth_http_keepalive_expiry,
+            ),
+            timeout=settings.auth_http_timeout,
+        )
+
+    return auth_http_client
+
+
+async def close_auth_http_client() -> None:
+    """Закрытие пула соединений HTTP-клиента для auth-сервиса."""
+    global auth_http_client
+
+    if auth_http_client is not None:
+        await auth_http_client.aclose()
+        auth_http_client = None
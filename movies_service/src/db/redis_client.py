@@ -1,8 +1,6 @@
 import logging
-from contextlib import asynccontextmanager
 
 from redis.asyncio import Redis
-from redis.exceptions import ConnectionError
 
 from src.core.config import settings
 from src.utils.cache_service import CacheService
@@ -10,53 +8,104 @@ from src.utils.cache_service import CacheService
 logger = logging.getLogger(__name__)
 
 redis_cache: CacheService | None = None
+redis_rate_limit: Redis | None = None
+redis_auth: Redis | None = None
 
 
 async def get_redis_cache() -> CacheService:
     """
     Возвращает экземпляр CacheService, обеспечивающий работу с Redis для
-    кэширования.
+    кэширования. Клиент (с пулом соединений) создаётся один раз;
+    доступность Redis проверяется не при каждом запросе, а в фоне
+    (HealthChecker).
     """
     global redis_cache
 
-    try:
-        if not redis_cache or not await redis_cache.redis_client.ping():
-            logger.info("Создание клиента Redis для кеша...")
-            redis_client = Redis(
-                host=settings.redis_host,
-                port=settings.redis_port,
-                password=settings.redis_password,
-                db=1,
-            )
-            if not await redis_client.ping():
-                raise ConnectionError("Redis недоступен!")
+    if not redis_cache:
+        logger.info("Создание клиента Redis для кеша...")
+        redis_client = Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            password=settings.redis_password,
+            db=1,
+            max_connections=settings.redis_max_connections,
+            socket_keepalive=True,
+            health_check_interval=settings.redis_health_check_interval,
+        )
+        redis_cache = CacheService(redis_client)
+
+        logger.info("Клиент Redis для кеша успешно создан.")
 
-            redis_cache = CacheService(redis_client)
+    return redis_cache
 
-            logger.info("Клиент Redis для кеша успешно создан.")
 
-    except Exception as e:
-        logger.error(f"Ошибка при создании клиента Redis для кеша: {e}")
-        raise
+async def reconnect_redis_cache() -> None:
+    """
+    Сброс соединений пула клиента Redis для кеша: новые соединения будут
+    установлены при следующих запросах.
+    """
+    if redis_cache:
+        logger.info("Переподключение к Redis для кеша...")
+        await redis_cache.redis_client.connection_pool.disconnect()
+
+
+def get_redis_rate_limit() -> Redis:
+    """
+    Возвращает общий клиент Redis для RateLimit. Соединения берутся из пула
+    клиента и переиспользуются между запросами.
+
+    @rtype: Redis
+    @return: redis_client
+    """
+    global redis_rate_limit
+
+    if redis_rate_limit is None:
+        redis_rate_limit = Redis.from_url(
+            url=settings.redis_rate_limit_url,
+            max_connections=settings.redis_rate_limit_max_connections,
+        )
+
+    return redis_rate_limit
 
-    return redis_cache
 
+async def close_redis_rate_limit() -> None:
+    """Закрытие пула соединений клиента Redis для RateLimit."""
+    global redis_rate_limit
 
-@asynccontextmanager
-async def redis_client_by_rate_limit():
+    if redis_rate_limit is not None:
+        await redis_rate_limit.close()
+        await redis_rate_limit.connection_pool.disconnect()
+        redis_rate_limit = None
+
+
+def get_redis_auth() -> Redis:
     """
-    Асинхронный контекстный менеджер Redis для RateLimit.
+    Возвращает общий клиент Redis auth-сервиса (только для чтения набора
+    отозванных токенов при локальной проверке токенов).
 
-    @rtype: AsyncGenerator[Redis | None | Redis[bytes], Any]
+    @rtype: Redis
     @return: redis_client
     """
-    redis_client = Redis.from_url(url=settings.redis_rate_limit_url)
+    global redis_auth
+
+    if redis_auth is None:
+        redis_auth = Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            password=settings.redis_password,
+            db=settings.auth_redis_db,
+            socket_keepalive=True,
+            health_check_interval=settings.redis_health_check_interval,
+        )
+
+    return redis_auth
 
-    try:
-        if not await redis_client.ping():
-            raise ConnectionError("Redis недоступен!")
 
-        yield redis_client
+async def close_redis_auth() -> None:
+    """Закрытие пула соединений клиента Redis auth-сервиса."""
+    global redis_auth
 
-    finally:
-        await redis_client.close()
+    if redis_auth is not None:
+        await redis_auth.close()
+        await redis_auth.connection_pool.disconnect()
+        redis_auth = None
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from fastapi import APIRouter, Depends, FastAPI
@@ -5,12 +6,19 @@ from fastapi.responses import ORJSONResponse
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
 from src.api.v1 import films, genres, healthcheck, persons
+from src.api.internal.v1 import cache as internal_cache
 from src.api.internal.v1 import films as internal_films
 from src.core.config import settings
-from src.db.elastic import get_elastic
-from src.db.redis_client import get_redis_cache
+from src.db.elastic import get_elastic, reconnect_elastic
+from src.db.http_client import close_auth_http_client
+from src.db.redis_client import (close_redis_auth, close_redis_rate_limit,
+                                 get_redis_auth, get_redis_cache,
+                                 reconnect_redis_cache)
 from src.dependencies import check_request_id
 from src.middleware import AsyncRateLimitMiddleware
+from src.utils.cache_generations import get_cache_generations
+from src.utils.health_checker import get_health_checker
+from src.utils.local_cache import get_local_cache, get_token_cache
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -78,6 +86,40 @@ async def startup():
     else:
         logger.info("Подключение к Elasticsearch успешно установлено.")
 
+    # Фоновая проверка доступности Redis и Elasticsearch
+    health_checker = get_health_checker()
+    health_checker.register(
+        "redis", redis_cache.redis_client.ping, reconnect_redis_cache
+    )
+    health_checker.register(
+        "elasticsearch", es.is_connected, reconnect_elastic
+    )
+    await health_checker.check_all()
+    app.state.health_checker_task = asyncio.create_task(health_checker.run())
+
+    # Подписка на инвалидацию локального кеша (между воркерами)
+    app.state.local_cache_listener = asyncio.create_task(
+        get_local_cache().listen_invalidations(
+            redis_cache.redis_client, settings.cache_invalidation_channel
+        )
+    )
+
+    # Чтение потока изменений индексов от ETL (инвалидация кеша)
+    app.state.cache_changes_listener = asyncio.create_task(
+        get_cache_generations().listen_changes(
+            redis_cache.redis_client,
+            get_local_cache(),
+            settings.cache_changes_stream,
+        )
+    )
+
+    # Подписка на уведомления auth-сервиса об отзыве токенов
+    app.state.token_revocation_listener = asyncio.create_task(
+        get_token_cache().listen_invalidations(
+            get_redis_auth(), settings.token_revocation_channel
+        )
+    )
+
     logger.info("Все подключения успешно установлены.")
 
 
@@ -87,11 +129,34 @@ async def shutdown():
     Событие завершения работы приложения: закрытие подключений к Redis и
     Elasticsearch.
     """
+    # Остановка подписки на инвалидацию локального кеша
+    if listener := getattr(app.state, "local_cache_listener", None):
+        listener.cancel()
+
+    # Остановка чтения потока изменений индексов
+    if listener := getattr(app.state, "cache_changes_listener", None):
+        listener.cancel()
+
+    # Остановка подписки на уведомления об отзыве токенов
+    if listener := getattr(app.state, "token_revocation_listener", None):
+        listener.cancel()
+
+    # Остановка фоновой проверки доступности
+    if health_checker_task := getattr(app.state, "health_checker_task", None):
+        health_checker_task.cancel()
+
     # Закрытие подключения к Redis
     redis_cache = await get_redis_cache()
     if redis_cache:
         await redis_cache.close()
 
+    # Закрытие пула соединений с Redis для RateLimit
+    await close_redis_rate_limit()
+
+    # Закрытие пулов соединений с auth-сервисом и его Redis
+    await close_auth_http_client()
+    await close_redis_auth()
+
     # Закрытие подключения к Elasticsearch
     es = await get_elastic()
     if es:
@@ -117,6 +182,9 @@ app.include_router(api_router)
 internal_api_router.include_router(
     internal_films.router, prefix="/movies/films", tags=["internal_films"]
 )
+internal_api_router.include_router(
+    internal_cache.router, prefix="/movies/cache", tags=["internal_cache"]
+)
 app.include_router(internal_api_router)
 
 
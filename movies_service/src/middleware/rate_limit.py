@@ -1,17 +1,21 @@
+import logging
+
 from fastapi import Request, Response, status
 from fastapi.responses import JSONResponse
 from limits import parse
 from limits.storage import RedisStorage
 from limits.strategies import FixedWindowRateLimiter
-from redis.asyncio.client import Pipeline
 from starlette.middleware.base import (BaseHTTPMiddleware,
                                        RequestResponseEndpoint)
 
 from src.core.config import settings
-from src.db.redis_client import redis_client_by_rate_limit
+from src.db.redis_client import get_redis_rate_limit
+from src.utils.rate_limiter import HybridRateLimiter, RateLimiter
 
 __all__ = ["RateLimitMiddleware", "AsyncRateLimitMiddleware"]
 
+logger = logging.getLogger(__name__)
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
@@ -44,17 +48,39 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
 class AsyncRateLimitMiddleware(BaseHTTPMiddleware):
     """
-    Кастомный RateLimit. Асинхронный, реализует стратегию ограничения с
-    фиксированным окном.
+    Кастомный RateLimit. Асинхронный, использует общий пул соединений с
+    Redis; стратегия ограничения (fixed_window, sliding_window,
+    token_bucket) задаётся в настройках, проверка и учёт запроса
+    выполняются одним Lua-скриптом.
+
+    При включённом локальном режиме (RATE_LIMIT_LOCAL_ENABLED) запросы
+    проверяются по маркерным вёдрам в памяти воркера с пакетной
+    синхронизацией в Redis, а синхронно в Redis проверяются только ключи,
+    близкие к лимиту (только для стратегии sliding_window).
     """
 
     def __init__(self, app) -> None:
         super().__init__(app=app)
-        self._limit = settings.rate_limit
-        self._window_sec = settings.rate_limit_window
         self._key_template = "ratelimit:{client_id}"
 
-        self.__def_counter = 0
+        if settings.rate_limit_local_enabled:
+            self._rate_limiter = HybridRateLimiter(
+                redis_client=get_redis_rate_limit(),
+                limit=settings.rate_limit,
+                window=settings.rate_limit_window,
+                strategy=settings.rate_limit_strategy,
+                sync_interval=settings.rate_limit_sync_interval,
+                hot_ratio=settings.rate_limit_hot_ratio,
+                workers=settings.rate_limit_local_workers,
+            )
+
+        else:
+            self._rate_limiter = RateLimiter(
+                redis_client=get_redis_rate_limit(),
+                limit=settings.rate_limit,
+                window=settings.rate_limit_window,
+                strategy=settings.rate_limit_strategy,
+            )
 
     async def dispatch(
             self, request: Request, call_next: RequestResponseEndpoint
@@ -62,21 +88,19 @@ class AsyncRateLimitMiddleware(BaseHTTPMiddleware):
         client_id = request.headers.get("X-Forwarded-For", request.client.host)
         key_ = self._key_template.format(client_id=client_id)
 
-        async with redis_client_by_rate_limit() as rm_redis_client:
-            current_count = await rm_redis_client.get(name=key_)
-            current_count = int(
-                current_count
-            ) if current_count else self.__def_counter
+        try:
+            allowed, retry_after = await self._rate_limiter.hit(key_)
+
+        except settings.redis_exceptions as e:
+            # Недоступность Redis не должна останавливать обработку запросов
+            logger.warning("Ошибка проверки RateLimit: %s", e)
 
-            if current_count > self._limit:
+        else:
+            if not allowed:
                 return JSONResponse(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                    content={"detail": "TOO MANY REQUESTS"}
+                    content={"detail": "TOO MANY REQUESTS"},
+                    headers={"Retry-After": str(retry_after)},
                 )
 
-            pipe: Pipeline = await rm_redis_client.pipeline()
-            pipe.incr(name=key_)
-            pipe.expire(name=key_, time=self._window_sec)
-            await pipe.execute()
-
         return await call_next(request)
@@ -9,10 +9,14 @@ class GenreBase(BaseModel):
     """
     Базовая модель для представления жанра.
     """
+    # Данные принимаются как по имени поля (Elasticsearch), так и по
+    # псевдониму (кеш хранит готовое тело ответа API)
+    model_config = ConfigDict(populate_by_name=True)
+
     id: UUID = Field(
         ...,
         description="Уникальный идентификатор жанра",
-        serialization_alias='uuid'
+        alias="uuid"
     )
     name: str = Field(
         ..., min_length=1, max_length=50, description="Название жанра"
@@ -30,10 +34,12 @@ class PersonBase(BaseModel):
     """
     Базовая модель для представления информации о персоне.
     """
+    model_config = ConfigDict(populate_by_name=True)
+
     id: UUID = Field(
         ...,
         description="Уникальный идентификатор персоны",
-        serialization_alias='uuid'
+        alias="uuid"
     )
     full_name: str = Field(
         ..., min_length=1, max_length=150, description="Полное имя персоны"
@@ -44,10 +50,12 @@ class FilmRole(BaseModel):
     """
     Модель для представления участия в фильме.
     """
+    model_config = ConfigDict(populate_by_name=True)
+
     id: str = Field(
         ...,
         description="Уникальный идентификатор фильма",
-        serialization_alias="uuid"
+        alias="uuid"
     )
     roles: list[str] = Field(
         ..., min_length=1, max_length=100, description="Роли персоны в фильме"
@@ -70,7 +78,7 @@ class FilmBase(BaseModel):
     id: UUID = Field(
         ...,
         description="Уникальный идентификатор фильма",
-        serialization_alias="uuid",
+        alias="uuid",
     )
     title: str = Field(
         ..., min_length=1, max_length=255, description="Название фильма"
@@ -80,7 +88,9 @@ class FilmBase(BaseModel):
     )
 
     # Автоматическое преобразование Decimal → float
-    model_config = ConfigDict(json_encoders={Decimal: float})
+    model_config = ConfigDict(
+        json_encoders={Decimal: float}, populate_by_name=True
+    )
 
 
 class Film(FilmBase):
@@ -89,7 +99,7 @@ class Film(FilmBase):
     """
     description: str = Field(..., description="Описание фильма")
     genres: list[GenreBase] = Field(
-        ..., description="Список жанров фильма", serialization_alias="genre",
+        ..., description="Список жанров фильма", alias="genre",
     )
     actors: list[PersonBase] = Field(..., description="Список актёров фильма")
     writers: list[PersonBase] = Field(
@@ -100,6 +110,16 @@ class Film(FilmBase):
     )
 
 
+class FilmBatchRequest(BaseModel):
+    """
+    Модель запроса на получение фильмов по списку ID.
+    """
+    ids: list[UUID] = Field(
+        ..., min_length=1, max_length=100,
+        description="Список ID фильмов (от 1 до 100)",
+    )
+
+
 class SearchParams(BaseModel):
     query: dict[Any, Any]
     sort: list[dict[Any, Any]]
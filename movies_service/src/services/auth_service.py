@@ -1,4 +1,5 @@
 import asyncio
+import hashlib
 import json
 import logging
 from datetime import UTC, datetime
@@ -8,54 +9,72 @@ from typing import Annotated
 import httpx
 from fastapi import Depends, HTTPException, status
 from jose import JWTError, jwt
+from redis.asyncio import Redis
 
 from src.core.config import settings
 from src.core.exceptions import CacheServiceError
-from src.db.redis_client import get_redis_cache
+from src.db.http_client import get_auth_http_client
+from src.db.redis_client import get_redis_auth, get_redis_cache
 from src.utils.cache_service import CacheService
+from src.utils.local_cache import LocalCache, get_token_cache
 
 logger = logging.getLogger(__name__)
 
 
+def token_fingerprint(token: str) -> str:
+    """
+    Отпечаток токена (SHA-256): используется вместо самого токена в ключах
+    кеша, логах и наборе отозванных токенов auth-сервиса.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 class AuthService:
-    def __init__(self, redis_client: CacheService):
+    def __init__(
+        self,
+        redis_client: CacheService,
+        http_client: httpx.AsyncClient,
+        redis_auth: Redis,
+        token_cache: LocalCache,
+    ):
         self.redis_client = redis_client
+        self.http_client = http_client
+        self.redis_auth = redis_auth
+        self.token_cache = token_cache
 
-    @staticmethod
-    async def verify_token_through_auth(token: str, request_id: str) -> dict:
+    async def verify_token_through_auth(
+            self, token: str, request_id: str
+    ) -> dict:
         """Проверяет токен через auth-сервис."""
         headers = {
             "Authorization": f"Bearer {token}",
             "X-Request-Id": request_id,
         }
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{settings.auth_service_url}/validate",
-                    headers=headers,
-                    timeout=1.0,
-                )
-                response.raise_for_status()
-
-            except httpx.HTTPStatusError as e:
-                logger.error(
-                    "Ошибка при проверки токена через auth-сервис: %s "
-                    "token=%s ",
-                    e, token
-                )
-                raise HTTPException(
-                    status_code=e.response.status_code,
-                    detail="Unauthorized or invalid token"
-                )
-
-            except httpx.RequestError:
-                logger.error(
-                    "Auth-сервис недоступен для проверки токена %s ", token
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="Auth service unavailable"
-                )
+        try:
+            response = await self.http_client.post(
+                "/validate", headers=headers
+            )
+            response.raise_for_status()
+
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                "Ошибка при проверки токена через auth-сервис: %s "
+                "fingerprint=%s ",
+                e, token_fingerprint(token)
+            )
+            raise HTTPException(
+                status_code=e.response.status_code,
+                detail="Unauthorized or invalid token"
+            )
+
+        except httpx.RequestError as e:
+            logger.error(
+                "Auth-сервис недоступен для проверки токена: %s", e
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Auth service unavailable"
+            )
 
         payload = response.json()
         return payload
@@ -82,31 +101,87 @@ class AuthService:
                 detail="Invalid token",
             )
 
+    async def is_token_revoked(self, token: str) -> bool:
+        """
+        Проверяет наличие отпечатка токена в наборе отозванных токенов,
+        который ведёт auth-сервис.
+        """
+        score = await self.redis_auth.zscore(
+            settings.revoked_tokens_key, token_fingerprint(token)
+        )
+        return score is not None
+
+    async def verify_token_without_auth(self, token: str) -> dict | None:
+        """
+        Локальная проверка токена: подпись и срок действия JWT, а также
+        отсутствие токена в наборе отозванных. Возвращает None, если набор
+        отозванных токенов недоступен.
+        """
+        payload = await self.varify_token_locally(token)
+
+        try:
+            revoked = await self.is_token_revoked(token)
+
+        except settings.redis_exceptions as e:
+            logger.warning(
+                "Набор отозванных токенов недоступен: %s. Проверка токена "
+                "через auth-сервис.", e
+            )
+            return None
+
+        if revoked:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token has been revoked",
+            )
+
+        return payload
+
+    def _remember_token(self, cache_key: str, payload: dict) -> None:
+        """
+        Сохраняет payload проверенного токена в in-process кеше до истечения
+        срока действия токена (exp).
+        """
+        ttl = int(int(payload["exp"]) - datetime.now(UTC).timestamp())
+
+        if ttl > 0:
+            self.token_cache.set(cache_key, payload, ttl)
+
     async def varify_token_with_cache(
             self, token: str, request_id: str
     ) -> dict:
         """
-        Проверяет токен с использованием кеша через auth-сервис или локально
-        (если не получается через auth-сервис).
+        Проверяет токен: сначала по in-process кешу проверенных токенов,
+        затем локально (если включено AUTH_VERIFY_LOCALLY), либо
+        с использованием кеша через auth-сервис или локально (если не
+        получается через auth-сервис).
         """
-        cache_key = f"token:{token}"
+        cache_key = f"token:{token_fingerprint(token)}"
+
+        if payload := self.token_cache.get(cache_key):
+            return payload
+
+        if settings.auth_verify_locally:
+            if payload := await self.verify_token_without_auth(token):
+                self._remember_token(cache_key, payload)
+                return payload
 
         message = f"Проверяем наличие токена в кеше: key={cache_key}"
         logger.info(message)
 
         try:
             if cached := await self.redis_client.get(cache_key, message):
-                logger.info(
-                    "Токен найден в кеше: key=%s value=%s", cache_key, cached
-                )
+                logger.info("Токен найден в кеше: key=%s", cache_key)
                 try:
-                    return json.loads(cached)
+                    payload = json.loads(cached)
+                    self._remember_token(cache_key, payload)
+                    return payload
 
                 except json.JSONDecodeError as e:
                     logger.error(
                         "Ошибка декодирования значения из кеша для токена: %s "
-                        "key=%s value=%s",
-                        e, cache_key, cached
+                        "key=%s",
+                        e, cache_key
                     )
         except CacheServiceError:
             pass
@@ -122,6 +197,7 @@ class AuthService:
             exp = payload.get("exp")
             ttl = int(int(exp) - datetime.now(UTC).timestamp())
             expire = ttl if ttl > 1 else None
+            self._remember_token(cache_key, payload)
 
         if expire:
             asyncio.create_task(self.redis_client.set(
@@ -139,7 +215,9 @@ def get_auth_service(
     Провайдер для получения экземпляра AuthService.
 
     Функция создаёт синглтон экземпляр AuthService, используя Redis,
-    который передаётся через Depends (зависимости FastAPI).
+    который передаётся через Depends (зависимости FastAPI), общий
+    HTTP-клиент auth-сервиса, клиент Redis auth-сервиса и in-process кеш
+    проверенных токенов.
 
     :param redis: Экземпляр клиента Redis, предоставленный через Depends.
     :return: Экземпляр AuthService, который используется для
@@ -148,4 +226,6 @@ def get_auth_service(
     logger.info(
         "Создаётся экземпляр AuthService с использованием Redis."
     )
-    return AuthService(redis)
+    return AuthService(
+        redis, get_auth_http_client(), get_redis_auth(), get_token_cache()
+    )
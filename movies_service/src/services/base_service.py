@@ -1,33 +1,58 @@
 import asyncio
 import logging
-from typing import Any, Type
+import time
+from typing import Any, Awaitable, Callable, Coroutine, Type
 
 import orjson
 from elasticsearch import NotFoundError
 from pydantic import BaseModel, ValidationError
 
+from src.core.config import settings
 from src.core.exceptions import (CacheServiceError, CheckCacheError,
                                  CreateObjectError, CreateObjectsError,
-                                 ElasticParsingError, ElasticServiceError,
+                                 CursorPageError, ElasticParsingError,
+                                 ElasticServiceError, InvalidCursorError,
                                  JsonLoadsError, ModelDumpError,
                                  ModelDumpJsonError)
+from src.utils.cache_codec import decode_entry, encode_entry
+from src.utils.cache_entry import CacheEntry
+from src.utils.cache_generations import get_cache_generations
 from src.utils.cache_service import CacheService
+from src.utils.cursor import (CURSOR_START, CursorPage, decode_cursor,
+                              encode_cursor)
 from src.utils.elastic_service import ElasticService
+from src.utils.local_cache import LocalCache, get_local_cache
+from src.utils.single_flight import get_single_flight
 
 logger = logging.getLogger(__name__)
 
+# Получение записей из источника при промахе кеша (вместо поиска по body)
+Fetch = Callable[[], Awaitable[list[BaseModel] | None]]
+
 
 class BaseService:
     """
     Базовый сервис.
 
     Осуществляет взаимодействие с Redis (для кеширования)
-    и Elasticsearch (для полнотекстового поиска).
+    и Elasticsearch (для полнотекстового поиска). Перед Redis расположен
+    локальный кеш процесса (LocalCache).
     """
 
-    def __init__(self, redis_client: CacheService, es_client: ElasticService):
+    # Ссылки на фоновые задачи (чтобы их не удалил сборщик мусора)
+    _background_tasks: set[asyncio.Task] = set()
+
+    def __init__(
+        self,
+        redis_client: CacheService,
+        es_client: ElasticService,
+        local_cache: LocalCache | None = None,
+    ):
         self.redis_client = redis_client
         self.es_client = es_client
+        self.local_cache = local_cache or get_local_cache()
+        self.single_flight = get_single_flight()
+        self.cache_generations = get_cache_generations()
 
     @staticmethod
     def _model_dump(
@@ -40,7 +65,7 @@ class BaseService:
         """
         try:
             return obj.model_dump(
-                mode='json', exclude=exclude
+                mode='json', exclude=exclude, by_alias=True
             )
 
         except (AttributeError, TypeError, ValueError, KeyError) as e:
@@ -107,6 +132,29 @@ class BaseService:
             )
             raise ElasticParsingError(e)
 
+    @staticmethod
+    def _get_records_from_suggest(
+        data: dict, name: str, log_info: str = ""
+    ) -> list[dict]:
+        """
+        Вспомогательный метод для извлечения списка записей из ответа
+        Elasticsearch на запрос автодополнения (completion suggester).
+        """
+        try:
+            return [
+                option
+                for suggestion in data["suggest"][name]
+                for option in suggestion["options"]
+            ]
+
+        except (KeyError, TypeError) as e:
+            logger.error(
+                "Ошибка некорректного ответа автодополнения от "
+                "Elasticsearch: %s. %s",
+                e, log_info
+            )
+            raise ElasticParsingError(e)
+
     @staticmethod
     def _get_data_from_json(json: bytes | None, log_info: str = "") -> Any:
         """Вспомогательный метод для десериализации JSON в объекты Python."""
@@ -164,10 +212,13 @@ class BaseService:
         return valid_objects
 
     def _create_json_from_objects(
-        self, data: list[BaseModel], log_info: str = ""
+        self, data: list[BaseModel], log_info: str = "", many: bool = True
     ) -> bytes:
         """
         Вспомогательный метод для создания json из списка объектов Pydantic.
+
+        Результат совпадает с телом ответа API: при many=False сериализуется
+        только первый объект (или null, если список пуст).
         """
         valid_data = []
 
@@ -191,6 +242,9 @@ class BaseService:
             raise ModelDumpJsonError(e)
 
         else:
+            if not many:
+                valid_data = valid_data[0] if valid_data else None
+
             try:
                 return orjson.dumps(valid_data)
 
@@ -202,45 +256,131 @@ class BaseService:
                 )
                 raise ModelDumpJsonError(e)
 
-    async def _get_from_cache(
-            self, model: Type[BaseModel], cache_key: str, log_info: str = ""
-    ) -> list[BaseModel] | None:
+    def _get_objects_from_entry(
+            self, model: Type[BaseModel], entry: CacheEntry,
+            log_info: str = "",
+    ) -> list[BaseModel]:
+        """
+        Вспомогательный метод для создания списка объектов модели Pydantic из
+        записи кеша. Построенные объекты запоминаются в записи, поэтому
+        повторные обращения к локальному кешу обходятся без валидации.
+        """
+        if entry.objects is not None:
+            return entry.objects
+
         try:
-            cache_bjson = await self.redis_client.get(cache_key, log_info)
+            cache_data = self._get_data_from_json(entry.payload, log_info)
 
-            if cache_bjson is not None:
-                cache_data = self._get_data_from_json(cache_bjson, log_info)
+            if cache_data is None:
+                cache_data = []
 
-                valid_objects = []
-                for record in cache_data:
-                    model_obj = self._create_object_from_dict(model, record)
-                    valid_objects.append(model_obj)
+            elif isinstance(cache_data, dict):
+                cache_data = [cache_data]
 
-                logger.info("Данные из кеша прошли валидацию. %s", log_info)
+            valid_objects = []
+            for record in cache_data:
+                model_obj = self._create_object_from_dict(model, record)
+                valid_objects.append(model_obj)
 
-                return valid_objects
+        except (JsonLoadsError, CreateObjectError) as e:
+            raise CheckCacheError(e)
 
-        except (
-            CacheServiceError, JsonLoadsError, CreateObjectError,
-            CreateObjectsError
-        ) as e:
+        logger.info("Данные из кеша прошли валидацию. %s", log_info)
+        entry.objects = valid_objects
+
+        return valid_objects
+
+    def _create_entry(
+            self,
+            cache_key: str,
+            data: list[BaseModel],
+            many: bool,
+            delta: float = 0.0,
+            log_info: str = "",
+    ) -> CacheEntry:
+        """
+        Вспомогательный метод для создания записи кеша из списка объектов
+        модели Pydantic.
+
+        Для отсутствующей записи (many=False и пустой список) создаётся
+        запись-надгробие с коротким TTL (cache_negative_ttl).
+        """
+        policy = settings.get_cache_policy(cache_key)
+        payload = self._create_json_from_objects(data, log_info, many)
+        negative = not many and not data
+
+        entry = CacheEntry.create(
+            payload, len(data) if many else min(len(data), 1),
+            settings.cache_negative_ttl if negative else policy.ttl, delta,
+            negative=negative,
+        )
+        entry.objects = data if many else data[:1]
+
+        return entry
+
+    async def _get_from_cache(
+            self, cache_key: str, log_info: str = ""
+    ) -> CacheEntry | None:
+        """Вспомогательный метод для получения записи из кеша (Redis)."""
+        try:
+            cache_raw = await self.redis_client.get(cache_key, log_info)
+
+            if cache_raw is not None:
+                return decode_entry(cache_raw)
+
+        except (CacheServiceError, JsonLoadsError) as e:
             raise CheckCacheError(e)
 
+    @staticmethod
+    def _get_expire(cache_key: str, entry: CacheEntry) -> int:
+        """
+        Жёсткий TTL записи в Redis: по политике семейства ключа, для
+        записей-надгробий — cache_negative_ttl (без stale-периода).
+        """
+        if entry.negative:
+            return settings.cache_negative_ttl
+
+        return settings.get_cache_policy(cache_key).expire
+
     async def _put_to_cache(
-        self, cache_key: str, data: list[BaseModel] | None, log_info: str = ""
+        self, cache_key: str, entry: CacheEntry, log_info: str = ""
     ) -> None:
         """Вспомогательные метод для кеширования записей."""
         try:
-            json_represent = self._create_json_from_objects(
-                data, log_info
-            )
             await self.redis_client.set(
-                cache_key, json_represent, log_info=log_info
+                cache_key, encode_entry(entry),
+                expire=self._get_expire(cache_key, entry),
+                log_info=log_info,
+            )
+            # Сбрасываем устаревшие копии в локальных кешах других воркеров
+            await self.redis_client.publish(
+                settings.cache_invalidation_channel,
+                self.local_cache.make_invalidation_message(cache_key),
+                log_info=log_info,
             )
 
-        except (CacheServiceError, ModelDumpJsonError):
+        except CacheServiceError:
             pass
 
+    def _put_to_local_cache(self, cache_key: str, entry: CacheEntry) -> None:
+        """
+        Вспомогательный метод для сохранения записи в локальный кеш процесса
+        не дольше, чем запись остаётся свежей в Redis.
+        """
+        ttl = min(settings.local_cache_ttl_seconds, int(entry.ttl()))
+
+        if ttl > 0:
+            self.local_cache.set(cache_key, entry, ttl=ttl)
+
+    def _run_in_background(self, coro: Coroutine) -> None:
+        """
+        Вспомогательный метод для запуска фоновой задачи с сохранением ссылки
+        на неё до завершения.
+        """
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
     async def _base_get_no_cache(
             self,
             model: Type[BaseModel],
@@ -256,7 +396,14 @@ class BaseService:
             response = await self.es_client.search(
                 index, body, log_info
             )
-            records_data = self._get_records_from_hits(response, log_info)
+
+            if suggest := body.get("suggest"):
+                records_data = self._get_records_from_suggest(
+                    response, next(iter(suggest)), log_info
+                )
+
+            else:
+                records_data = self._get_records_from_hits(response, log_info)
             records_obj = self._create_objects_from_elastic(
                 model, records_data, log_info
             )
@@ -277,6 +424,253 @@ class BaseService:
             )
             return records_obj
 
+    async def _base_search_after(
+            self,
+            model: Type[BaseModel],
+            index: str,
+            body: dict,
+            cursor: str,
+            log_info: str,
+    ) -> CursorPage:
+        """
+        Вспомогательный базовый метод для курсорной пагинации без кеша.
+
+        Вместо from/size используется search_after в рамках контекста
+        point-in-time (PIT), поэтому глубина выдачи не влияет на стоимость
+        запроса и не ограничена max_result_window. Курсор следующей страницы
+        содержит идентификатор PIT и значения сортировки последней записи;
+        на последней странице контекст закрывается. Контекст, открытый для
+        первой страницы, закрывается и при ошибке (курсор клиенту не выдан).
+
+        При ошибке Elasticsearch выбрасывается CursorPageError.
+        """
+        keep_alive = settings.elastic_pit_keep_alive
+        pit_id, close_pit = None, False
+
+        try:
+            if cursor == CURSOR_START:
+                pit_id = await self.es_client.open_point_in_time(
+                    index, keep_alive, log_info
+                )
+                close_pit = True
+                search_after = None
+
+            else:
+                pit_id, search_after = decode_cursor(cursor)
+
+            # Индекс задаётся контекстом PIT, смещение заменяет search_after
+            body = {key: value for key, value in body.items() if key != "from"}
+            body["pit"] = {"id": pit_id, "keep_alive": keep_alive}
+            # _shard_doc делает порядок однозначным при равных значениях
+            body["sort"] = [
+                *body.get("sort", ["_score"]), {"_shard_doc": "asc"}
+            ]
+
+            if search_after:
+                body["search_after"] = search_after
+
+            response = await self.es_client.search(None, body, log_info)
+            records_data = self._get_records_from_hits(response, log_info)
+            records_obj = self._create_objects_from_elastic(
+                model, records_data, log_info
+            )
+            pit_id = response.get("pit_id", pit_id)
+            # На последней странице контекст больше не нужен
+            close_pit = len(records_data) < body.get("size", 10)
+
+        except (
+            ElasticServiceError, ElasticParsingError, CreateObjectsError
+        ) as e:
+            raise CursorPageError(e)
+
+        except NotFoundError:
+            logger.info("Контекст курсора истёк или не найден. %s", log_info)
+            raise InvalidCursorError("Контекст курсора истёк")
+
+        finally:
+            if close_pit:
+                await self.es_client.close_point_in_time(pit_id, log_info)
+
+        if close_pit:
+            next_cursor = None
+
+        else:
+            next_cursor = encode_cursor(pit_id, records_data[-1]["sort"])
+
+        logger.info(
+            "Из Elasticsearch получено записей в количестве: %d шт. %s",
+            len(records_obj), log_info
+        )
+        return CursorPage(records_obj, next_cursor)
+
+    async def _fetch(
+            self,
+            model: Type[BaseModel],
+            index: str,
+            body: dict,
+            log_info: str,
+            fetch: Fetch | None = None,
+    ) -> list[BaseModel] | None:
+        """Получение записей из источника: fetch либо поиск по body."""
+        if fetch is not None:
+            return await fetch()
+
+        return await self._base_get_no_cache(model, index, body, log_info)
+
+    async def _get_from_elastic_and_cache(
+            self,
+            model: Type[BaseModel],
+            index: str,
+            body: dict,
+            cache_key: str,
+            log_info: str,
+            many: bool = True,
+            refresh: bool = False,
+            fetch: Fetch | None = None,
+    ) -> CacheEntry | None:
+        """
+        Вспомогательный метод для получения записей из Elasticsearch с
+        последующим кешированием. При включённой распределённой блокировке
+        запрос в Elasticsearch выполняет только один воркер, остальные
+        получают результат из кеша.
+
+        При фоновом обновлении (refresh) устаревшей записи блокировка не
+        ожидается: если её держит другой воркер, обновление уже идёт.
+
+        Если передан fetch, записи получаются им, а не поиском по body.
+        """
+        lock = None
+
+        try:
+            if settings.cache_lock_enabled:
+                lock = await self.redis_client.acquire_lock(
+                    cache_key, log_info, blocking=not refresh
+                )
+
+                if refresh and not lock:
+                    return None
+
+                # Пока ожидали блокировку, кеш мог заполнить другой воркер
+                try:
+                    if not refresh and (entry := await self._get_from_cache(
+                        cache_key, log_info
+                    )):
+                        self._put_to_local_cache(cache_key, entry)
+                        return entry
+
+                except CheckCacheError:
+                    pass
+
+            # Проверяем наличие результата в Elasticsearch
+            started = time.monotonic()
+            result = await self._fetch(model, index, body, log_info, fetch)
+            delta = time.monotonic() - started
+
+            if result is None:
+                return None
+
+            try:
+                entry = self._create_entry(
+                    cache_key, result, many, delta, log_info
+                )
+
+            except ModelDumpJsonError:
+                return None
+
+            self._put_to_local_cache(cache_key, entry)
+
+            if lock:
+                # Кеш должен быть заполнен до освобождения блокировки
+                await self._put_to_cache(cache_key, entry, log_info)
+
+            else:
+                # Кешируем асинхронно результат в Redis
+                self._run_in_background(
+                    self._put_to_cache(cache_key, entry, log_info)
+                )
+
+            return entry
+
+        finally:
+            if lock:
+                await self.redis_client.release_lock(lock, log_info)
+
+    def _refresh_in_background(
+            self,
+            model: Type[BaseModel],
+            index: str,
+            body: dict,
+            cache_key: str,
+            log_info: str,
+            many: bool = True,
+            fetch: Fetch | None = None,
+    ) -> None:
+        """
+        Вспомогательный метод для фонового обновления устаревшей записи кеша
+        (stale-while-revalidate).
+        """
+        logger.info("Запущено фоновое обновление кеша. %s", log_info)
+
+        self._run_in_background(self.single_flight.do(
+            cache_key,
+            lambda: self._get_from_elastic_and_cache(
+                model, index, body, cache_key, log_info, many, refresh=True,
+                fetch=fetch,
+            ),
+            log_info,
+        ))
+
+    async def _base_get_entry_with_cache(
+            self,
+            model: Type[BaseModel],
+            index: str,
+            body: dict,
+            cache_key: str,
+            log_info: str,
+            many: bool = True,
+            fetch: Fetch | None = None,
+    ) -> CacheEntry | None:
+        """
+        Вспомогательный базовый метод для получения записи кеша (готового
+        тела ответа API) с использованием кеша.
+
+        Устаревшая запись отдаётся сразу, а её обновление выполняется в фоне
+        (stale-while-revalidate). Свежая запись может быть обновлена заранее
+        с вероятностью, растущей по мере приближения к истечению (XFetch).
+        """
+        # Проверяем наличие результата в локальном кеше процесса
+        if (local := self.local_cache.get(cache_key)) is not None:
+            logger.info("Данные получены из локального кеша. %s", log_info)
+            return local
+
+        # Проверяем наличие результата в кеше (Redis)
+        try:
+            if entry := await self._get_from_cache(cache_key, log_info):
+                policy = settings.get_cache_policy(cache_key)
+
+                if entry.should_refresh(policy.beta):
+                    self._refresh_in_background(
+                        model, index, body, cache_key, log_info, many, fetch
+                    )
+
+                else:
+                    self._put_to_local_cache(cache_key, entry)
+
+                return entry
+
+        except CheckCacheError:
+            pass
+
+        # Одновременные промахи по одному ключу объединяются в один запрос
+        # к Elasticsearch
+        return await self.single_flight.do(
+            cache_key,
+            lambda: self._get_from_elastic_and_cache(
+                model, index, body, cache_key, log_info, many, fetch=fetch
+            ),
+            log_info,
+        )
+
     async def _base_get_with_cache(
             self,
             model: Type[BaseModel],
@@ -284,26 +678,202 @@ class BaseService:
             body: dict,
             cache_key: str,
             log_info: str,
-    ) -> list[BaseModel] | None:
+            many: bool = True,
+            raw: bool = False,
+            fetch: Fetch | None = None,
+    ) -> list[BaseModel] | CacheEntry | None:
         """
         Вспомогательный базовый метод для получения записей с использованием
         кеша.
+
+        При raw=True возвращается запись кеша с готовым телом ответа API (без
+        построения объектов моделей), иначе — список объектов модели. Если
+        передан fetch, при промахе кеша записи получаются им, а не поиском
+        по body.
         """
-        # Проверяем наличие результата в кеше (Redis)
+        entry = await self._base_get_entry_with_cache(
+            model, index, body, cache_key, log_info, many, fetch
+        )
+
+        if raw or entry is None:
+            return entry
+
         try:
-            cache = await self._get_from_cache(
-                model, cache_key, log_info
-            )
-            if cache is not None:
-                return cache
+            return self._get_objects_from_entry(model, entry, log_info)
 
         except CheckCacheError:
+            self.local_cache.invalidate(cache_key)
+
+            return await self._fetch(model, index, body, log_info, fetch)
+
+    async def _put_many_to_cache(
+        self, entries: dict[str, CacheEntry], log_info: str = ""
+    ) -> None:
+        """
+        Вспомогательный метод для кеширования нескольких записей одного
+        семейства ключей за один запрос к Redis.
+        """
+        if not entries:
+            return
+
+        # Записи-надгробия сохраняются с другим TTL, чем найденные записи
+        by_expire: dict[int, dict[str, bytes]] = {}
+
+        for key, entry in entries.items():
+            by_expire.setdefault(self._get_expire(key, entry), {})[key] = (
+                encode_entry(entry)
+            )
+
+        try:
+            for expire, mapping in by_expire.items():
+                await self.redis_client.set_many(
+                    mapping, expire=expire, log_info=log_info
+                )
+
+            await self.redis_client.publish(
+                settings.cache_invalidation_channel,
+                self.local_cache.make_invalidation_message(*entries),
+                log_info=log_info,
+            )
+
+        except CacheServiceError:
             pass
 
-        # Проверяем наличие результата в Elasticsearch
+    async def _get_many_from_elastic_and_cache(
+            self,
+            model: Type[BaseModel],
+            index: str,
+            keys: dict[str, str],
+            log_info: str,
+    ) -> dict[str, CacheEntry]:
+        """
+        Вспомогательный метод для получения записей по списку ID одним
+        запросом в Elasticsearch с последующим кешированием каждой записи
+        под её собственным ключом.
+
+        :param keys: Соответствие ID записи и её ключа в кеше.
+        """
+        ids = list(keys)
+        body = {"query": {"terms": {"id": ids}}, "size": len(ids)}
+
+        started = time.monotonic()
         result = await self._base_get_no_cache(model, index, body, log_info)
+        delta = time.monotonic() - started
 
-        # Кешируем асинхронно фильм в Redis
-        asyncio.create_task(self._put_to_cache(cache_key, result, log_info))
+        if result is None:
+            return {}
 
-        return result
+        found = {str(record_obj.id): record_obj for record_obj in result}
+        entries = {}
+
+        for record_id, cache_key in keys.items():
+            # Отсутствующие в Elasticsearch записи кешируются как null,
+            # так же как при запросе записи по ID
+            record_obj = found.get(record_id)
+
+            try:
+                entry = self._create_entry(
+                    cache_key, [record_obj] if record_obj else [], many=False,
+                    delta=delta, log_info=log_info,
+                )
+
+            except ModelDumpJsonError:
+                continue
+
+            self._put_to_local_cache(cache_key, entry)
+            entries[record_id] = entry
+
+        self._run_in_background(self._put_many_to_cache(
+            {keys[record_id]: entry for record_id, entry in entries.items()},
+            log_info,
+        ))
+
+        return entries
+
+    async def _base_get_many_with_cache(
+            self,
+            model: Type[BaseModel],
+            index: str,
+            ids: list[str],
+            key_prefix: str,
+            log_info: str,
+    ) -> list[CacheEntry]:
+        """
+        Вспомогательный базовый метод для получения записей по списку ID с
+        использованием кеша.
+
+        Записи ищутся в локальном кеше, затем одной командой MGET в Redis
+        (по тем же ключам, что и при запросе записи по ID), а промахи
+        запрашиваются одним запросом в Elasticsearch. Возвращаются только
+        найденные записи в порядке переданных ID.
+        """
+        keys = {
+            record_id: f"{key_prefix}:{record_id}"
+            for record_id in dict.fromkeys(ids)
+        }
+        entries: dict[str, CacheEntry] = {}
+
+        # Проверяем наличие результатов в локальном кеше процесса
+        for record_id, cache_key in keys.items():
+            if (local := self.local_cache.get(cache_key)) is not None:
+                entries[record_id] = local
+
+        # Проверяем наличие результатов в кеше (Redis)
+        if pending := [
+            record_id for record_id in keys if record_id not in entries
+        ]:
+            try:
+                cache_raws = await self.redis_client.mget(
+                    [keys[record_id] for record_id in pending], log_info
+                )
+
+            except CacheServiceError:
+                cache_raws = [None] * len(pending)
+
+            stale = {}
+
+            for record_id, cache_raw in zip(pending, cache_raws):
+                if cache_raw is None:
+                    continue
+
+                try:
+                    entry = decode_entry(cache_raw)
+
+                except JsonLoadsError:
+                    continue
+
+                cache_key = keys[record_id]
+                entries[record_id] = entry
+                policy = settings.get_cache_policy(cache_key)
+
+                if entry.should_refresh(policy.beta):
+                    stale[record_id] = cache_key
+
+                else:
+                    self._put_to_local_cache(cache_key, entry)
+
+            # Устаревшие записи отдаются сразу и обновляются в фоне
+            if stale:
+                logger.info(
+                    "Запущено фоновое обновление кеша для %d записей. %s",
+                    len(stale), log_info
+                )
+                self._run_in_background(self._get_many_from_elastic_and_cache(
+                    model, index, stale, log_info
+                ))
+
+        # Промахи запрашиваются в Elasticsearch одним запросом
+        if misses := {
+            record_id: cache_key
+            for record_id, cache_key in keys.items()
+            if record_id not in entries
+        }:
+            entries.update(await self._get_many_from_elastic_and_cache(
+                model, index, misses, log_info
+            ))
+
+        return [
+            entries[record_id]
+            for record_id in keys
+            if record_id in entries and entries[record_id].count
+        ]
@@ -1,21 +1,30 @@
 import logging
-from functools import lru_cache
-from typing import Annotated
+from functools import lru_cache, partial
+from typing import Annotated, Type
 from uuid import UUID
 
 from fastapi import Depends
 from pydantic import BaseModel
 
+from src.core.config import settings
 from src.db.elastic import get_elastic
 from src.db.redis_client import get_redis_cache
+from src.core.exceptions import CacheServiceError, CheckCacheError
 from src.models.models import Film, FilmBase
 from src.services.base_service import BaseService
+from src.utils.cache_entry import CacheEntry
 from src.utils.cache_service import CacheService
+from src.utils.cursor import CursorPage
+from src.utils.search_query import make_search_cache_key, normalize_query
 from src.utils.elastic_service import ElasticService
 from src.utils.jaeger_worker import JaegerWorker
 
 logger = logging.getLogger(__name__)
 
+# Топ-списки фильмов по жанрам, которые ведёт ETL (sorted set в Redis)
+GENRE_TOP_KEY = "genre_top:{genre_id}:{sort}"
+GENRE_TOP_SORT = "-imdb_rating"
+
 
 class FilmService(BaseService):
     """
@@ -25,8 +34,61 @@ class FilmService(BaseService):
     и Elasticsearch (для полнотекстового поиска).
     """
 
-    async def get_film_by_id(self, film_id: str) -> list[BaseModel] | None:
-        """Получить фильм по его ID."""
+    async def _get_ids_from_genre_top(
+            self, key: str, start: int, stop: int, log_info: str
+    ) -> list[str] | None:
+        """
+        ID фильмов страницы из топ-списка жанра. Возвращает None, если
+        списка нет, он недоступен или не покрывает запрошенную страницу.
+        """
+        try:
+            ids, total = await self.redis_client.get_sorted_range(
+                key, start, stop, log_info
+            )
+
+        except CacheServiceError:
+            return None
+
+        if not ids or (stop >= total and total >= settings.genre_top_size):
+            return None
+
+        logger.info("Страница получена из топ-списка жанра. %s", log_info)
+        return ids
+
+    async def _get_films_from_genre_top(
+            self,
+            model: Type[BaseModel],
+            index: str,
+            body: dict,
+            top_range: tuple[str, int, int],
+            log_info: str,
+    ) -> list[BaseModel] | None:
+        """
+        Страница фильмов жанра из топ-списка: вместо nested-запроса с
+        сортировкой по всему индексу фильмы запрашиваются по ID. Если
+        список не покрывает страницу, выполняется исходный запрос (body).
+
+        Порядок фильмов с равным рейтингом одинаков в топ-списке (ZREVRANGE:
+        по убыванию id) и в Elasticsearch (дополнительная сортировка по id
+        по убыванию), поэтому страницы обоих путей совпадают.
+        """
+        if ids := await self._get_ids_from_genre_top(*top_range, log_info):
+            body = {
+                "query": {"terms": {"id": ids}},
+                "sort": body["sort"],
+                "size": len(ids),
+            }
+
+        return await self._base_get_no_cache(model, index, body, log_info)
+
+    async def get_film_by_id(
+        self, film_id: str, raw: bool = False
+    ) -> list[BaseModel] | CacheEntry | None:
+        """
+        Получить фильм по его ID.
+
+        При raw=True возвращается запись кеша с готовым телом ответа.
+        """
         log_info = f"Получение фильма по ID {film_id}"
 
         logger.info(log_info)
@@ -42,23 +104,67 @@ class FilmService(BaseService):
         body = {"query": {"term": {"id": film_id}}}
 
         return await self._base_get_with_cache(
-            model, es_index, body, cache_key, log_info
+            model, es_index, body, cache_key, log_info, many=False, raw=raw
+        )
+
+    async def get_films_by_ids(
+        self, film_ids: list[str], raw: bool = False
+    ) -> list[BaseModel] | CacheEntry:
+        """
+        Получить фильмы по списку ID. Отсутствующие фильмы пропускаются,
+        порядок соответствует переданным ID.
+
+        При raw=True возвращается запись с готовым телом ответа.
+        """
+        log_info = f"Получение фильмов по списку ID (count={len(film_ids)})"
+
+        logger.info(log_info)
+
+        #  Индекс для Elasticsearch
+        es_index = "film_work"
+        # Модель Pydantic для возврата
+        model = Film
+
+        # Используются те же ключи кеша, что и при получении фильма по ID
+        entries = await self._base_get_many_with_cache(
+            model, es_index, film_ids, "film", log_info
         )
 
+        if raw:
+            return CacheEntry.concat(entries)
+
+        films = []
+        for entry in entries:
+            try:
+                films.extend(
+                    self._get_objects_from_entry(model, entry, log_info)
+                )
+
+            except CheckCacheError:
+                pass
+
+        return films
+
     async def get_films(
             self,
             genre: UUID | None = None,
             sort: str = "-imdb_rating",
             page_size: int = 10,
             page_number: int = 1,
-    ) -> list[BaseModel] | None:
+            raw: bool = False,
+            cursor: str | None = None,
+    ) -> list[BaseModel] | CacheEntry | CursorPage | None:
         """
         Получить список фильмов с поддержкой сортировки по рейтингу,
         фильтрации по жанру и пагинацией.
+
+        При raw=True возвращается запись кеша с готовым телом ответа.
+        При переданном cursor выдача постраничная по курсору (без кеша).
         """
         log_info = (
             f"Запрос на получение фильмов: (sort={sort}, genre={genre}, "
-            f"page_size={page_size}, page_number={page_number})."
+            f"page_size={page_size}, page_number={page_number}, "
+            f"cursor={cursor})."
         )
 
         logger.info(log_info)
@@ -66,7 +172,10 @@ class FilmService(BaseService):
         #  Индекс для Elasticsearch
         es_index = "film_work"
         # Ключ для кеша
-        cache_key = f"films:{genre}:{sort}:{page_size}:{page_number}"
+        cache_key = (
+            f"films:{self.cache_generations.get(es_index)}:{genre}:{sort}:"
+            f"{page_size}:{page_number}"
+        )
         # Модель Pydantic для возврата
         model = FilmBase
 
@@ -93,9 +202,12 @@ class FilmService(BaseService):
         sort_field = sort.lstrip("-")
         sort_order = "desc" if sort.startswith("-") else "asc"
 
-        body["sort"] = [{sort_field: {
-            "order": sort_order, "missing": "_last"
-        }}]
+        # Фильмы с равным значением поля сортировки упорядочиваются по id
+        # (как в топ-списках жанров)
+        body["sort"] = [
+            {sort_field: {"order": sort_order, "missing": "_last"}},
+            {"id": {"order": "desc"}},
+        ]
 
         #  Вычисляем начальную запись для выдачи
         from_value = (page_number - 1) * page_size
@@ -103,8 +215,72 @@ class FilmService(BaseService):
         body["from"] = from_value
         body["size"] = page_size
 
+        if cursor is not None:
+            return await self._base_search_after(
+                model, es_index, body, cursor, log_info
+            )
+
+        # Страницы жанра по рейтингу берутся из топ-списка (при промахе кеша)
+        fetch = None
+
+        if (
+            genre
+            and sort == GENRE_TOP_SORT
+            and from_value + page_size <= settings.genre_top_size
+        ):
+            top_range = (
+                GENRE_TOP_KEY.format(genre_id=genre, sort=sort),
+                from_value,
+                from_value + page_size - 1,
+            )
+            fetch = partial(
+                self._get_films_from_genre_top,
+                model, es_index, body, top_range, log_info,
+            )
+
+        return await self._base_get_with_cache(
+            model, es_index, body, cache_key, log_info, raw=raw, fetch=fetch
+        )
+
+    async def suggest_films(
+        self, query: str, size: int = 10, raw: bool = False
+    ) -> list[BaseModel] | CacheEntry | None:
+        """
+        Автодополнение: фильмы, название которых начинается с query (или
+        одно из слов названия). Результаты кешируются по нормализованному
+        префиксу.
+
+        При raw=True возвращается запись кеша с готовым телом ответа.
+        """
+        query = normalize_query(query) or ""
+        log_info = (
+            f"Запрос автодополнения фильмов: (query={query}, size={size})."
+        )
+
+        logger.info(log_info)
+
+        #  Индекс для Elasticsearch
+        es_index = "film_work"
+        # Ключ для кеша
+        cache_key = (
+            f"film_suggest:{self.cache_generations.get(es_index)}:{size}:"
+            f"{query}"
+        )
+        # Модель Pydantic для возврата
+        model = FilmBase
+
+        # Формируем тело запроса для Elasticsearch (только подсказки)
+        body = {
+            "size": 0,
+            "_source": ["id", "title", "imdb_rating"],
+            "suggest": {"suggest": {
+                "prefix": query,
+                "completion": {"field": "title_suggest", "size": size},
+            }},
+        }
+
         return await self._base_get_with_cache(
-            model, es_index, body, cache_key, log_info
+            model, es_index, body, cache_key, log_info, raw=raw
         )
 
     @JaegerWorker.start_span()
@@ -113,13 +289,21 @@ class FilmService(BaseService):
         query: str | None = None,
         page_size: int = 10,
         page_number: int = 1,
-    ) -> list[BaseModel] | None:
+        cursor: str | None = None,
+        raw: bool = False,
+    ) -> list[BaseModel] | CacheEntry | CursorPage | None:
         """
         Поиск фильмов по ключевым словам и пагинацией.
+
+        Результаты кешируются по нормализованному запросу с коротким TTL.
+        При raw=True возвращается запись кеша с готовым телом ответа.
+        При переданном cursor выдача постраничная по курсору (без кеша).
         """
+        query = normalize_query(query)
         log_info = (
             f"Запрос на получение фильмов: (query={query}, "
-            f"page_size={page_size}, page_number={page_number})."
+            f"page_size={page_size}, page_number={page_number}, "
+            f"cursor={cursor})."
         )
 
         logger.info(log_info)
@@ -149,8 +333,18 @@ class FilmService(BaseService):
         body["from"] = from_value
         body["size"] = page_size
 
-        return await self._base_get_no_cache(
-            model, es_index, body, log_info
+        if cursor is not None:
+            return await self._base_search_after(
+                model, es_index, body, cursor, log_info
+            )
+
+        # Ключ для кеша
+        cache_key = make_search_cache_key(
+            f"film_search:{self.cache_generations.get(es_index)}", body
+        )
+
+        return await self._base_get_with_cache(
+            model, es_index, body, cache_key, log_info, raw=raw
         )
 
 
@@ -9,6 +9,7 @@ from src.db.elastic import get_elastic, settings
 from src.db.redis_client import get_redis_cache
 from src.models.models import GenreBase
 from src.services.base_service import BaseService
+from src.utils.cache_entry import CacheEntry
 from src.utils.cache_service import CacheService
 from src.utils.elastic_service import ElasticService
 
@@ -23,8 +24,14 @@ class GenreService(BaseService):
     и Elasticsearch (для полнотекстового поиска).
     """
 
-    async def get_genre_by_id(self, genre_id: str) -> BaseModel | None:
-        """Получить фильм по его ID."""
+    async def get_genre_by_id(
+        self, genre_id: str, raw: bool = False
+    ) -> list[BaseModel] | CacheEntry | None:
+        """
+        Получить жанр по его ID.
+
+        При raw=True возвращается запись кеша с готовым телом ответа.
+        """
         log_info = f"Получение жанра по ID {genre_id}"
 
         logger.info(log_info)
@@ -40,11 +47,17 @@ class GenreService(BaseService):
         body = {"query": {"term": {"id": genre_id}}}
 
         return await self._base_get_with_cache(
-            model, es_index, body, cache_key, log_info
+            model, es_index, body, cache_key, log_info, many=False, raw=raw
         )
 
-    async def get_genres(self) -> list[BaseModel] | None:
-        """Получить список жанров."""
+    async def get_genres(
+        self, raw: bool = False
+    ) -> list[BaseModel] | CacheEntry | None:
+        """
+        Получить список жанров.
+
+        При raw=True возвращается запись кеша с готовым телом ответа.
+        """
         log_info = "Запрос на получение списка жанров."
 
         logger.info(log_info)
@@ -52,7 +65,7 @@ class GenreService(BaseService):
         # Индекс для Elasticsearch
         es_index = "genre"
         # Ключ для кеша
-        cache_key = "genres"
+        cache_key = f"genres:{self.cache_generations.get(es_index)}"
         # Модель Pydantic для возврата
         model = GenreBase
 
@@ -62,7 +75,7 @@ class GenreService(BaseService):
         }
 
         return await self._base_get_with_cache(
-            model, es_index, body, cache_key, log_info
+            model, es_index, body, cache_key, log_info, raw=raw
         )
 
     async def search_genres(
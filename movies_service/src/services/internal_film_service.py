@@ -10,6 +10,7 @@ from src.db.redis_client import get_redis_cache
 from src.models.models import Film, FilmBase
 from src.services.base_service import BaseService
 from src.utils.cache_service import CacheService
+from src.utils.cursor import CursorPage
 from src.utils.elastic_service import ElasticService
 
 logger = logging.getLogger(__name__)
@@ -22,17 +23,27 @@ class FilmService(BaseService):
         search_params,
         page_size: int = 10,
         page_number: int = 1,
-    ) -> list[BaseModel] | None:
+        cursor: str | None = None,
+    ) -> list[BaseModel] | CursorPage | None:
         """
         Поиск фильмов по ключевым словам и пагинацией.
+
+        При переданном cursor выдача постраничная по курсору (search_after
+        в рамках point-in-time), что подходит для полного обхода каталога.
         """
         log_info = (
-            f"Запрос на получение фильмов: params={search_params}, page_size={page_size}, page_number={page_number}"
+            f"Запрос на получение фильмов: params={search_params}, "
+            f"page_size={page_size}, page_number={page_number}, "
+            f"cursor={cursor}"
         )
 
         es_index = "film_work"
         model = FilmBase
-        body = {"query": {}, "from": (page_number - 1) * page_size, "size": page_size}
+        body = {
+            "query": {},
+            "from": (page_number - 1) * page_size,
+            "size": page_size,
+        }
 
         if query := search_params.query:
             body["query"] = query
@@ -43,6 +54,11 @@ class FilmService(BaseService):
         if sort := search_params.sort:
             body["sort"] = sort
 
+        if cursor is not None:
+            return await self._base_search_after(
+                model, es_index, body, cursor, log_info
+            )
+
         return await self._base_get_no_cache(model, es_index, body, log_info)
 
 
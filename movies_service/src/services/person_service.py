@@ -6,12 +6,14 @@ from uuid import UUID
 from fastapi import Depends
 from pydantic import BaseModel
 
-from src.core.config import settings
 from src.db.elastic import get_elastic
 from src.db.redis_client import get_redis_cache
-from src.models.models import FilmBase, Person
+from src.models.models import FilmBase, Person, PersonBase
 from src.services.base_service import BaseService
+from src.utils.cache_entry import CacheEntry
 from src.utils.cache_service import CacheService
+from src.utils.cursor import CursorPage
+from src.utils.search_query import make_search_cache_key, normalize_query
 from src.utils.elastic_service import ElasticService
 
 logger = logging.getLogger(__name__)
@@ -25,8 +27,14 @@ class PersonService(BaseService):
     и Elasticsearch (для полнотекстового поиска).
     """
 
-    async def get_person_by_id(self, person_id: str) -> BaseModel | None:
-        """Получить фильм по его ID."""
+    async def get_person_by_id(
+        self, person_id: str, raw: bool = False
+    ) -> list[BaseModel] | CacheEntry | None:
+        """
+        Получить персону по её ID.
+
+        При raw=True возвращается запись кеша с готовым телом ответа.
+        """
         log_info = f"Получение персоны по ID {person_id}"
 
         logger.info(log_info)
@@ -42,15 +50,22 @@ class PersonService(BaseService):
         body = {"query": {"term": {"id": person_id}}}
 
         return await self._base_get_with_cache(
-            model, es_index, body, cache_key, log_info
+            model, es_index, body, cache_key, log_info, many=False, raw=raw
         )
 
     async def get_person_films(
             self,
             person_id: UUID,
-    ) -> list[BaseModel] | None:
+            raw: bool = False,
+    ) -> list[BaseModel] | CacheEntry | None:
         """
         Получить список фильмов в производстве которых участвовала персона.
+
+        ID фильмов берутся из фильмографии персоны (поле films индекса
+        person, заполняется ETL), после чего фильмы запрашиваются одним
+        terms-запросом к индексу film_work. Результат кешируется по персоне.
+
+        При raw=True возвращается запись кеша с готовым телом ответа.
         """
         log_info = (
             f"Запрос на получение фильмов с участием персоны: "
@@ -59,52 +74,78 @@ class PersonService(BaseService):
 
         logger.info(log_info)
 
+        person = await self.get_person_by_id(str(person_id))
+
+        if not person:
+            return person
+
+        film_ids = [film.id for film in person[0].films]
+
+        if not film_ids:
+            logger.info("У персоны нет фильмов. %s", log_info)
+            return []
+
         #  Индекс для Elasticsearch
-        es_index = "person"
+        es_index = "film_work"
         # Ключ для кеша
-        cache_key = f"person_films:{person_id}"
+        cache_key = (
+            f"person_films:{self.cache_generations.get(es_index)}:"
+            f"{person_id}"
+        )
         # Модель Pydantic для возврата
         model = FilmBase
 
         # Формируем тело запроса для Elasticsearch
-        body = {"query": {"bool": {
-            "should": [
-                {
-                    "nested": {
-                        "path": "actors",
-                        "query": {
-                            "term": {
-                                "actors.id": person_id,
-                            }
-                        }
-                    }
-                },
-                {
-                    "nested": {
-                        "path": "writers",
-                        "query": {
-                            "term": {
-                                "writers.id": person_id,
-                            }
-                        }
-                    }
-                },
-                {
-                    "nested": {
-                        "path": "directors",
-                        "query": {
-                            "term": {
-                                "directors.id": person_id,
-                            }
-                        }
-                    }
-                },
-            ],
-            "minimum_should_match": 1,
-        }}, "size": settings.elastic_response_size}
+        body = {
+            "query": {"terms": {"id": film_ids}},
+            "_source": ["id", "title", "imdb_rating"],
+            "sort": [{"imdb_rating": {"order": "desc", "missing": "_last"}}],
+            "size": len(film_ids),
+        }
+
+        return await self._base_get_with_cache(
+            model, es_index, body, cache_key, log_info, raw=raw
+        )
+
+    async def suggest_persons(
+        self, query: str, size: int = 10, raw: bool = False
+    ) -> list[BaseModel] | CacheEntry | None:
+        """
+        Автодополнение: персоны, имя которых начинается с query (или одно
+        из слов имени). Результаты кешируются по нормализованному
+        префиксу.
+
+        При raw=True возвращается запись кеша с готовым телом ответа.
+        """
+        query = normalize_query(query) or ""
+        log_info = (
+            f"Запрос автодополнения персон: (query={query}, size={size})."
+        )
+
+        logger.info(log_info)
+
+        #  Индекс для Elasticsearch
+        es_index = "person"
+        # Ключ для кеша
+        cache_key = (
+            f"person_suggest:{self.cache_generations.get(es_index)}:{size}:"
+            f"{query}"
+        )
+        # Модель Pydantic для возврата
+        model = PersonBase
+
+        # Формируем тело запроса для Elasticsearch (только подсказки)
+        body = {
+            "size": 0,
+            "_source": ["id", "full_name"],
+            "suggest": {"suggest": {
+                "prefix": query,
+                "completion": {"field": "full_name_suggest", "size": size},
+            }},
+        }
 
         return await self._base_get_with_cache(
-            model, es_index, body, cache_key, log_info
+            model, es_index, body, cache_key, log_info, raw=raw
         )
 
     async def search_persons(
@@ -112,13 +153,21 @@ class PersonService(BaseService):
         query: str | None = None,
         page_size: int = 10,
         page_number: int = 1,
-    ) -> list[BaseModel] | None:
+        cursor: str | None = None,
+        raw: bool = False,
+    ) -> list[BaseModel] | CacheEntry | CursorPage | None:
         """
         Поиск персон по ключевым словам и пагинацией.
+
+        Результаты кешируются по нормализованному запросу с коротким TTL.
+        При raw=True возвращается запись кеша с готовым телом ответа.
+        При переданном cursor выдача постраничная по курсору (без кеша).
         """
+        query = normalize_query(query)
         log_info = (
             f"Запрос на получение персон: (query={query}, "
-            f"page_size={page_size}, page_number={page_number})."
+            f"page_size={page_size}, page_number={page_number}, "
+            f"cursor={cursor})."
         )
 
         logger.info(log_info)
@@ -148,8 +197,18 @@ class PersonService(BaseService):
         body["from"] = from_value
         body["size"] = page_size
 
-        return await self._base_get_no_cache(
-            model, es_index, body, log_info
+        if cursor is not None:
+            return await self._base_search_after(
+                model, es_index, body, cursor, log_info
+            )
+
+        # Ключ для кеша
+        cache_key = make_search_cache_key(
+            f"person_search:{self.cache_generations.get(es_index)}", body
+        )
+
+        return await self._base_get_with_cache(
+            model, es_index, body, cache_key, log_info, raw=raw
         )
 
 
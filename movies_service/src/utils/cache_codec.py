@@ -0,0 +1,174 @@
+import logging
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Any
+
+import orjson
+
+from src.core.config import settings
+from src.core.exceptions import JsonLoadsError
+from src.utils.cache_entry import CacheEntry
+from src.utils.compression import compress_payload
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+# Первый байт записей старого формата (JSON-заголовок без байта версии)
+LEGACY_JSON_PREFIX = b"{"
+
+
+class CacheCodec(ABC):
+    """
+    Кодек записи кеша (CacheEntry) для хранения в Redis.
+
+    Закодированная запись начинается с байта версии кодека, поэтому записи
+    разных форматов могут находиться в Redis одновременно: формат можно
+    сменить без очистки кеша.
+    """
+
+    name: str
+    version: int
+
+    @abstractmethod
+    def encode(self, entry: CacheEntry) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> CacheEntry:
+        pass
+
+
+class JsonCodec(CacheCodec):
+    """JSON-заголовок и тело ответа API как есть (см. CacheEntry.dumps)."""
+
+    name = "json"
+    version = 1
+
+    def encode(self, entry: CacheEntry) -> bytes:
+        return entry.dumps()
+
+    def decode(self, data: bytes) -> CacheEntry:
+        return CacheEntry.loads(data)
+
+
+class MsgpackCodec(CacheCodec):
+    """
+    MessagePack с колоночным представлением списков: тело ответа со
+    списком объектов с одинаковыми полями хранится как имена полей и
+    строки значений, без повторения имён полей в каждом объекте.
+
+    Тело ответа API восстанавливается через orjson побайтно (исходное тело
+    также сериализовано orjson), поэтому ETag записи остаётся верным.
+    Сжатый вариант тела не хранится (сжатые байты MessagePack не
+    уменьшает) и создаётся заново при декодировании.
+    """
+
+    name = "msgpack"
+    version = 2
+
+    @staticmethod
+    def _to_columns(data: Any) -> dict[str, list] | None:
+        if (
+            not isinstance(data, list)
+            or not data
+            or not all(isinstance(item, dict) for item in data)
+        ):
+            return None
+
+        columns = list(data[0])
+
+        if any(list(item) != columns for item in data):
+            return None
+
+        return {
+            "columns": columns,
+            "rows": [list(item.values()) for item in data],
+        }
+
+    def encode(self, entry: CacheEntry) -> bytes:
+        data = orjson.loads(entry.payload)
+
+        if (columnar := self._to_columns(data)) is not None:
+            body = {"columnar": columnar}
+
+        else:
+            body = {"data": data}
+
+        return msgpack.packb({**entry.meta(), **body}, use_bin_type=True)
+
+    def decode(self, data: bytes) -> CacheEntry:
+        try:
+            raw = msgpack.unpackb(data, raw=False)
+
+            if "columnar" in raw:
+                columns = raw["columnar"]["columns"]
+                value = [
+                    dict(zip(columns, row))
+                    for row in raw["columnar"]["rows"]
+                ]
+
+            else:
+                value = raw["data"]
+
+            payload = orjson.dumps(value)
+            negative = raw.get("negative", False)
+
+            return CacheEntry(
+                payload=payload,
+                count=raw["count"],
+                etag=raw["etag"],
+                soft_expire_at=raw["soft_expire_at"],
+                delta=raw["delta"],
+                negative=negative,
+                encodings={} if negative else compress_payload(payload),
+            )
+
+        except (ValueError, KeyError, TypeError) as e:
+            raise JsonLoadsError(e)
+
+
+CODECS: dict[int, CacheCodec] = {JsonCodec.version: JsonCodec()}
+
+if msgpack is not None:
+    CODECS[MsgpackCodec.version] = MsgpackCodec()
+
+
+@lru_cache()
+def get_cache_codec() -> CacheCodec:
+    """
+    Кодек для записи в кеш (cache_codec из настроек). Если он недоступен
+    (не установлена библиотека), используется JSON.
+    """
+    for codec in CODECS.values():
+        if codec.name == settings.cache_codec:
+            return codec
+
+    logger.warning(
+        "Кодек кеша %s недоступен, используется json.", settings.cache_codec
+    )
+    return CODECS[JsonCodec.version]
+
+
+def encode_entry(entry: CacheEntry) -> bytes:
+    """Кодирование записи кеша текущим кодеком с байтом версии."""
+    codec = get_cache_codec()
+
+    return bytes((codec.version,)) + codec.encode(entry)
+
+
+def decode_entry(raw: bytes) -> CacheEntry:
+    """
+    Декодирование записи кеша кодеком, указанным в байте версии. Записи
+    неизвестной версии считаются отсутствующими в кеше.
+    """
+    if raw.startswith(LEGACY_JSON_PREFIX):
+        return CODECS[JsonCodec.version].decode(raw)
+
+    if not raw or (codec := CODECS.get(raw[0])) is None:
+        raise JsonLoadsError("Неизвестная версия формата записи кеша")
+
+    return codec.decode(raw[1:])
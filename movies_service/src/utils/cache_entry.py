@@ -0,0 +1,171 @@
+import hashlib
+import math
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+import orjson
+
+from src.core.exceptions import JsonLoadsError
+from src.utils.compression import compress_payload
+
+# Разделитель заголовка и полезной нагрузки записи кеша
+HEADER_SEPARATOR = b"\n"
+
+
+def make_etag(payload: bytes) -> str:
+    """Сильный ETag: хеш содержимого тела ответа."""
+    return '"{}"'.format(hashlib.blake2b(payload, digest_size=16).hexdigest())
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """
+    Запись кеша (конверт): полезная нагрузка и метаданные для
+    stale-while-revalidate.
+
+    - payload: готовое тело ответа API (JSON с применёнными псевдонимами),
+    которое может быть отдано клиенту без построения моделей.
+    - count: количество записей в payload.
+    - etag: сильный ETag тела ответа (хеш payload), для условных запросов.
+    - soft_expire_at: момент (unix time), после которого запись считается
+    устаревшей, но ещё может отдаваться, пока идёт обновление в фоне.
+    - delta: время (в секундах), затраченное на получение данных из источника;
+    используется для вероятностного раннего обновления (XFetch).
+    - negative: запись-надгробие (tombstone) об отсутствии записи в
+    источнике; хранится с коротким TTL, чтобы запросы несуществующих ID
+    не доходили до Elasticsearch.
+    - encodings: предварительно сжатый вариант payload (кодировка ->
+    сжатое тело, см. compress_payload), отдаётся клиенту по
+    Accept-Encoding без сжатия на каждый запрос.
+
+    В Redis хранится как JSON-заголовок и полезная нагрузка, разделённые
+    переводом строки; сжатые варианты следуют сразу за payload, их размеры
+    указаны в заголовке.
+    """
+
+    payload: bytes
+    count: int
+    etag: str = ""
+    soft_expire_at: float = 0.0
+    delta: float = 0.0
+    negative: bool = False
+    encodings: dict[str, bytes] = field(default_factory=dict, repr=False)
+
+    # Объекты моделей, построенные из payload (не сохраняются в Redis)
+    objects: Any = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def create(
+        cls,
+        payload: bytes,
+        count: int,
+        ttl: int,
+        delta: float = 0.0,
+        negative: bool = False,
+    ) -> "CacheEntry":
+        return cls(
+            payload=payload,
+            count=count,
+            etag=make_etag(payload),
+            soft_expire_at=time.time() + ttl,
+            delta=delta,
+            negative=negative,
+            encodings={} if negative else compress_payload(payload),
+        )
+
+    @classmethod
+    def concat(cls, entries: list["CacheEntry"]) -> "CacheEntry":
+        """
+        Запись с JSON-массивом из тел ответов отдельных записей (без повторной
+        сериализации). Не предназначена для сохранения в кеш.
+        """
+        payload = b"[" + b",".join(entry.payload for entry in entries) + b"]"
+
+        return cls(
+            payload=payload, count=len(entries), etag=make_etag(payload)
+        )
+
+    def meta(self) -> dict[str, Any]:
+        """Метаданные записи (без полезной нагрузки)."""
+        return {
+            "count": self.count,
+            "etag": self.etag,
+            "soft_expire_at": self.soft_expire_at,
+            "delta": self.delta,
+            "negative": self.negative,
+        }
+
+    def dumps(self) -> bytes:
+        header = orjson.dumps({
+            **self.meta(),
+            "size": len(self.payload),
+            "encodings": {
+                encoding: len(variant)
+                for encoding, variant in self.encodings.items()
+            },
+        })
+        return b"".join((
+            header, HEADER_SEPARATOR, self.payload, *self.encodings.values()
+        ))
+
+    @classmethod
+    def loads(cls, raw: bytes) -> "CacheEntry":
+        header, _, body = raw.partition(HEADER_SEPARATOR)
+
+        try:
+            meta = orjson.loads(header)
+
+        except orjson.JSONDecodeError as e:
+            raise JsonLoadsError(e)
+
+        # Значения старого формата считаются отсутствующими в кеше
+        if not isinstance(meta, dict) or "count" not in meta:
+            raise JsonLoadsError("Устаревший формат записи кеша")
+
+        size = meta.get("size", len(body))
+        payload = body[:size]
+        encodings = {}
+
+        for encoding, length in meta.get("encodings", {}).items():
+            encodings[encoding] = body[size:size + length]
+            size += length
+
+        if size != len(body):
+            raise JsonLoadsError("Повреждённая запись кеша")
+
+        return cls(
+            payload=payload,
+            count=meta["count"],
+            etag=meta.get("etag") or make_etag(payload),
+            soft_expire_at=meta.get("soft_expire_at", 0.0),
+            delta=meta.get("delta", 0.0),
+            negative=meta.get("negative", False),
+            encodings=encodings,
+        )
+
+    def ttl(self, now: float | None = None) -> float:
+        """Оставшееся время до мягкого истечения записи."""
+        return self.soft_expire_at - (time.time() if now is None else now)
+
+    def is_stale(self, now: float | None = None) -> bool:
+        return self.ttl(now) <= 0
+
+    def should_refresh(self, beta: float, now: float | None = None) -> bool:
+        """
+        Нужно ли обновить запись: она устарела, либо сработало вероятностное
+        раннее обновление (XFetch): now - delta * beta * ln(rand) >= expiry.
+        """
+        now = time.time() if now is None else now
+
+        if self.is_stale(now):
+            return True
+
+        if beta <= 0 or self.delta <= 0:
+            return False
+
+        # 1 - random() лежит в (0, 1], поэтому логарифм определён
+        return now - self.delta * beta * math.log(
+            1.0 - random.random()  # nosec B311
+        ) >= self.soft_expire_at
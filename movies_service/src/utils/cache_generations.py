@@ -0,0 +1,159 @@
+import asyncio
+import logging
+from functools import lru_cache
+
+import orjson
+from redis.asyncio import Redis
+
+from src.core.config import settings
+from src.utils.local_cache import LocalCache
+
+logger = logging.getLogger(__name__)
+
+# Ключ номера поколения списков индекса (увеличивает ETL)
+GENERATION_KEY = "cache_generation:{index}"
+# Индексы Elasticsearch, изменения которых публикует ETL
+INDICES = ("film_work", "person", "genre")
+
+
+class CacheGenerations:
+    """
+    Номера поколений ключей кеша списков по индексам Elasticsearch.
+
+    Номер поколения индекса входит в ключи кеша списков (films, film_search,
+    genres, ...), поэтому после загрузки ETL изменений индекса все такие
+    ключи сменяются разом, без перебора и удаления старых записей (они
+    истекают по TTL). Записи по ID удаляются из кеша точечно.
+
+    ETL удаляет записи изменённых ID из Redis, увеличивает номер поколения
+    и публикует изменённые ID в поток Redis (stream); каждый воркер читает
+    поток, удаляет эти записи из своего локального кеша и обновляет свою
+    копию номеров поколений.
+    """
+
+    def __init__(self):
+        self._generations: dict[str, int] = {}
+
+    def get(self, index: str) -> int:
+        return self._generations.get(index, 0)
+
+    def set(self, index: str, generation: int) -> None:
+        # Номер поколения не уменьшается (сообщения могут прийти повторно)
+        if generation > self.get(index):
+            self._generations[index] = generation
+
+    def get_changed_keys(self, index: str, ids: list[str]) -> list[str]:
+        """Ключи кеша записей по ID, затронутых изменением записей индекса."""
+        if index == "film_work":
+            return [f"film:{id_}" for id_ in ids]
+
+        if index == "person":
+            # Фильмы персоны кешируются в поколении индекса film_work
+            generation = self.get("film_work")
+
+            return [
+                key
+                for id_ in ids
+                for key in (
+                    f"person:{id_}", f"person_films:{generation}:{id_}"
+                )
+            ]
+
+        if index == "genre":
+            return [f"genre:{id_}" for id_ in ids]
+
+        return []
+
+    async def load(self, redis_client: Redis) -> None:
+        """Загрузка текущих номеров поколений из Redis."""
+        values = await redis_client.mget(
+            [GENERATION_KEY.format(index=index) for index in INDICES]
+        )
+
+        for index, value in zip(INDICES, values):
+            if value is not None:
+                self.set(index, int(value))
+
+    def _apply_change(
+        self, local_cache: LocalCache, fields: dict[bytes, bytes]
+    ) -> None:
+        """
+        Обработка сообщения ETL об изменении записей индекса. Из Redis эти
+        записи уже удалены ETL, воркер удаляет только их локальные копии.
+        """
+        index = fields[b"index"].decode()
+        ids = orjson.loads(fields[b"ids"])
+
+        # Ключи записей по ID вычисляются до смены поколения
+        if keys := self.get_changed_keys(index, ids):
+            local_cache.invalidate(*keys)
+
+        self.set(index, int(fields[b"generation"]))
+
+        logger.info(
+            "Изменения индекса %s: удалено ключей локального кеша %d, "
+            "поколение %d", index, len(keys), self.get(index)
+        )
+
+    @staticmethod
+    async def _get_stream_last_id(redis_client: Redis, stream: str) -> str:
+        """ID последнего сообщения потока ("0-0", если поток пуст)."""
+        messages = await redis_client.xrevrange(stream, count=1)
+
+        return messages[0][0] if messages else "0-0"
+
+    async def listen_changes(
+        self, redis_client: Redis, local_cache: LocalCache, stream: str
+    ) -> None:
+        """
+        Фоновая задача: чтение потока изменений ETL. Номера поколений
+        загружаются при запуске и после потери соединения; чтение
+        продолжается с последнего обработанного сообщения.
+
+        При запуске ID последнего сообщения потока запоминается до загрузки
+        номеров поколений: сообщения, добавленные между ними, будут
+        прочитаны (повторное применение сообщения безопасно). Записи кеша
+        по ID в Redis удаляет сам ETL, а локальный кеш воркера при запуске
+        пуст, поэтому сообщения, пропущенные до запуска, не нужны.
+        """
+        last_id = None
+
+        while True:
+            try:
+                if last_id is None:
+                    last_id = await self._get_stream_last_id(
+                        redis_client, stream
+                    )
+
+                await self.load(redis_client)
+
+                while True:
+                    response = await redis_client.xread(
+                        {stream: last_id}, block=5000, count=100
+                    )
+
+                    for _, messages in response:
+                        for message_id, fields in messages:
+                            last_id = message_id
+
+                            try:
+                                self._apply_change(local_cache, fields)
+
+                            except (KeyError, ValueError) as e:
+                                logger.warning(
+                                    "Некорректное сообщение потока изменений "
+                                    "%s: %s", message_id, e
+                                )
+
+            except asyncio.CancelledError:
+                raise
+
+            except settings.redis_exceptions as e:
+                logger.error("Ошибка чтения потока изменений ETL: %s", e)
+                await asyncio.sleep(1)
+
+
+@lru_cache()
+def get_cache_generations() -> CacheGenerations:
+    """Провайдер для получения синглтон экземпляра CacheGenerations."""
+    return CacheGenerations()
@@ -1,6 +1,7 @@
 import logging
 
 from redis.asyncio import Redis
+from redis.asyncio.lock import Lock
 
 from src.core.config import settings
 from src.core.exceptions import CacheServiceError
@@ -73,6 +74,158 @@ class CacheService:
                 key, expire, log_info
             )
 
+    @with_retry()
+    async def mget(
+            self, keys: list[str], log_info: str = ""
+    ) -> list[bytes | None]:
+        """Получить значения нескольких ключей одной командой MGET."""
+        logger.debug(
+            "Попытка получить значения из кеша: keys=%s. %s", keys, log_info
+        )
+        try:
+            values = await self.redis_client.mget(keys)
+
+        except settings.redis_exceptions as e:
+            logger.error(
+                "Ошибка при получении значений из кеша: keys=%s, error=%s. %s",
+                keys, e, log_info
+            )
+            raise CacheServiceError(e)
+
+        else:
+            logger.info(
+                "Найдено ключей в кеше: %d из %d. %s",
+                sum(value is not None for value in values), len(keys),
+                log_info
+            )
+            return values
+
+    @with_retry()
+    async def set_many(
+            self,
+            mapping: dict[str, bytes],
+            expire: int = settings.cache_expire_in_seconds,
+            log_info: str = "",
+    ) -> None:
+        """
+        Сохранить значения нескольких ключей за один запрос к Redis
+        (pipeline без транзакции).
+        """
+        logger.debug(
+            "Попытка сохранить значения в кеш: keys=%s, expire=%d. %s",
+            list(mapping), expire, log_info
+        )
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, value in mapping.items():
+                    pipe.set(key, value, ex=expire)
+
+                await pipe.execute()
+
+        except settings.redis_exceptions as e:
+            logger.error(
+                "Ошибка при сохранении значений в кеш:"
+                " keys=%s, expire=%s, error=%s. %s",
+                list(mapping), expire, e, log_info
+            )
+            raise CacheServiceError(e)
+
+        else:
+            logger.info(
+                "Значения успешно сохранены в кеше: count=%d, expire=%d. %s",
+                len(mapping), expire, log_info
+            )
+
+    @with_retry()
+    async def get_sorted_range(
+            self, key: str, start: int, stop: int, log_info: str = ""
+    ) -> tuple[list[str], int]:
+        """
+        Получить участников sorted set с позиции start по stop включительно
+        (по убыванию score) и общее количество участников.
+        """
+        logger.debug(
+            "Попытка получить диапазон sorted set: key=%s, start=%d, "
+            "stop=%d. %s",
+            key, start, stop, log_info
+        )
+        try:
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                pipe.zrevrange(key, start, stop)
+                pipe.zcard(key)
+                members, total = await pipe.execute()
+
+        except settings.redis_exceptions as e:
+            logger.error(
+                "Ошибка при получении диапазона sorted set: key=%s, "
+                "error=%s. %s",
+                key, e, log_info
+            )
+            raise CacheServiceError(e)
+
+        return [member.decode() for member in members], total
+
+    async def acquire_lock(
+            self, key: str, log_info: str = "", blocking: bool = True
+    ) -> Lock | None:
+        """
+        Распределённая блокировка на ключ кеша (между воркерами и подами).
+
+        Возвращает захваченную блокировку или None, если её не удалось
+        получить за cache_lock_blocking_timeout (или сразу, если
+        blocking=False).
+        """
+        lock = self.redis_client.lock(
+            f"lock:{key}",
+            timeout=settings.cache_lock_timeout,
+            blocking_timeout=settings.cache_lock_blocking_timeout,
+        )
+        try:
+            if await lock.acquire(blocking=blocking):
+                logger.debug("Блокировка захвачена: key=%s. %s", key, log_info)
+                return lock
+
+        except settings.redis_exceptions as e:
+            logger.error(
+                "Ошибка при захвате блокировки: key=%s, error=%s. %s",
+                key, e, log_info
+            )
+            return None
+
+        logger.info(
+            "Не удалось дождаться блокировки: key=%s. %s", key, log_info
+        )
+        return None
+
+    @staticmethod
+    async def release_lock(lock: Lock, log_info: str = "") -> None:
+        try:
+            await lock.release()
+
+        except settings.redis_exceptions as e:
+            logger.warning(
+                "Ошибка при освобождении блокировки: key=%s, error=%s. %s",
+                lock.name, e, log_info
+            )
+
+    @with_retry()
+    async def publish(
+            self, channel: str, message: bytes, log_info: str = ""
+    ) -> None:
+        logger.debug(
+            "Попытка опубликовать сообщение: channel=%s, message=%s. %s",
+            channel, message, log_info
+        )
+        try:
+            await self.redis_client.publish(channel, message)
+
+        except settings.redis_exceptions as e:
+            logger.error(
+                "Ошибка при публикации сообщения: channel=%s, error=%s. %s",
+                channel, e, log_info
+            )
+            raise CacheServiceError(e)
+
     async def close(self) -> None:
         logger.info("Закрытие соединения с Redis по работе с кешом...")
 
@@ -0,0 +1,67 @@
+from fastapi import Request, Response, status
+
+from src.utils.cache_entry import CacheEntry
+from src.utils.compression import choose_encoding
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Проверка заголовка If-None-Match (слабое сравнение по RFC 9110): значение
+    '*' или список ETag через запятую.
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+class CachedJSONResponse(Response):
+    """
+    Ответ API из записи кеша: тело отдаётся как есть, без построения моделей
+    Pydantic, валидации по response_model и повторной сериализации.
+
+    Ответ содержит ETag записи; если переданный клиентом If-None-Match
+    совпадает с ним, возвращается 304 Not Modified без тела.
+
+    Если у записи есть предварительно сжатый вариант и Accept-Encoding
+    клиента его допускает, отдаётся он (с заголовком Content-Encoding и
+    своим ETag, так как это другое представление ресурса).
+    """
+    media_type = "application/json"
+
+    def __init__(
+        self, entry: CacheEntry, request: Request | None = None, **kwargs
+    ) -> None:
+        headers = kwargs.pop("headers", {})
+        content, etag = entry.payload, entry.etag
+
+        if entry.encodings:
+            headers = {"Vary": "Accept-Encoding", **headers}
+
+            if request is not None and (encoding := choose_encoding(
+                request.headers.get("accept-encoding"), entry.encodings
+            )):
+                content = entry.encodings[encoding]
+                etag = f'{entry.etag[:-1]}-{encoding}"'
+                headers = {"Content-Encoding": encoding, **headers}
+
+        headers = {"ETag": etag, **headers}
+
+        if request is not None and etag_matches(
+            request.headers.get("if-none-match"), etag
+        ):
+            self.media_type = None
+            super().__init__(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers=headers,
+                **kwargs,
+            )
+
+        else:
+            super().__init__(content=content, headers=headers, **kwargs)
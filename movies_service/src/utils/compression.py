@@ -0,0 +1,111 @@
+import gzip
+import logging
+from typing import Callable
+
+from src.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Уровни сжатия: компромисс между размером и временем сжатия при записи
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+COMPRESSORS: dict[str, Callable[[bytes], bytes]] = {
+    "gzip": lambda data: gzip.compress(data, compresslevel=GZIP_LEVEL),
+}
+
+if brotli is not None:
+    COMPRESSORS["br"] = lambda data: brotli.compress(
+        data, quality=BROTLI_QUALITY
+    )
+
+if zstandard is not None:
+    COMPRESSORS["zstd"] = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress
+
+
+def compress_payload(payload: bytes) -> dict[str, bytes]:
+    """
+    Предварительно сжатый вариант тела ответа в кодировке
+    cache_compression_encoding: кодировка -> сжатое тело. Сжимается один
+    раз при записи в кеш, поэтому хранится только одна кодировка; клиенты,
+    которые её не принимают, получают несжатое тело.
+
+    Тела меньше cache_compression_min_size не сжимаются; вариант, который
+    не меньше исходного тела, отбрасывается.
+    """
+    encoding = settings.cache_compression_encoding
+
+    if not encoding or len(payload) < settings.cache_compression_min_size:
+        return {}
+
+    if (compressor := COMPRESSORS.get(encoding)) is None:
+        return {}
+
+    compressed = compressor(payload)
+
+    if len(compressed) >= len(payload):
+        return {}
+
+    return {encoding: compressed}
+
+
+def parse_accept_encoding(accept_encoding: str | None) -> dict[str, float]:
+    """Разбор заголовка Accept-Encoding: кодировка -> q-значение."""
+    accepted = {}
+
+    for item in (accept_encoding or "").split(","):
+        encoding, *params = item.strip().split(";")
+
+        if not (encoding := encoding.strip().lower()):
+            continue
+
+        quality = 1.0
+
+        for param in params:
+            name, _, value = param.strip().partition("=")
+
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+
+                except ValueError:
+                    quality = 0.0
+
+        accepted[encoding] = quality
+
+    return accepted
+
+
+def choose_encoding(
+    accept_encoding: str | None, available: dict[str, bytes]
+) -> str | None:
+    """
+    Выбор кодировки ответа среди имеющихся вариантов по Accept-Encoding
+    клиента: с наибольшим q, при равенстве - в порядке предпочтения сервиса.
+    Возвращает None, если следует отдать несжатое тело.
+    """
+    if not available or not accept_encoding:
+        return None
+
+    accepted = parse_accept_encoding(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+
+    for encoding in available:
+        quality = accepted.get(encoding, wildcard)
+
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+
+    return best
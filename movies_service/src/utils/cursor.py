@@ -0,0 +1,65 @@
+import base64
+import binascii
+from typing import Any, NamedTuple
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+
+from src.core.exceptions import InvalidCursorError
+
+# Значение курсора для запроса первой страницы в курсорном режиме
+CURSOR_START = "*"
+# Заголовок ответа с курсором следующей страницы
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class CursorPage(NamedTuple):
+    """
+    Страница курсорной выдачи: объекты и курсор следующей страницы (None,
+    если страница последняя).
+    """
+
+    objects: list[BaseModel]
+    next_cursor: str | None
+
+
+def encode_cursor(pit_id: str, search_after: list[Any]) -> str:
+    """
+    Непрозрачный курсор: идентификатор контекста point-in-time и значения
+    сортировки последней записи страницы (для search_after).
+    """
+    data = orjson.dumps({"pit": pit_id, "after": search_after})
+
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, list[Any]]:
+    """Разобрать курсор на идентификатор point-in-time и search_after."""
+    try:
+        data = orjson.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        pit_id, search_after = data["pit"], data["after"]
+
+    except (
+        binascii.Error, ValueError, orjson.JSONDecodeError, KeyError,
+        TypeError,
+    ) as e:
+        raise InvalidCursorError(e)
+
+    if not isinstance(pit_id, str) or not isinstance(search_after, list):
+        raise InvalidCursorError("Некорректный формат курсора")
+
+    return pit_id, search_after
+
+
+def set_next_cursor(response: Response, page: CursorPage) -> list[BaseModel]:
+    """
+    Передать курсор следующей страницы в заголовке ответа (тело ответа
+    остаётся списком записей) и вернуть объекты страницы.
+    """
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
+
+    return page.objects
@@ -50,7 +50,7 @@ class ElasticService:
 
     @with_retry()
     async def search(
-        self, index: str, query: dict, log_info: str = ""
+        self, index: str | None, query: dict, log_info: str = ""
     ) -> ObjectApiResponse[Any]:
         logger.debug(
             "Попытка выполнить запрос search в Elasticsearch: "
@@ -83,6 +83,50 @@ class ElasticService:
             )
             raise ElasticServiceError(e)
 
+    @with_retry()
+    async def open_point_in_time(
+        self, index: str, keep_alive: str, log_info: str = ""
+    ) -> str:
+        """Открыть контекст point-in-time для постраничного чтения индекса."""
+        try:
+            response = await self.es_client.open_point_in_time(
+                index=index, keep_alive=keep_alive
+            )
+            logger.debug(
+                "Открыт контекст point-in-time в Elasticsearch: "
+                "index=%s. %s",
+                index, log_info
+            )
+            return response["id"]
+
+        except settings.elastic_exceptions as e:
+            logger.error(
+                "Ошибка при открытии контекста point-in-time в "
+                "Elasticsearch: index=%s, error=%s. %s",
+                index, e, log_info
+            )
+            raise ElasticServiceError(e)
+
+    async def close_point_in_time(
+        self, pit_id: str, log_info: str = ""
+    ) -> None:
+        """
+        Закрыть контекст point-in-time. Ошибки не критичны: контекст всё
+        равно будет удалён по истечении keep_alive.
+        """
+        try:
+            await self.es_client.close_point_in_time(id=pit_id)
+            logger.debug(
+                "Закрыт контекст point-in-time в Elasticsearch. %s", log_info
+            )
+
+        except settings.elastic_exceptions as e:
+            logger.warning(
+                "Ошибка при закрытии контекста point-in-time в "
+                "Elasticsearch: error=%s. %s",
+                e, log_info
+            )
+
     @with_retry()
     async def index(
         self, index: str, id: str, body: dict
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+from collections import defaultdict
+from functools import lru_cache
+from typing import Awaitable, Callable
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HealthChecker:
+    """
+    Фоновая проверка доступности внешних сервисов (Redis, Elasticsearch).
+
+    Проверки выполняются раз в interval секунд вне обработки запросов;
+    их результат доступен через флаг готовности (ready). После
+    failure_threshold неудачных проверок подряд сервис считается
+    недоступным и выполняется переподключение клиента.
+    """
+
+    def __init__(
+        self, interval: float, timeout: float, failure_threshold: int
+    ):
+        self._interval = interval
+        self._timeout = timeout
+        self._failure_threshold = failure_threshold
+        self._checks: dict[
+            str,
+            tuple[
+                Callable[[], Awaitable[bool]],
+                Callable[[], Awaitable[None]] | None,
+            ],
+        ] = {}
+        self._failures: defaultdict[str, int] = defaultdict(int)
+        self.status: dict[str, bool] = {}
+
+    def register(
+        self,
+        name: str,
+        check: Callable[[], Awaitable[bool]],
+        reconnect: Callable[[], Awaitable[None]] | None = None,
+    ) -> None:
+        """Зарегистрировать проверку сервиса и функцию переподключения."""
+        self._checks[name] = (check, reconnect)
+
+    @property
+    def ready(self) -> bool:
+        """Готовность: все зарегистрированные сервисы доступны."""
+        return bool(self.status) and all(self.status.values())
+
+    async def _check(self, name: str) -> bool:
+        check, _ = self._checks[name]
+
+        try:
+            return bool(await asyncio.wait_for(check(), self._timeout))
+
+        except Exception as e:
+            logger.warning("Проверка доступности %s не пройдена: %s", name, e)
+            return False
+
+    async def check_all(self) -> None:
+        """Выполнить все проверки и обновить флаг готовности."""
+        names = list(self._checks)
+        results = await asyncio.gather(*(self._check(name) for name in names))
+
+        for name, is_alive in zip(names, results):
+            if is_alive:
+                if not self.status.get(name, True):
+                    logger.info("Сервис %s снова доступен.", name)
+
+                self._failures[name] = 0
+                self.status[name] = True
+                continue
+
+            self._failures[name] += 1
+
+            if self._failures[name] < self._failure_threshold:
+                continue
+
+            if self.status.get(name, True):
+                logger.error("Сервис %s недоступен.", name)
+
+            self.status[name] = False
+
+            if reconnect := self._checks[name][1]:
+                try:
+                    await reconnect()
+
+                except Exception as e:
+                    logger.error(
+                        "Ошибка переподключения к %s: %s", name, e
+                    )
+
+    async def run(self) -> None:
+        """Фоновая задача периодической проверки."""
+        while True:
+            await asyncio.sleep(self._interval)
+            await self.check_all()
+
+
+@lru_cache()
+def get_health_checker() -> HealthChecker:
+    """Провайдер для получения синглтон экземпляра HealthChecker."""
+    return HealthChecker(
+        interval=settings.health_check_interval,
+        timeout=settings.health_check_timeout,
+        failure_threshold=settings.health_check_failure_threshold,
+    )
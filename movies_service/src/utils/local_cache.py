@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
+from typing import Any
+from uuid import uuid4
+
+import orjson
+from redis.asyncio import Redis
+
+from src.core.config import settings
+from src.utils.tiny_lfu import TinyLFU
+
+logger = logging.getLogger(__name__)
+
+
+class LocalCache:
+    """
+    Локальный (in-process) LRU-кеш с ограничением по размеру и времени жизни
+    записей.
+
+    Используется как первый уровень кеша перед Redis: хранит уже
+    провалидированные объекты моделей Pydantic, что избавляет от сетевого
+    запроса, десериализации и валидации для горячих ключей. Инвалидация между
+    воркерами выполняется через канал Redis pub/sub.
+
+    Для семейств ключей из admission_prefixes (например, результатов поиска
+    с длинным хвостом редких запросов) в заполненный кеш допускаются только
+    ключи, которые запрашивались чаще вытесняемого (TinyLFU).
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl: int,
+        admission: TinyLFU | None = None,
+        admission_prefixes: tuple[str, ...] = (),
+    ):
+        self._max_size = max_size
+        self._ttl = ttl
+        self._admission = admission
+        self._admission_prefixes = frozenset(admission_prefixes)
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._hits: defaultdict[str, int] = defaultdict(int)
+        self._misses: defaultdict[str, int] = defaultdict(int)
+        self._rejected: defaultdict[str, int] = defaultdict(int)
+
+        # Идентификатор экземпляра, чтобы не обрабатывать свои же сообщения
+        self.instance_id = uuid4().hex
+
+    @staticmethod
+    def _get_prefix(key: str) -> str:
+        """Префикс ключа (семейство ключей) для статистики."""
+        return key.split(":", 1)[0]
+
+    def get(self, key: str) -> Any | None:
+        prefix = self._get_prefix(key)
+        item = self._data.get(key)
+
+        if self._admission is not None:
+            self._admission.record(key)
+
+        if item is None:
+            self._misses[prefix] += 1
+            return None
+
+        expire_at, value = item
+
+        if expire_at < time.monotonic():
+            del self._data[key]
+            self._misses[prefix] += 1
+            return None
+
+        self._data.move_to_end(key)
+        self._hits[prefix] += 1
+
+        return value
+
+    def _is_admitted(self, key: str) -> bool:
+        """Допускается ли новый ключ в заполненный кеш (TinyLFU)."""
+        if (
+            self._admission is None
+            or key in self._data
+            or len(self._data) < self._max_size
+            or self._get_prefix(key) not in self._admission_prefixes
+        ):
+            return True
+
+        victim = next(iter(self._data))
+
+        return self._admission.admit(key, victim)
+
+    def set(self, key: str, value: Any, ttl: int | None = None) -> None:
+        if not self._is_admitted(key):
+            self._rejected[self._get_prefix(key)] += 1
+            return
+
+        expire_at = time.monotonic() + (self._ttl if ttl is None else ttl)
+
+        self._data[key] = (expire_at, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self._max_size:
+            self._data.popitem(last=False)
+
+    def invalidate(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Счётчики попаданий/промахов (и отклонённых фильтром допуска записей)
+        по префиксам ключей.
+        """
+        prefixes = set(self._hits) | set(self._misses) | set(self._rejected)
+
+        return {
+            "size": len(self._data),
+            "max_size": self._max_size,
+            "prefixes": {
+                prefix: {
+                    "hits": self._hits[prefix],
+                    "misses": self._misses[prefix],
+                    "rejected": self._rejected[prefix],
+                }
+                for prefix in sorted(prefixes)
+            },
+        }
+
+    def make_invalidation_message(self, *keys: str) -> bytes:
+        """Сообщение для канала инвалидации локальных кешей."""
+        return orjson.dumps({"sender": self.instance_id, "keys": keys})
+
+    def _handle_invalidation_message(self, data: bytes) -> None:
+        try:
+            message = orjson.loads(data)
+
+        except orjson.JSONDecodeError:
+            logger.warning(
+                "Некорректное сообщение инвалидации локального кеша: %s", data
+            )
+            return
+
+        if message.get("sender") == self.instance_id:
+            return
+
+        if keys := message.get("keys"):
+            self.invalidate(*keys)
+            logger.debug("Инвалидированы ключи локального кеша: %s", keys)
+
+        else:
+            self.clear()
+            logger.info("Локальный кеш полностью очищен по сообщению.")
+
+    async def listen_invalidations(
+        self, redis_client: Redis, channel: str
+    ) -> None:
+        """
+        Фоновая задача: подписка на канал инвалидации и удаление ключей из
+        локального кеша. При потере соединения подписка восстанавливается,
+        а кеш очищается, так как сообщения могли быть пропущены.
+        """
+        while True:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+
+            try:
+                await pubsub.subscribe(channel)
+                logger.info(
+                    "Подписка на канал инвалидации локального кеша: %s",
+                    channel
+                )
+
+                async for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self._handle_invalidation_message(message["data"])
+
+            except asyncio.CancelledError:
+                await pubsub.close()
+                raise
+
+            except settings.redis_exceptions as e:
+                logger.error(
+                    "Ошибка подписки на канал инвалидации локального кеша: "
+                    "%s", e
+                )
+                self.clear()
+                await pubsub.close()
+                await asyncio.sleep(1)
+
+
+@lru_cache()
+def get_local_cache() -> LocalCache:
+    """Провайдер для получения синглтон экземпляра LocalCache."""
+    return LocalCache(
+        max_size=settings.local_cache_max_size,
+        ttl=settings.local_cache_ttl_seconds,
+        admission=TinyLFU(width=settings.local_cache_max_size),
+        admission_prefixes=tuple(settings.local_cache_admission_prefixes),
+    )
+
+
+@lru_cache()
+def get_token_cache() -> LocalCache:
+    """
+    Провайдер для получения синглтон экземпляра LocalCache для проверенных
+    токенов (ключ token:<отпечаток токена>, значение - payload токена). Время
+    жизни записи задаётся по exp токена, записи удаляются по сообщениям
+    auth-сервиса об отзыве токенов.
+    """
+    return LocalCache(
+        max_size=settings.token_cache_max_size,
+        ttl=settings.local_cache_ttl_seconds,
+    )
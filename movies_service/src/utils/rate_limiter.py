@@ -0,0 +1,343 @@
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+__all__ = ["RateLimiter", "HybridRateLimiter", "RATE_LIMIT_STRATEGIES"]
+
+logger = logging.getLogger(__name__)
+
+# Каждая стратегия — один Lua-скрипт: проверка и учёт запроса выполняются
+# атомарно за один сетевой запрос к Redis. Скрипт возвращает
+# {разрешён (1/0), через сколько секунд повторить запрос}.
+# Время берётся из Redis (TIME), чтобы не зависеть от часов экземпляров.
+
+# Фиксированное окно: счётчик запросов, сбрасываемый по истечении окна.
+FIXED_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], window)
+end
+
+if current > limit then
+    return {0, math.max(redis.call('TTL', KEYS[1]), 1)}
+end
+
+return {1, 0}
+"""
+
+# Скользящее окно (счётчик): количество запросов за последние window секунд
+# оценивается по счётчикам текущего и предыдущего окна, взвешенным по доле
+# перекрытия.
+SLIDING_WINDOW_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local current_window = math.floor(now / window)
+local elapsed = (now - current_window * window) / window
+
+local current_key = KEYS[1] .. ':' .. current_window
+local previous_key = KEYS[1] .. ':' .. (current_window - 1)
+
+local current = tonumber(redis.call('GET', current_key) or '0')
+local previous = tonumber(redis.call('GET', previous_key) or '0')
+
+if previous * (1 - elapsed) + current >= limit then
+    return {0, math.max(math.ceil((1 - elapsed) * window), 1)}
+end
+
+redis.call('INCR', current_key)
+redis.call('EXPIRE', current_key, window * 2)
+
+return {1, 0}
+"""
+
+# Маркерное ведро: ёмкость limit маркеров, пополнение со скоростью
+# limit / window маркеров в секунду; запрос расходует один маркер.
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = capacity / tonumber(ARGV[2])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(now - ts, 0) * rate)
+
+local allowed = 0
+local retry_after = 0
+
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    retry_after = math.max(math.ceil((1 - tokens) / rate), 1)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+
+return {allowed, retry_after}
+"""
+
+# Пакетная синхронизация локально принятых запросов: счётчики текущего окна
+# (те же, что у SLIDING_WINDOW_SCRIPT) увеличиваются на ARGV[i + 1], для
+# каждого ключа возвращается оценка по скользящему окну, последним
+# элементом — время до конца текущего окна.
+SLIDING_WINDOW_SYNC_SCRIPT = """
+local window = tonumber(ARGV[1])
+
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local current_window = math.floor(now / window)
+local elapsed = (now - current_window * window) / window
+
+local result = {}
+
+for i, key in ipairs(KEYS) do
+    local current_key = key .. ':' .. current_window
+    local previous_key = key .. ':' .. (current_window - 1)
+
+    local current = redis.call('INCRBY', current_key, tonumber(ARGV[i + 1]))
+    redis.call('EXPIRE', current_key, window * 2)
+    local previous = tonumber(redis.call('GET', previous_key) or '0')
+
+    result[i] = math.floor(previous * (1 - elapsed) + current)
+end
+
+result[#KEYS + 1] = math.max(math.ceil((1 - elapsed) * window), 1)
+
+return result
+"""
+
+RATE_LIMIT_STRATEGIES = {
+    "fixed_window": FIXED_WINDOW_SCRIPT,
+    "sliding_window": SLIDING_WINDOW_SCRIPT,
+    "token_bucket": TOKEN_BUCKET_SCRIPT,
+}
+
+
+class RateLimiter:
+    """
+    Ограничитель частоты запросов на Redis.
+
+    Стратегия (fixed_window, sliding_window, token_bucket) выбирается при
+    создании. Скрипт стратегии регистрируется в Redis и вызывается по
+    EVALSHA (с автоматической загрузкой при отсутствии в кеше скриптов).
+    """
+
+    def __init__(
+        self, redis_client: Redis, limit: int, window: int, strategy: str
+    ):
+        if strategy not in RATE_LIMIT_STRATEGIES:
+            raise ValueError(
+                f"Неизвестная стратегия ограничения частоты запросов: "
+                f"{strategy}"
+            )
+
+        self._limit = limit
+        self._window = window
+        self._script = redis_client.register_script(
+            RATE_LIMIT_STRATEGIES[strategy]
+        )
+
+    async def hit(self, key: str) -> tuple[bool, int]:
+        """
+        Учесть запрос по ключу.
+
+        :return: (разрешён ли запрос, через сколько секунд его можно
+        повторить, если запрещён).
+        """
+        allowed, retry_after = await self._script(
+            keys=[key], args=[self._limit, self._window]
+        )
+
+        return bool(allowed), int(retry_after)
+
+
+@dataclass(slots=True)
+class _LocalBucket:
+    """Локальное состояние ключа в HybridRateLimiter."""
+
+    tokens: float
+    ts: float
+    # Запросы, принятые локально и ещё не учтённые в Redis
+    pending: int = 0
+    # Ключ близок к лимиту: запросы проверяются в Redis синхронно
+    hot: bool = False
+    # До этого момента (time.monotonic) запросы отклоняются без Redis
+    blocked_until: float = 0.0
+
+
+class HybridRateLimiter:
+    """
+    Гибридный ограничитель частоты запросов.
+
+    Каждый воркер держит в памяти маркерное ведро на ключ (ёмкость limit,
+    пополнение limit / window в секунду) и решает локально, без обращения к
+    Redis. Принятые запросы раз в sync_interval секунд пакетно учитываются
+    в общих счётчиках скользящего окна в Redis (один Lua-скрипт на пачку
+    ключей). По результату синхронизации ключи, превысившие лимит,
+    отклоняются локально до конца окна, а ключи, приблизившиеся к лимиту
+    (hot_ratio), проверяются в Redis синхронно (как в RateLimiter).
+
+    Общие счётчики ведутся только по стратегии sliding_window (синхронные
+    проверки горячих ключей используют те же счётчики), другие стратегии
+    не поддерживаются.
+
+    Ограничение приблизительное: между синхронизациями каждый воркер может
+    пропустить не больше своего локального ведра. Поэтому ёмкость и скорость
+    пополнения ведра делятся на количество воркеров (workers) всех
+    экземпляров сервиса: вместе они пропускают не больше limit запросов.
+    """
+
+    SYNC_BATCH_SIZE = 500
+    STRATEGY = "sliding_window"
+
+    def __init__(
+        self,
+        redis_client: Redis,
+        limit: int,
+        window: int,
+        strategy: str = STRATEGY,
+        sync_interval: float = 0.2,
+        hot_ratio: float = 0.8,
+        workers: int = 1,
+    ):
+        if strategy != self.STRATEGY:
+            raise ValueError(
+                f"Стратегия {strategy} не поддерживается локальным режимом "
+                f"ограничения частоты запросов (только {self.STRATEGY})"
+            )
+
+        self._limit = limit
+        self._window = window
+        # Локальное ведро воркера: его доля общего лимита
+        self._capacity = max(limit / max(workers, 1), 1)
+        self._rate = self._capacity / window
+        self._sync_interval = sync_interval
+        self._hot_ratio = hot_ratio
+        self._sync_script = redis_client.register_script(
+            SLIDING_WINDOW_SYNC_SCRIPT
+        )
+        self._limiter = RateLimiter(redis_client, limit, window, strategy)
+        self._buckets: dict[str, _LocalBucket] = {}
+        self._sync_task: asyncio.Task | None = None
+
+    def _ensure_sync_task(self) -> None:
+        """Запуск фоновой синхронизации в текущем цикле событий."""
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._sync_loop())
+
+    async def hit(self, key: str) -> tuple[bool, int]:
+        """
+        Учесть запрос по ключу.
+
+        :return: (разрешён ли запрос, через сколько секунд его можно
+        повторить, если запрещён).
+        """
+        self._ensure_sync_task()
+
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+
+        if bucket is None:
+            bucket = self._buckets[key] = _LocalBucket(
+                tokens=self._capacity, ts=now
+            )
+
+        if bucket.blocked_until > now:
+            return False, math.ceil(bucket.blocked_until - now)
+
+        if bucket.hot:
+            allowed, retry_after = await self._limiter.hit(key)
+
+            if not allowed:
+                bucket.blocked_until = now + retry_after
+
+            return allowed, retry_after
+
+        bucket.tokens = min(
+            self._capacity, bucket.tokens + (now - bucket.ts) * self._rate
+        )
+        bucket.ts = now
+
+        if bucket.tokens < 1:
+            return False, math.ceil((1 - bucket.tokens) / self._rate)
+
+        bucket.tokens -= 1
+        bucket.pending += 1
+
+        return True, 0
+
+    async def _sync_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._sync_interval)
+
+            try:
+                await self.sync()
+
+            except RedisError as e:
+                logger.warning("Ошибка синхронизации RateLimit: %s", e)
+
+    async def sync(self) -> None:
+        """
+        Пакетная синхронизация локальных счётчиков с Redis и обновление
+        состояния ключей. Неактивные ключи удаляются из памяти.
+
+        При ошибке Redis неучтённые запросы пачки возвращаются в локальные
+        счётчики и учитываются при следующей синхронизации.
+        """
+        now = time.monotonic()
+        keys = []
+
+        for key, bucket in list(self._buckets.items()):
+            if bucket.pending or bucket.hot:
+                keys.append(key)
+
+            elif (
+                now - bucket.ts > self._window
+                and bucket.blocked_until <= now
+            ):
+                del self._buckets[key]
+
+        for start in range(0, len(keys), self.SYNC_BATCH_SIZE):
+            batch = keys[start:start + self.SYNC_BATCH_SIZE]
+            pending = []
+
+            for key in batch:
+                pending.append(self._buckets[key].pending)
+                self._buckets[key].pending = 0
+
+            try:
+                *estimates, retry_after = await self._sync_script(
+                    keys=batch, args=[self._window, *pending]
+                )
+
+            except RedisError:
+                for key, count in zip(batch, pending):
+                    if (bucket := self._buckets.get(key)) is not None:
+                        bucket.pending += count
+
+                raise
+
+            for key, estimate in zip(batch, estimates):
+                if (bucket := self._buckets.get(key)) is None:
+                    continue
+
+                bucket.hot = estimate >= self._limit * self._hot_ratio
+
+                if estimate >= self._limit:
+                    bucket.blocked_until = now + int(retry_after)
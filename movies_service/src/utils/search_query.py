@@ -0,0 +1,26 @@
+import hashlib
+
+import orjson
+
+
+def normalize_query(query: str | None) -> str | None:
+    """
+    Нормализация поискового запроса: приведение к единому регистру и
+    схлопывание пробелов. Пустой запрос считается отсутствующим.
+    """
+    if query is None:
+        return None
+
+    return " ".join(query.casefold().split()) or None
+
+
+def make_search_cache_key(prefix: str, body: dict) -> str:
+    """
+    Ключ кеша результатов поиска: стабильный хеш тела запроса в
+    Elasticsearch (с сортировкой ключей).
+    """
+    digest = hashlib.blake2b(
+        orjson.dumps(body, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+
+    return f"{prefix}:{digest}"
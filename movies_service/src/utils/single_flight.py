@@ -0,0 +1,55 @@
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Реестр выполняющихся запросов (single-flight).
+
+    Одновременные вызовы с одинаковым ключом объединяются: выполняется только
+    первый из них, остальные ожидают и получают тот же результат (или то же
+    исключение). Выполнение идёт в отдельной задаче, поэтому отмена одного из
+    ожидающих не прерывает запрос для остальных.
+    """
+
+    def __init__(self):
+        self._flights: dict[str, asyncio.Task] = {}
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._flights.get(key) is task:
+            del self._flights[key]
+
+    async def do(
+        self,
+        key: str,
+        func: Callable[[], Awaitable[Any]],
+        log_info: str = "",
+    ) -> Any:
+        task = self._flights.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(func())
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self._flights[key] = task
+
+        else:
+            logger.info(
+                "Запрос присоединён к уже выполняющемуся: key=%s. %s",
+                key, log_info
+            )
+
+        return await asyncio.shield(task)
+
+    def in_flight(self) -> int:
+        """Количество выполняющихся в данный момент запросов."""
+        return len(self._flights)
+
+
+@lru_cache()
+def get_single_flight() -> SingleFlight:
+    """Провайдер для получения синглтон экземпляра SingleFlight."""
+    return SingleFlight()
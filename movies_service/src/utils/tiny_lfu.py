@@ -0,0 +1,62 @@
+# Таблица для деления счётчиков пополам (bytes.translate)
+_HALVE_TABLE = bytes(count >> 1 for count in range(256))
+
+
+class TinyLFU:
+    """
+    Фильтр допуска TinyLFU.
+
+    Хранит приближённые частоты обращений к ключам в count-min sketch
+    (depth строк по width счётчиков, счётчик ограничен max_count). После
+    sample_size обращений все счётчики делятся пополам, поэтому частоты
+    отражают недавнюю популярность ключа.
+
+    Новый ключ допускается в заполненный кеш, только если он встречался
+    чаще, чем ключ-кандидат на вытеснение: редкие запросы «длинного хвоста»
+    не вытесняют горячие записи.
+    """
+
+    def __init__(
+        self,
+        width: int,
+        depth: int = 4,
+        sample_size: int | None = None,
+        max_count: int = 15,
+    ):
+        self._width = max(width, 1)
+        self._depth = depth
+        self._sample_size = sample_size or self._width * 10
+        self._max_count = max_count
+        self._table = [bytearray(self._width) for _ in range(depth)]
+        self._additions = 0
+
+    def _indexes(self, key: str) -> list[int]:
+        return [hash((row, key)) % self._width for row in range(self._depth)]
+
+    def record(self, key: str) -> None:
+        """Учесть обращение к ключу."""
+        for row, index in zip(self._table, self._indexes(key)):
+            if row[index] < self._max_count:
+                row[index] += 1
+
+        self._additions += 1
+
+        if self._additions >= self._sample_size:
+            self._reset()
+
+    def estimate(self, key: str) -> int:
+        """Оценка частоты обращений к ключу (сверху)."""
+        return min(
+            row[index] for row, index in zip(self._table, self._indexes(key))
+        )
+
+    def admit(self, candidate: str, victim: str) -> bool:
+        """Допустить ли candidate в кеш ценой вытеснения victim."""
+        return self.estimate(candidate) > self.estimate(victim)
+
+    def _reset(self) -> None:
+        """Старение: деление всех счётчиков пополам."""
+        for row in self._table:
+            row[:] = row.translate(_HALVE_TABLE)
+
+        self._additions //= 2
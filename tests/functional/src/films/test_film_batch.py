@@ -0,0 +1,44 @@
+import uuid
+
+import aiohttp
+import pytest
+
+from settings import config
+
+
+@pytest.mark.asyncio
+async def test_get_films_batch(load_bulk_data_to_es) -> None:
+    """
+    Проверяем, что можно получить несколько фильмов по списку UUID одним
+    запросом, а отсутствующие фильмы пропускаются.
+
+    @type load_bulk_data_to_es:
+    @param load_bulk_data_to_es:
+    @rtype None:
+    """
+    test_films = (await load_bulk_data_to_es)[:3]  # Загружаем тестовые данные
+    film_uuids = [film["uuid"] for film in test_films]
+
+    async with aiohttp.ClientSession() as session:
+        url = f"{config.service_url}/api/v1/films/batch"
+        payload = {"ids": [*film_uuids, str(uuid.uuid4())]}
+
+        async with session.post(url, json=payload) as response:
+            assert response.status == 200, f"Ожидался 200, но получен {response.status}"
+
+            data = await response.json()
+            assert [film["uuid"] for film in data] == film_uuids, "Неверный список фильмов"
+
+
+@pytest.mark.asyncio
+async def test_get_films_batch_empty_ids() -> None:
+    """
+    Проверяем, что пустой список UUID отклоняется валидацией.
+
+    @rtype None:
+    """
+    async with aiohttp.ClientSession() as session:
+        url = f"{config.service_url}/api/v1/films/batch"
+
+        async with session.post(url, json={"ids": []}) as response:
+            assert response.status == 422, f"Ожидался 422, но получен {response.status}"
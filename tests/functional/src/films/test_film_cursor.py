@@ -0,0 +1,111 @@
+import aiohttp
+import pytest
+
+from settings import config
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+async def walk_by_cursor(
+    session: aiohttp.ClientSession, url: str, params: dict
+) -> tuple[list[str], list[str]]:
+    """
+    Обходит выдачу по курсору: первая страница по cursor=*, далее по
+    заголовку X-Next-Cursor, пока он есть.
+
+    @type session: aiohttp.ClientSession
+    @param session:
+    @type url: str
+    @param url:
+    @type params: dict
+    @param params: Параметры запроса (без cursor).
+    @rtype tuple[list[str], list[str]]:
+    @return: UUID записей всех страниц и выданные курсоры.
+    """
+    uuids, cursors, cursor = [], [], "*"
+
+    while cursor:
+        async with session.get(url, params={**params, "cursor": cursor}) as response:
+            assert response.status == 200, f"Ожидался 200, но получен {response.status}"
+
+            uuids.extend(record["uuid"] for record in await response.json())
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+
+        if cursor:
+            cursors.append(cursor)
+
+    return uuids, cursors
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "path, params",
+    [
+        ("films", {"page_size": 2}),
+        ("films/search", {"query": "Star", "page_size": 2}),
+    ],
+)
+async def test_films_cursor_walk(load_bulk_data_to_es, path: str, params: dict) -> None:
+    """
+    Проверяем, что обход фильмов по курсору выдаёт каждый фильм ровно один
+    раз (без дублей и пропусков), последняя страница не содержит курсора, а
+    после неё курсор с закрытым контекстом отклоняется.
+
+    @type load_bulk_data_to_es:
+    @param load_bulk_data_to_es:
+    @type path: str
+    @param path:
+    @type params: dict
+    @param params:
+    @rtype None:
+    """
+    test_films = await load_bulk_data_to_es  # Загружаем тестовые данные
+    url = f"{config.service_url}/api/v1/{path}"
+
+    async with aiohttp.ClientSession() as session:
+        uuids, cursors = await walk_by_cursor(session, url, params)
+
+        assert len(uuids) == len(set(uuids)), "Фильмы повторяются на разных страницах"
+        assert set(uuids) == {film["uuid"] for film in test_films}, "Пропущены фильмы"
+        assert cursors, "Ожидалось несколько страниц"
+
+        # На последней странице контекст point-in-time закрыт
+        async with session.get(url, params={**params, "cursor": cursors[0]}) as response:
+            assert response.status == 400, f"Ожидался 400, но получен {response.status}"
+
+
+@pytest.mark.asyncio
+async def test_persons_cursor_walk(load_bulk_data_to_persons_es) -> None:
+    """
+    Проверяем, что обход результатов поиска персон по курсору выдаёт каждую
+    персону ровно один раз.
+
+    @type load_bulk_data_to_persons_es:
+    @param load_bulk_data_to_persons_es:
+    @rtype None:
+    """
+    test_persons = await load_bulk_data_to_persons_es  # Загружаем тестовые данные
+    url = f"{config.service_url}/api/v1/persons/search"
+
+    async with aiohttp.ClientSession() as session:
+        uuids, _ = await walk_by_cursor(session, url, {"query": "John", "page_size": 2})
+
+        assert len(uuids) == len(set(uuids)), "Персоны повторяются на разных страницах"
+        assert set(uuids) == {person["uuid"] for person in test_persons}, "Пропущены персоны"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("cursor", ["garbled", "eyJwaXQiOiAxfQ"])
+async def test_films_invalid_cursor(cursor: str) -> None:
+    """
+    Проверяем, что некорректный курсор отклоняется с кодом 400.
+
+    @type cursor: str
+    @param cursor:
+    @rtype None:
+    """
+    async with aiohttp.ClientSession() as session:
+        url = f"{config.service_url}/api/v1/films"
+
+        async with session.get(url, params={"cursor": cursor}) as response:
+            assert response.status == 400, f"Ожидался 400, но получен {response.status}"
@@ -0,0 +1,34 @@
+import aiohttp
+import pytest
+
+from settings import config
+
+
+@pytest.mark.asyncio
+async def test_get_film_by_uuid_not_modified(load_bulk_data_to_es) -> None:
+    """
+    Проверяем, что при совпадении If-None-Match с ETag фильма API
+    возвращает 304 без тела ответа.
+
+    @type load_bulk_data_to_es:
+    @param load_bulk_data_to_es:
+    @rtype None:
+    """
+    test_film = (await load_bulk_data_to_es)[0]  # Загружаем тестовые данные
+    film_uuid = test_film["uuid"]
+
+    async with aiohttp.ClientSession() as session:
+        url = f"{config.service_url}/api/v1/films/{film_uuid}"
+
+        async with session.get(url) as response:
+            assert response.status == 200, f"Ожидался 200, но получен {response.status}"
+            etag = response.headers.get("ETag")
+            assert etag, "Ответ не содержит заголовок ETag"
+
+        async with session.get(url, headers={"If-None-Match": etag}) as response:
+            assert response.status == 304, f"Ожидался 304, но получен {response.status}"
+            assert response.headers.get("ETag") == etag, "ETag не совпадает"
+            assert not await response.read(), "Ответ 304 не должен содержать тело"
+
+        async with session.get(url, headers={"If-None-Match": '"other"'}) as response:
+            assert response.status == 200, f"Ожидался 200, но получен {response.status}"
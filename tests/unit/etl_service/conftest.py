@@ -0,0 +1,38 @@
+import os
+import sys
+import tempfile
+
+import fakeredis.aioredis
+import pytest_asyncio
+
+# Модули etl_service импортируются от каталога src (core, interface, ...)
+sys.path.insert(
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "../../../etl_service/src")
+    ),
+)
+# Логгер ETL пишет в {base_dir}/logs/app.log: каталог логов тестов -
+# временный
+_base_dir = tempfile.mkdtemp(prefix="etl_unit_")
+os.makedirs(os.path.join(_base_dir, "logs"), exist_ok=True)
+os.environ.setdefault("BASE_DIR", _base_dir)
+
+
+@pytest_asyncio.fixture
+async def redis_storage():
+    """
+    RedisStorage поверх Redis в памяти (fakeredis).
+
+    @rtype RedisStorage:
+    @return storage:
+    """
+    from interface.storage.redis_storage import RedisStorage
+
+    storage = RedisStorage(fakeredis.aioredis.FakeRedis(decode_responses=True))
+
+    try:
+        yield storage
+
+    finally:
+        await storage.close_()
@@ -0,0 +1,236 @@
+import json
+import uuid
+
+import pytest
+from elastic_transport import (ApiResponseMeta, HttpHeaders, NodeConfig,
+                               ObjectApiResponse)
+from elasticsearch import AsyncElasticsearch
+
+import loader.movies_loader as movies_loader
+from core import config
+from interface.es_client import AsyncESClient
+from utils.movies_utils.etl_streams import stream_message
+
+STREAM = "etl:film_work:converted"
+DEAD_STREAM = "etl:film_work:dead"
+GROUP = "loader"
+
+
+class FakeBulk:
+    """
+    Заменитель AsyncElasticsearch.bulk: статусы элементов по id документа
+    (список статусов последовательных попыток, последний - для остальных).
+    """
+
+    def __init__(self, statuses: dict[str, list[int]]):
+        self.statuses = statuses
+        self.calls = []
+
+    async def __call__(self, operations=None, **kwargs):
+        ids = [
+            json.loads(operation)["index"]["_id"]
+            for operation in operations[::2]
+        ]
+        self.calls.append(ids)
+        items = []
+
+        for id_ in ids:
+            statuses = self.statuses.get(id_) or [201]
+            status = statuses.pop(0) if len(statuses) > 1 else statuses[0]
+            item = {"_id": id_, "status": status}
+
+            if status >= 300:
+                item["error"] = {"type": f"error_{status}"}
+
+            items.append({"index": item})
+
+        return ObjectApiResponse(
+            body={"errors": True, "items": items},
+            meta=ApiResponseMeta(
+                status=200,
+                http_version="1.1",
+                headers=HttpHeaders(),
+                duration=0,
+                node=NodeConfig("http", "localhost", 9200),
+            ),
+        )
+
+
+class FakeESClient:
+    """Заменитель AsyncESClient для Loader: ошибки bulk_index по id."""
+
+    def __init__(self):
+        self.errors = {}
+        self.documents = {}
+
+    async def create_index_with_ignore(self, index_: str, body: dict = None):
+        pass
+
+    async def bulk_index(
+        self, index_: str, documents: dict[str, dict]
+    ) -> dict[str, dict]:
+        for id_, document in documents.items():
+            if id_ not in self.errors:
+                self.documents[id_] = document
+
+        return {
+            id_: error
+            for id_, error in self.errors.items()
+            if id_ in documents
+        }
+
+    async def refresh_index(self, index_: str) -> None:
+        pass
+
+    async def search(self, index_: str, body: dict) -> dict:
+        return {"hits": {"hits": []}}
+
+
+def film_document(film_id: str, title: str = "Star") -> str:
+    return json.dumps({
+        "id": film_id,
+        "imdb_rating": 7.5,
+        "genres": [],
+        "title": title,
+        "description": "",
+        "directors_names": [],
+        "actors_names": [],
+        "writers_names": [],
+        "directors": [],
+        "actors": [],
+        "writers": [],
+        "was_enrich": True,
+        "was_convert": True,
+    })
+
+
+@pytest.fixture
+def es_bulk(monkeypatch):
+    """Фабрика заменителя AsyncElasticsearch.bulk (быстрые повторы)."""
+    monkeypatch.setattr(config, "etl_es_bulk_chunk_size", 2)
+    monkeypatch.setattr(config, "etl_es_bulk_retries", 2)
+    monkeypatch.setattr(config, "etl_es_bulk_retry_backoff", 0.001)
+
+    def make_bulk(statuses: dict[str, list[int]]) -> FakeBulk:
+        bulk = FakeBulk(statuses)
+
+        async def fake_bulk(client, *args, **kwargs):
+            return await bulk(*args, **kwargs)
+
+        monkeypatch.setattr(AsyncElasticsearch, "bulk", fake_bulk)
+
+        return bulk
+
+    return make_bulk
+
+
+@pytest.fixture
+def cache_storage(redis_storage, monkeypatch):
+    """Кеш movies_service для Loader - тот же Redis в памяти."""
+
+    class FakeRedisContextManager:
+        def __init__(self, redis_db: int):
+            pass
+
+        async def __aenter__(self):
+            return redis_storage
+
+        async def __aexit__(self, exc_type, exc_val, exc_tb):
+            pass
+
+    monkeypatch.setattr(
+        movies_loader, "RedisContextManager", FakeRedisContextManager
+    )
+
+    return redis_storage
+
+
+@pytest.mark.asyncio
+async def test_bulk_index_retries_only_retryable(es_bulk) -> None:
+    """
+    Проверяем, что повторно загружаются только документы с временной
+    ошибкой, ошибка документа после успешного повтора не возвращается, а
+    постоянная ошибка и исчерпанные повторы возвращаются.
+
+    @type es_bulk: Callable
+    @param es_bulk:
+    @rtype None:
+    """
+    ok_id, flaky_id, bad_id, busy_id = (str(uuid.uuid4()) for _ in range(4))
+    bulk = es_bulk({flaky_id: [429, 201], bad_id: [400], busy_id: [503]})
+    es_client = AsyncESClient()
+
+    try:
+        errors = await es_client.bulk_index(
+            index_="film_work",
+            documents={
+                id_: {"id": id_}
+                for id_ in (ok_id, flaky_id, bad_id, busy_id)
+            },
+        )
+
+    finally:
+        await es_client.close_()
+
+    assert {id_: error["status"] for id_, error in errors.items()} == {
+        bad_id: 400, busy_id: 503
+    }
+    assert errors[bad_id]["error"] == {"type": "error_400"}
+    # Пачки первой попытки, затем повторы временных ошибок
+    assert bulk.calls == [
+        [ok_id, flaky_id], [bad_id, busy_id], [flaky_id, busy_id], [busy_id]
+    ]
+
+
+@pytest.mark.asyncio
+async def test_loader_dead_letters(cache_storage, redis_storage) -> None:
+    """
+    Проверяем, что документ с постоянной ошибкой ES переносится в поток
+    недоставленных сообщений, документ с временной ошибкой остаётся не
+    подтверждённым и загружается при следующем запуске, а из повторных
+    сообщений объекта в пачке загружается последнее.
+
+    @type cache_storage: RedisStorage
+    @param cache_storage:
+    @type redis_storage: RedisStorage
+    @param redis_storage:
+    @rtype None:
+    """
+    ok_id, busy_id, bad_id = (str(uuid.uuid4()) for _ in range(3))
+    await redis_storage.add_batch_to_stream(name=STREAM, values=[
+        stream_message(obj_id=ok_id, data=film_document(ok_id, "Old")),
+        stream_message(obj_id=busy_id, data=film_document(busy_id)),
+        stream_message(obj_id=bad_id, data=film_document(bad_id)),
+        stream_message(obj_id=ok_id, data=film_document(ok_id, "New")),
+    ])
+    es_client = FakeESClient()
+    es_client.errors = {
+        busy_id: {"status": 429, "error": "busy"},
+        bad_id: {"status": 400, "error": {"type": "mapper_parsing"}},
+    }
+    loader = movies_loader.Loader(redis_storage, None, es_client)
+
+    await loader.run()
+
+    assert es_client.documents[ok_id]["title"] == "New"
+    dead = [fields for _, fields in await redis_storage._redis.xrange(
+        DEAD_STREAM
+    )]
+    assert [(fields["id"], fields["status"]) for fields in dead] == [
+        (bad_id, "400")
+    ]
+    assert json.loads(dead[0]["error"]) == {"type": "mapper_parsing"}
+    assert json.loads(dead[0]["data"])["id"] == bad_id
+
+    pending = await redis_storage._redis.xpending_range(
+        STREAM, GROUP, min="-", max="+", count=10
+    )
+    assert len(pending) == 1
+    assert await redis_storage._redis.xlen(STREAM) == 1
+
+    es_client.errors = {}
+    await loader.run()
+
+    assert busy_id in es_client.documents
+    assert await redis_storage._redis.xlen(STREAM) == 0
+    assert await redis_storage._redis.xlen(DEAD_STREAM) == 1
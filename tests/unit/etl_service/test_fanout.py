@@ -0,0 +1,155 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from core import config
+from extract.movies.fanout import Fanout
+from extract.movies.fanout_rules import DependencyRules
+from models.movies.pg_models import Genre, Person
+
+PERSON_SET = "etl:person:fanout"
+GENRE_SET = "etl:genre:fanout"
+FILM_WORK_SET = "etl:film_work:fanout"
+STREAM = "etl:film_work:produced"
+
+
+class FakeDependencies:
+    """
+    Заменитель связей в DB: фильмы персон и жанров, запросы по пачкам ID.
+    """
+
+    def __init__(self, film_works: dict[str, list[str]]):
+        self.film_works = film_works
+        self.requests = []
+        self.deleted = set()
+
+    async def film_work_ids_rule(self, pg_session, obj_ids: list[str]):
+        self.requests.append(sorted(obj_ids))
+
+        return sorted({
+            film_work_id
+            for obj_id in obj_ids
+            for film_work_id in self.film_works.get(obj_id, [])
+        })
+
+    async def film_work_selection_data_rule(
+        self, pg_session, obj_ids: list[str]
+    ) -> list:
+        self.requests.append(sorted(obj_ids))
+
+        return [
+            SimpleNamespace(
+                id=obj_id, rating=None, title="Star", description=None
+            )
+            for obj_id in obj_ids
+            if obj_id not in self.deleted
+        ]
+
+
+@pytest.fixture
+def make_fanout(redis_storage, monkeypatch):
+    """Фабрика Fanout со связями из заменителя DB."""
+    monkeypatch.setattr(config, "etl_movies_fanout_batch_size", 2)
+    monkeypatch.setattr(config, "etl_movies_fanout_films_per_run", 4)
+    monkeypatch.setattr(config, "etl_movies_select_limit", 3)
+
+    def make(
+        film_works: dict[str, list[str]]
+    ) -> tuple[Fanout, FakeDependencies]:
+        dependencies = FakeDependencies(film_works)
+        rules = {
+            Person: dependencies.film_work_ids_rule,
+            Genre: dependencies.film_work_ids_rule,
+        }
+        monkeypatch.setattr(Fanout, "model_rules", property(lambda _: rules))
+        monkeypatch.setattr(
+            DependencyRules,
+            "film_work_selection_data_rule",
+            dependencies.film_work_selection_data_rule,
+        )
+
+        return Fanout(redis_storage, None, None), dependencies
+
+    return make
+
+
+def new_ids(count: int) -> list[str]:
+    return [str(uuid.uuid4()) for _ in range(count)]
+
+
+async def produced_ids(redis_storage) -> list[str]:
+    return [
+        fields["id"]
+        for _, fields in await redis_storage._redis.xrange(STREAM)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_resolve_film_works(make_fanout, redis_storage) -> None:
+    """
+    Проверяем, что фильмы изменённых персон выбираются одним запросом на
+    пачку персон, добавляются в множество фильмов без повторов, а ID
+    персон удаляются из множества.
+
+    @type make_fanout: Callable
+    @param make_fanout:
+    @type redis_storage: RedisStorage
+    @param redis_storage:
+    @rtype None:
+    """
+    person_ids, film_ids = new_ids(3), new_ids(3)
+    fanout, dependencies = make_fanout({
+        person_ids[0]: film_ids[:2],
+        person_ids[1]: film_ids[1:],
+        person_ids[2]: film_ids[:1],
+    })
+    await redis_storage.add_to_set(name=PERSON_SET, values=person_ids)
+
+    await fanout._resolve_film_works(
+        model_=Person, film_work_ids_rule=dependencies.film_work_ids_rule
+    )
+
+    assert sorted(sum(dependencies.requests, [])) == sorted(person_ids)
+    assert all(
+        len(request) <= config.etl_movies_fanout_batch_size
+        for request in dependencies.requests
+    )
+    assert sorted(await redis_storage.get_set_all(name=FILM_WORK_SET)) == (
+        sorted(film_ids)
+    )
+    assert not await redis_storage.get_set_all(name=PERSON_SET)
+
+
+@pytest.mark.asyncio
+async def test_produce_film_works_per_run(make_fanout, redis_storage) -> None:
+    """
+    Проверяем, что за один запуск на повторное обогащение отправляется не
+    больше etl_movies_fanout_films_per_run фильмов, остальные - при
+    следующем запуске, и каждый фильм отправляется один раз (в том числе
+    удалённый из DB фильм убирается из множества).
+
+    @type make_fanout: Callable
+    @param make_fanout:
+    @type redis_storage: RedisStorage
+    @param redis_storage:
+    @rtype None:
+    """
+    genre_id, film_ids = new_ids(1)[0], new_ids(6)
+    fanout, dependencies = make_fanout({genre_id: film_ids})
+    dependencies.deleted = {film_ids[0]}
+    await redis_storage.add_to_set(name=GENRE_SET, values=[genre_id])
+
+    await fanout.run()
+
+    assert len(await produced_ids(redis_storage)) <= (
+        config.etl_movies_fanout_films_per_run
+    )
+    assert len(await redis_storage.get_set_all(name=FILM_WORK_SET)) == 2
+
+    await fanout.run()
+
+    ids = await produced_ids(redis_storage)
+    assert sorted(ids) == sorted(film_ids[1:])
+    assert not await redis_storage.get_set_all(name=FILM_WORK_SET)
+    assert not await redis_storage.get_set_all(name=GENRE_SET)
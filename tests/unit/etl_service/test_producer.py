@@ -0,0 +1,252 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+import interface.storage.redis_storage as redis_storage_module
+from core import config
+from extract.movies.producer import MIN_UUID, Producer
+from interface.storage.redis_storage import get_storage_max_unfinished
+from models.movies.pg_models import FilmWork
+from utils.movies_utils.etl_enum import RuleTypes, StreamStages
+from utils.movies_utils.etl_streams import get_stream_name
+
+STREAM = "etl:film_work:produced"
+MODIFIED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeSession:
+    """Заменитель сессии DB: минимальный modified записей."""
+
+    def __init__(self, rows: list):
+        self.rows = rows
+
+    async def scalar(self, stmt):
+        return min((row.modified for row in self.rows), default=None)
+
+
+def make_rows(count: int, modified: datetime = MODIFIED) -> list:
+    return [
+        SimpleNamespace(
+            id=uuid.uuid4(),
+            modified=modified,
+            rating=7.5,
+            title="Star",
+            description=None,
+        )
+        for _ in range(count)
+    ]
+
+
+@pytest.fixture
+def make_producer(redis_storage, monkeypatch):
+    """
+    Фабрика Producer только для фильмов: выборка страницы после водяного
+    знака (modified, id) из списка записей, как в запросе к DB.
+    """
+    monkeypatch.setattr(config, "etl_movies_select_limit", 3)
+
+    def make(rows: list) -> tuple[Producer, list]:
+        producer = Producer(redis_storage, FakeSession(rows), None)
+        selections = []
+
+        async def selection_rule(pg_session, date_modified, last_id):
+            selections.append((date_modified, last_id))
+
+            return sorted(
+                (
+                    row for row in pg_session.rows
+                    if (row.modified, row.id) > (date_modified, last_id)
+                ),
+                key=lambda row: (row.modified, row.id),
+            )[:config.etl_movies_select_limit]
+
+        rules = {
+            FilmWork: {
+                **producer.model_rules[FilmWork],
+                RuleTypes.SELECTION_RULE.value: selection_rule,
+            },
+        }
+        monkeypatch.setattr(Producer, "model_rules", property(lambda _: rules))
+
+        return producer, selections
+
+    return make
+
+
+async def produced_ids(redis_storage) -> list[str]:
+    return [
+        fields["id"]
+        for _, fields in await redis_storage._redis.xrange(STREAM)
+    ]
+
+
+def test_watermark_round_trip() -> None:
+    """
+    Проверяем, что водяной знак (modified, id) сохраняется и читается без
+    потерь.
+
+    @rtype None:
+    """
+    last_id = uuid.uuid4()
+    watermark_str = Producer.watermark_to_str(MODIFIED, last_id)
+
+    assert Producer.str_to_watermark(watermark_str) == (MODIFIED, last_id)
+
+
+def test_legacy_watermark() -> None:
+    """
+    Проверяем, что водяной знак старого формата (только modified) читается
+    как (modified, наименьший UUID): записи с этим modified не пропускаются.
+
+    @rtype None:
+    """
+    watermark_str = MODIFIED.isoformat()
+
+    assert Producer.str_to_watermark(watermark_str) == (MODIFIED, MIN_UUID)
+
+
+@pytest.mark.asyncio
+async def test_produce_pages_with_equal_modified(
+    make_producer, redis_storage
+) -> None:
+    """
+    Проверяем, что записи с одинаковым modified, не умещающиеся в одну
+    страницу выборки, выгружаются ровно один раз, а водяной знак - последняя
+    выгруженная запись.
+
+    @type make_producer: Callable
+    @param make_producer:
+    @type redis_storage: RedisStorage
+    @param redis_storage:
+    @rtype None:
+    """
+    rows = make_rows(7)
+    producer, selections = make_producer(rows)
+
+    await producer.run()
+
+    ids = await produced_ids(redis_storage)
+    assert sorted(ids) == sorted(str(row.id) for row in rows)
+    assert len(selections) == 3
+
+    last_row = max(rows, key=lambda row: row.id)
+    watermark_str = await redis_storage.get_(name="film_work")
+    assert Producer.str_to_watermark(watermark_str) == (
+        MODIFIED, last_row.id
+    )
+
+    # Изменений после водяного знака нет: выгрузка не повторяется
+    await producer.run()
+
+    assert len(await produced_ids(redis_storage)) == len(rows)
+    assert selections[-1] == (MODIFIED, last_row.id)
+
+
+@pytest.mark.asyncio
+async def test_produce_after_legacy_watermark(
+    make_producer, redis_storage
+) -> None:
+    """
+    Проверяем, что после водяного знака старого формата выгружаются и
+    записи с тем же modified, и более поздние.
+
+    @type make_producer: Callable
+    @param make_producer:
+    @type redis_storage: RedisStorage
+    @param redis_storage:
+    @rtype None:
+    """
+    old_rows = make_rows(1, MODIFIED - timedelta(days=1))
+    rows = make_rows(2) + make_rows(1, MODIFIED + timedelta(days=1))
+    producer, _ = make_producer(old_rows + rows)
+    await redis_storage.set_(name="film_work", value=MODIFIED.isoformat())
+
+    await producer.run()
+
+    assert sorted(await produced_ids(redis_storage)) == sorted(
+        str(row.id) for row in rows
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_watermark_initial_load(make_producer) -> None:
+    """
+    Проверяем, что без водяного знака в Storage выгрузка начинается с
+    минимального modified в DB и считается начальной.
+
+    @type make_producer: Callable
+    @param make_producer:
+    @rtype None:
+    """
+    producer, _ = make_producer(
+        make_rows(1) + make_rows(1, MODIFIED + timedelta(days=1))
+    )
+
+    assert await producer._get_watermark(model_=FilmWork) == (
+        MODIFIED, MIN_UUID, True
+    )
+
+
+def test_storage_max_unfinished(monkeypatch) -> None:
+    """
+    Проверяем, что допустимое количество необработанных сообщений - не
+    меньше нескольких пачек этапов и двух страниц выборки Producer.
+
+    @type monkeypatch: pytest.MonkeyPatch
+    @param monkeypatch:
+    @rtype None:
+    """
+    monkeypatch.setattr(config, "etl_movies_stream_max_pending_batches", 4)
+    monkeypatch.setattr(config, "etl_movies_stream_batch_size", 10)
+    monkeypatch.setattr(config, "etl_movies_select_limit", 5)
+
+    assert get_storage_max_unfinished() == 40
+
+    monkeypatch.setattr(config, "etl_movies_select_limit", 30)
+
+    assert get_storage_max_unfinished() == 60
+
+
+@pytest.mark.asyncio
+async def test_back_pressure(
+    make_producer, redis_storage, monkeypatch
+) -> None:
+    """
+    Проверяем, что при заполненных потоках этапов модели Producer ждёт
+    обработки сообщений и только затем сохраняет новые.
+
+    @type make_producer: Callable
+    @param make_producer:
+    @type redis_storage: RedisStorage
+    @param redis_storage:
+    @type monkeypatch: pytest.MonkeyPatch
+    @param monkeypatch:
+    @rtype None:
+    """
+    monkeypatch.setattr(config, "etl_movies_stream_max_pending_batches", 1)
+    monkeypatch.setattr(config, "etl_movies_stream_batch_size", 2)
+    enriched_stream = get_stream_name(
+        key_rule="film_work", stage=StreamStages.ENRICHED
+    )
+    await redis_storage.add_batch_to_stream(
+        name=enriched_stream, values=[{"id": str(i)} for i in range(6)]
+    )
+    sleeps = []
+
+    async def sleep(delay: float) -> None:
+        # Пока Producer ждёт, следующие этапы обрабатывают сообщения
+        sleeps.append(delay)
+        await redis_storage._redis.xtrim(enriched_stream, maxlen=0)
+
+    monkeypatch.setattr(redis_storage_module.asyncio, "sleep", sleep)
+    rows = make_rows(2)
+    producer, _ = make_producer(rows)
+
+    await producer.run()
+
+    assert len(sleeps) == 1
+    assert sorted(await produced_ids(redis_storage)) == sorted(
+        str(row.id) for row in rows
+    )
@@ -0,0 +1,190 @@
+import json
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from core import config
+from extract.movies.enricher import Enricher
+from models.movies.pg_models import FilmWork, Genre
+from schemas.movies_schemas.film_work_models import FilmWorkModel
+from utils.movies_utils.etl_enum import RuleTypes
+from utils.movies_utils.etl_streams import stream_message
+
+STREAM = "etl:film_work:produced"
+NEXT_STREAM = "etl:film_work:enriched"
+GROUP = "enricher"
+CONSUMER = "consumer"
+
+
+def film_message(film_id: str) -> dict:
+    return stream_message(
+        obj_id=film_id,
+        data=FilmWorkModel(
+            id=film_id, imdb_rating=7.5, title="Star", description=""
+        ).model_dump_json(),
+    )
+
+
+async def add_films(redis_storage, count: int) -> list[str]:
+    film_ids = [str(uuid.uuid4()) for _ in range(count)]
+    await redis_storage.add_batch_to_stream(
+        name=STREAM, values=[film_message(film_id) for film_id in film_ids]
+    )
+
+    return film_ids
+
+
+async def read_all(redis_storage, count: int = 2) -> list[list[str]]:
+    """ID фильмов пачек iter_stream_batches (с подтверждением пачек)."""
+    batches = []
+
+    async for batch in redis_storage.iter_stream_batches(
+        name=STREAM, group=GROUP, consumer=CONSUMER, count=count
+    ):
+        batches.append([fields["id"] for _, fields in batch])
+        await redis_storage.move_stream_batch(
+            name=STREAM,
+            group=GROUP,
+            message_ids=[message_id for message_id, _ in batch],
+        )
+
+    return batches
+
+
+async def pending_count(redis_storage) -> int:
+    return (await redis_storage._redis.xpending(STREAM, GROUP))["pending"]
+
+
+@pytest.mark.asyncio
+async def test_iter_stream_batches_pending_first(redis_storage) -> None:
+    """
+    Проверяем, что сообщения, полученные до сбоя, но не подтверждённые,
+    выдаются раньше новых, а после чтения все сообщения подтверждены.
+
+    @type redis_storage: RedisStorage
+    @param redis_storage:
+    @rtype None:
+    """
+    film_ids = await add_films(redis_storage, 5)
+    await redis_storage.create_stream_group(name=STREAM, group=GROUP)
+    # Пачка прочитана, но не подтверждена (сбой обработки)
+    await redis_storage.read_stream_group(
+        name=STREAM, group=GROUP, consumer=CONSUMER, count=3
+    )
+
+    batches = await read_all(redis_storage)
+
+    assert batches == [film_ids[:2], film_ids[2:3], film_ids[3:]]
+    assert await pending_count(redis_storage) == 0
+    assert await redis_storage._redis.xlen(STREAM) == 0
+
+
+@pytest.mark.asyncio
+async def test_iter_stream_batches_deleted_pending(redis_storage) -> None:
+    """
+    Проверяем, что не подтверждённые сообщения, удалённые из потока,
+    только подтверждаются: пачка из одних удалённых сообщений не
+    прерывает чтение, следующие сообщения выдаются.
+
+    @type redis_storage: RedisStorage
+    @param redis_storage:
+    @rtype None:
+    """
+    film_ids = await add_films(redis_storage, 3)
+    await redis_storage.create_stream_group(name=STREAM, group=GROUP)
+    messages = await redis_storage.read_stream_group(
+        name=STREAM, group=GROUP, consumer=CONSUMER, count=3
+    )
+    await redis_storage._redis.xdel(
+        STREAM, *[message_id for message_id, _ in messages[:2]]
+    )
+    new_film_ids = await add_films(redis_storage, 1)
+
+    batches = await read_all(redis_storage)
+
+    assert batches == [film_ids[2:], new_film_ids]
+    assert await pending_count(redis_storage) == 0
+
+
+@pytest.mark.asyncio
+async def test_move_stream_batch(redis_storage) -> None:
+    """
+    Проверяем, что пачка передаётся следующему этапу: сообщения добавлены в
+    следующий поток, а обработанные подтверждены и удалены.
+
+    @type redis_storage: RedisStorage
+    @param redis_storage:
+    @rtype None:
+    """
+    film_ids = await add_films(redis_storage, 2)
+    await redis_storage.create_stream_group(name=STREAM, group=GROUP)
+    messages = await redis_storage.read_stream_group(
+        name=STREAM, group=GROUP, consumer=CONSUMER, count=2
+    )
+
+    await redis_storage.move_stream_batch(
+        name=STREAM,
+        group=GROUP,
+        message_ids=[message_id for message_id, _ in messages],
+        next_name=NEXT_STREAM,
+        values=[fields for _, fields in messages],
+    )
+
+    moved = await redis_storage._redis.xrange(NEXT_STREAM)
+    assert [fields["id"] for _, fields in moved] == film_ids
+    assert await redis_storage._redis.xlen(STREAM) == 0
+    assert await pending_count(redis_storage) == 0
+
+
+@pytest.mark.asyncio
+async def test_enricher_batch(redis_storage, monkeypatch) -> None:
+    """
+    Проверяем, что Enricher выбирает сущности-связки одним запросом на
+    пачку, связывает их с фильмами и передаёт пачку следующему этапу.
+
+    @type redis_storage: RedisStorage
+    @param redis_storage:
+    @type monkeypatch: pytest.MonkeyPatch
+    @param monkeypatch:
+    @rtype None:
+    """
+    film_ids = await add_films(redis_storage, 3)
+    genre_id = str(uuid.uuid4())
+    selections = []
+
+    async def selection_rule(pg_session, obj_ids: list[str]) -> dict:
+        selections.append(sorted(obj_ids))
+        genre = SimpleNamespace(
+            film_work_id=film_ids[0],
+            genre_id=genre_id,
+            genre_name="Sci-Fi",
+            genre_description=None,
+        )
+
+        return {film_ids[0]: {Genre.model_name(): [genre]}}
+
+    enricher = Enricher(redis_storage, None, None)
+    rules = {
+        FilmWork: {
+            **enricher.model_rules[FilmWork],
+            RuleTypes.SELECTION_RULE.value: selection_rule,
+        },
+    }
+    monkeypatch.setattr(config, "etl_movies_stream_batch_size", 2)
+    monkeypatch.setattr(Enricher, "model_rules", property(lambda _: rules))
+
+    await enricher.run()
+
+    assert selections == [sorted(film_ids[:2]), film_ids[2:]]
+
+    enriched = [
+        json.loads(fields["data"])
+        for _, fields in await redis_storage._redis.xrange(NEXT_STREAM)
+    ]
+    assert [film["id"] for film in enriched] == film_ids
+    assert all(film["was_enrich"] for film in enriched)
+    assert [genre["id"] for genre in enriched[0]["genres"]] == [genre_id]
+    assert enriched[0]["genres"][0]["description"] == ""
+    assert not enriched[1]["genres"]
+    assert await redis_storage._redis.xlen(STREAM) == 0
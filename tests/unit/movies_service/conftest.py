@@ -0,0 +1,73 @@
+import asyncio
+import os
+import sys
+from functools import partial
+
+import fakeredis.aioredis
+import pytest
+import pytest_asyncio
+
+from .helpers import FakeElasticService
+
+# Модули movies_service импортируются от корня сервиса (src.*)
+sys.path.insert(
+    0,
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "../../../movies_service")
+    ),
+)
+os.environ.setdefault("AUTH_SERVICE_HOST", "localhost")
+os.environ.setdefault("AUTH_SERVICE_PORT", "8000")
+
+
+@pytest_asyncio.fixture
+async def redis_client():
+    """
+    Клиент Redis в памяти (fakeredis, с поддержкой Lua-скриптов).
+
+    @rtype fakeredis.aioredis.FakeRedis:
+    @return client:
+    """
+    client = fakeredis.aioredis.FakeRedis()
+
+    try:
+        yield client
+
+    finally:
+        await client.close()
+
+
+@pytest.fixture
+def es_service() -> FakeElasticService:
+    return FakeElasticService()
+
+
+@pytest_asyncio.fixture
+async def film_service(redis_client, es_service):
+    """
+    FilmService с Redis в памяти, заменителем Elasticsearch и собственным
+    локальным кешем. После теста дожидается фоновых задач сервиса
+    (запись в кеш).
+    """
+    from src.services.film_service import FilmService
+    from src.utils.cache_service import CacheService
+    from src.utils.local_cache import LocalCache
+
+    service = FilmService(
+        CacheService(redis_client), es_service, LocalCache(100, 30)
+    )
+
+    yield service
+
+    await _wait_background(service)
+
+
+async def _wait_background(service) -> None:
+    while service._background_tasks:
+        await asyncio.gather(*service._background_tasks)
+
+
+@pytest.fixture
+def wait_background(film_service):
+    """Ожидание фоновых задач FilmService (запись в кеш, обновление)."""
+    return partial(_wait_background, film_service)
@@ -0,0 +1,33 @@
+import uuid
+
+
+class FakeElasticService:
+    """
+    Заменитель ElasticService: поиск возвращает документы docs (все, без
+    учёта запроса) и считает обращения.
+    """
+
+    def __init__(self):
+        self.docs: list[dict] = []
+        self.calls = 0
+
+    async def search(
+        self, index: str | None, query: dict, log_info: str = ""
+    ) -> dict:
+        self.calls += 1
+
+        return {"hits": {"hits": [{"_source": doc} for doc in self.docs]}}
+
+
+def make_film(film_id: str | None = None, rating: float = 7.5) -> dict:
+    """Документ фильма индекса film_work."""
+    return {
+        "id": film_id or str(uuid.uuid4()),
+        "title": "Film",
+        "imdb_rating": rating,
+        "description": "",
+        "genres": [],
+        "actors": [],
+        "writers": [],
+        "directors": [],
+    }
@@ -0,0 +1,142 @@
+import orjson
+import pytest
+
+from src.core.config import settings
+from src.core.exceptions import JsonLoadsError
+from src.utils.cache_codec import (CODECS, JsonCodec, MsgpackCodec,
+                                   decode_entry, encode_entry,
+                                   get_cache_codec)
+from src.utils.cache_entry import CacheEntry
+
+FILMS = orjson.dumps([
+    {"uuid": str(i), "title": f"Film {i}", "imdb_rating": 7.5}
+    for i in range(200)
+])
+VALUES = [
+    FILMS,
+    orjson.dumps({"uuid": "1", "title": "Film"}),
+    orjson.dumps([{"uuid": "1"}, {"uuid": "2", "title": "Film"}]),
+    orjson.dumps([]),
+]
+
+
+@pytest.fixture
+def use_codec(monkeypatch):
+    """Выбор кодека для записи в кеш (cache_codec из настроек)."""
+    def factory(name: str) -> None:
+        monkeypatch.setattr(settings, "cache_codec", name)
+        get_cache_codec.cache_clear()
+
+    yield factory
+
+    get_cache_codec.cache_clear()
+
+
+@pytest.mark.parametrize("codec_name", ["json", "msgpack"])
+@pytest.mark.parametrize("payload", VALUES)
+def test_round_trip(use_codec, codec_name: str, payload: bytes) -> None:
+    """
+    Проверяем, что запись кеша восстанавливается кодеком без изменений,
+    включая тело ответа (побайтно) и метаданные.
+
+    @type use_codec:
+    @param use_codec:
+    @type codec_name: str
+    @param codec_name:
+    @type payload: bytes
+    @param payload:
+    @rtype None:
+    """
+    use_codec(codec_name)
+    entry = CacheEntry.create(payload, count=1, ttl=60, delta=0.5)
+
+    decoded = decode_entry(encode_entry(entry))
+
+    assert decoded.payload == entry.payload
+    assert decoded.etag == entry.etag
+    assert decoded.meta() == entry.meta()
+    assert decoded.encodings == entry.encodings
+
+
+def test_msgpack_is_columnar_without_encodings() -> None:
+    """
+    Проверяем, что MessagePack хранит список объектов колонками и не
+    хранит сжатые варианты тела (они создаются при декодировании).
+
+    @rtype None:
+    """
+    entry = CacheEntry.create(FILMS, count=200, ttl=60)
+    data = MsgpackCodec().encode(entry)
+
+    assert entry.encodings, "Ожидался сжатый вариант тела"
+    assert len(data) < len(JsonCodec().encode(entry))
+    assert MsgpackCodec().decode(data).encodings == entry.encodings
+
+
+def test_versions_are_decoded_regardless_of_current_codec(use_codec) -> None:
+    """
+    Проверяем, что записи, закодированные разными кодеками, читаются при
+    любом текущем кодеке (по байту версии).
+
+    @type use_codec:
+    @param use_codec:
+    @rtype None:
+    """
+    entry = CacheEntry.create(FILMS, count=200, ttl=60)
+    encoded = {}
+
+    for codec_name in ("json", "msgpack"):
+        use_codec(codec_name)
+        encoded[codec_name] = encode_entry(entry)
+
+    assert encoded["json"][0] == JsonCodec.version
+    assert encoded["msgpack"][0] == MsgpackCodec.version
+
+    for data in encoded.values():
+        assert decode_entry(data).payload == entry.payload
+
+
+def test_legacy_entry_without_version_byte() -> None:
+    """
+    Проверяем, что запись формата JSON без байта версии (до появления
+    кодеков) читается.
+
+    @rtype None:
+    """
+    entry = CacheEntry.create(FILMS, count=200, ttl=60)
+
+    assert decode_entry(entry.dumps()).payload == entry.payload
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        bytes((99,)) + b"data",
+        b'[{"uuid": "1"}]',
+        b'{"uuid": "1"}',
+        bytes((JsonCodec.version,)) + b"not json",
+        bytes((MsgpackCodec.version,)) + b"\xc1",
+    ],
+)
+def test_unknown_or_broken_entries(data: bytes) -> None:
+    """
+    Проверяем, что записи неизвестной версии, старого формата (значение
+    без заголовка) и повреждённые записи считаются отсутствующими в кеше.
+
+    @type data: bytes
+    @param data:
+    @rtype None:
+    """
+    with pytest.raises(JsonLoadsError):
+        decode_entry(data)
+
+
+def test_codecs_are_registered_by_version() -> None:
+    """
+    Проверяем реестр кодеков по байту версии.
+
+    @rtype None:
+    """
+    assert isinstance(CODECS[JsonCodec.version], JsonCodec)
+    assert isinstance(CODECS[MsgpackCodec.version], MsgpackCodec)
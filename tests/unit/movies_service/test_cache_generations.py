@@ -0,0 +1,143 @@
+import asyncio
+from contextlib import suppress
+
+import orjson
+import pytest
+
+from src.utils.cache_generations import CacheGenerations
+from src.utils.local_cache import LocalCache
+
+from .helpers import make_film
+
+STREAM = "movies:cache:changes"
+
+
+async def add_change(
+    redis_client, index: str, ids: list, generation: int
+) -> None:
+    await redis_client.xadd(STREAM, {
+        "index": index, "ids": orjson.dumps(ids), "generation": generation,
+    })
+
+
+async def wait_for(condition, timeout: float = 2.0) -> None:
+    """Ожидание выполнения условия фоновой задачей."""
+    async def poll():
+        while not condition():
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+def test_generation_does_not_decrease() -> None:
+    """
+    Проверяем, что номер поколения не уменьшается при повторных сообщениях.
+
+    @rtype None:
+    """
+    generations = CacheGenerations()
+    generations.set("film_work", 3)
+    generations.set("film_work", 2)
+
+    assert generations.get("film_work") == 3
+    assert generations.get("genre") == 0
+
+
+def test_changed_keys() -> None:
+    """
+    Проверяем ключи записей по ID, затронутых изменением индекса: фильмы
+    персоны берутся в текущем поколении индекса film_work.
+
+    @rtype None:
+    """
+    generations = CacheGenerations()
+    generations.set("film_work", 5)
+
+    assert generations.get_changed_keys("film_work", ["1"]) == ["film:1"]
+    assert generations.get_changed_keys("genre", ["1"]) == ["genre:1"]
+    assert generations.get_changed_keys("person", ["1"]) == [
+        "person:1", "person_films:5:1"
+    ]
+    assert generations.get_changed_keys("unknown", ["1"]) == []
+
+
+@pytest.mark.asyncio
+async def test_load(redis_client) -> None:
+    """
+    Проверяем загрузку номеров поколений из Redis.
+
+    @type redis_client:
+    @param redis_client:
+    @rtype None:
+    """
+    await redis_client.set("cache_generation:film_work", 7)
+    generations = CacheGenerations()
+
+    await generations.load(redis_client)
+
+    assert generations.get("film_work") == 7
+    assert generations.get("person") == 0
+
+
+@pytest.mark.asyncio
+async def test_listen_changes(redis_client) -> None:
+    """
+    Проверяем, что воркер по потоку изменений удаляет записи только из
+    локального кеша (из Redis их удаляет ETL) и переходит на новое
+    поколение, а сообщения, добавленные до запуска, не применяет.
+
+    @type redis_client:
+    @param redis_client:
+    @rtype None:
+    """
+    generations, local_cache = CacheGenerations(), LocalCache(100, 60)
+    await add_change(redis_client, "genre", ["old"], 1)
+    local_cache.set("genre:old", "old")
+    local_cache.set("film:1", "film")
+    await redis_client.set("film:1", "film")
+
+    task = asyncio.create_task(
+        generations.listen_changes(redis_client, local_cache, STREAM)
+    )
+
+    try:
+        await asyncio.sleep(0.05)
+        await redis_client.xadd(STREAM, {"index": "film_work"})
+        await add_change(redis_client, "film_work", ["1"], 2)
+        await wait_for(lambda: generations.get("film_work") == 2)
+
+    finally:
+        task.cancel()
+
+        with suppress(asyncio.CancelledError):
+            await task
+
+    assert local_cache.get("film:1") is None
+    assert await redis_client.get("film:1") == b"film"
+    assert local_cache.get("genre:old") == "old"
+
+
+@pytest.mark.asyncio
+async def test_list_keys_follow_generation(film_service, es_service) -> None:
+    """
+    Проверяем, что после смены поколения индекса списки фильмов
+    запрашиваются заново (под ключами нового поколения).
+
+    @type film_service:
+    @param film_service:
+    @type es_service:
+    @param es_service:
+    @rtype None:
+    """
+    es_service.docs = [make_film()]
+    generations = film_service.cache_generations
+
+    await film_service.get_films(page_size=5)
+    await film_service.get_films(page_size=5)
+
+    assert es_service.calls == 1
+
+    generations.set("film_work", generations.get("film_work") + 1)
+    await film_service.get_films(page_size=5)
+
+    assert es_service.calls == 2
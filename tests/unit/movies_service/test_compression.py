@@ -0,0 +1,134 @@
+import gzip
+
+import pytest
+from starlette.requests import Request
+
+from src.core.config import settings
+from src.utils.cache_entry import CacheEntry
+from src.utils.cached_response import CachedJSONResponse
+from src.utils.compression import (choose_encoding, compress_payload,
+                                   parse_accept_encoding)
+
+PAYLOAD = b"[" + b",".join(
+    b'{"uuid":"%d","title":"Film %d"}' % (i, i) for i in range(100)
+) + b"]"
+
+
+def make_request(headers: dict[str, str]) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [
+            (name.encode(), value.encode()) for name, value in headers.items()
+        ],
+    })
+
+
+def test_parse_accept_encoding() -> None:
+    """
+    Проверяем разбор Accept-Encoding: q-значения, регистр и некорректные q.
+
+    @rtype None:
+    """
+    assert parse_accept_encoding("gzip, BR;q=0.5, zstd;q=x, ") == {
+        "gzip": 1.0, "br": 0.5, "zstd": 0.0
+    }
+    assert parse_accept_encoding(None) == {}
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br", "gzip"),
+        ("br;q=1.0, gzip;q=0.5", "gzip"),
+        ("*", "gzip"),
+        ("gzip;q=0", None),
+        ("identity", None),
+        (None, None),
+    ],
+)
+def test_choose_encoding(accept_encoding: str | None, expected) -> None:
+    """
+    Проверяем выбор кодировки среди имеющихся вариантов по Accept-Encoding.
+
+    @type accept_encoding: str | None
+    @param accept_encoding:
+    @type expected:
+    @param expected:
+    @rtype None:
+    """
+    assert choose_encoding(accept_encoding, {"gzip": b""}) == expected
+
+
+def test_choose_encoding_by_quality() -> None:
+    """
+    Проверяем, что из нескольких вариантов выбирается вариант с наибольшим
+    q, а при равенстве — первый в порядке предпочтения сервиса.
+
+    @rtype None:
+    """
+    available = {"br": b"", "gzip": b""}
+
+    assert choose_encoding("gzip, br;q=0.5", available) == "gzip"
+    assert choose_encoding("gzip, br", available) == "br"
+
+
+def test_compress_payload(monkeypatch) -> None:
+    """
+    Проверяем, что тело сжимается только в настроенной кодировке и не
+    сжимается, если оно меньше cache_compression_min_size или сжатие
+    отключено.
+
+    @type monkeypatch:
+    @param monkeypatch:
+    @rtype None:
+    """
+    monkeypatch.setattr(settings, "cache_compression_encoding", "gzip")
+    monkeypatch.setattr(settings, "cache_compression_min_size", 1024)
+
+    variants = compress_payload(PAYLOAD)
+
+    assert list(variants) == ["gzip"]
+    assert gzip.decompress(variants["gzip"]) == PAYLOAD
+    assert compress_payload(b'{"uuid":"1"}') == {}
+
+    monkeypatch.setattr(settings, "cache_compression_encoding", None)
+
+    assert compress_payload(PAYLOAD) == {}
+
+
+def test_cached_response_negotiation(monkeypatch) -> None:
+    """
+    Проверяем, что ответ из кеша отдаётся сжатым только клиентам, которые
+    принимают кодировку, со своим ETag и заголовком Vary, а условный
+    запрос со сжатым ETag получает 304.
+
+    @type monkeypatch:
+    @param monkeypatch:
+    @rtype None:
+    """
+    monkeypatch.setattr(settings, "cache_compression_encoding", "gzip")
+    monkeypatch.setattr(settings, "cache_compression_min_size", 1024)
+    entry = CacheEntry.create(PAYLOAD, count=100, ttl=60)
+
+    response = CachedJSONResponse(
+        entry, make_request({"accept-encoding": "gzip, br"})
+    )
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == f'{entry.etag[:-1]}-gzip"'
+    assert gzip.decompress(response.body) == PAYLOAD
+
+    plain = CachedJSONResponse(entry, make_request({}))
+
+    assert "content-encoding" not in plain.headers
+    assert plain.headers["etag"] == entry.etag
+    assert plain.body == PAYLOAD
+
+    not_modified = CachedJSONResponse(entry, make_request({
+        "accept-encoding": "gzip",
+        "if-none-match": response.headers["etag"],
+    }))
+
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
@@ -0,0 +1,162 @@
+import pytest
+import pytest_asyncio
+from redis.exceptions import ConnectionError
+
+from src.utils.rate_limiter import HybridRateLimiter
+
+
+@pytest_asyncio.fixture
+async def make_limiter():
+    """
+    Фабрика ограничителей (limit=10 за 60 секунд). Фоновая синхронизация
+    не мешает тестам (sync вызывается явно) и останавливается после теста.
+    """
+    limiters = []
+
+    def factory(redis_client, **kwargs) -> HybridRateLimiter:
+        limiter = HybridRateLimiter(
+            redis_client, limit=10, window=60, sync_interval=3600, **kwargs
+        )
+        limiters.append(limiter)
+
+        return limiter
+
+    yield factory
+
+    for limiter in limiters:
+        if limiter._sync_task is not None:
+            limiter._sync_task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_local_bucket_is_scaled_by_workers(
+    redis_client, make_limiter
+) -> None:
+    """
+    Проверяем, что воркеры вместе пропускают не больше limit запросов до
+    синхронизации: ёмкость локального ведра делится на количество воркеров.
+
+    @type redis_client:
+    @param redis_client:
+    @type make_limiter:
+    @param make_limiter:
+    @rtype None:
+    """
+    workers = [make_limiter(redis_client, workers=2) for _ in range(2)]
+    allowed = [
+        (await worker.hit("ratelimit:client"))[0]
+        for worker in workers
+        for _ in range(10)
+    ]
+
+    assert allowed.count(True) == 10
+
+
+@pytest.mark.asyncio
+async def test_sync_blocks_keys_over_limit(
+    redis_client, make_limiter
+) -> None:
+    """
+    Проверяем, что после синхронизации ключ, превысивший общий лимит,
+    отклоняется локально, не дожидаясь опустошения ведра.
+
+    @type redis_client:
+    @param redis_client:
+    @type make_limiter:
+    @param make_limiter:
+    @rtype None:
+    """
+    first, second = make_limiter(redis_client), make_limiter(redis_client)
+
+    for worker in (first, second):
+        for _ in range(6):
+            assert (await worker.hit("ratelimit:client"))[0]
+
+    await first.sync()
+    await second.sync()
+
+    allowed, retry_after = await second.hit("ratelimit:client")
+
+    assert not allowed
+    assert retry_after > 0
+
+
+@pytest.mark.asyncio
+async def test_sync_marks_hot_keys(
+    redis_client, make_limiter
+) -> None:
+    """
+    Проверяем, что ключ, приблизившийся к лимиту, проверяется в Redis
+    синхронно.
+
+    @type redis_client:
+    @param redis_client:
+    @type make_limiter:
+    @param make_limiter:
+    @rtype None:
+    """
+    limiter = make_limiter(redis_client, hot_ratio=0.5)
+
+    for _ in range(6):
+        await limiter.hit("ratelimit:client")
+
+    await limiter.sync()
+
+    assert limiter._buckets["ratelimit:client"].hot
+    assert await limiter.hit("ratelimit:client") == (True, 0)
+
+
+@pytest.mark.asyncio
+async def test_pending_is_restored_on_sync_error(
+    redis_client, make_limiter
+) -> None:
+    """
+    Проверяем, что при ошибке Redis неучтённые запросы остаются в локальных
+    счётчиках и учитываются следующей синхронизацией.
+
+    @type redis_client:
+    @param redis_client:
+    @type make_limiter:
+    @param make_limiter:
+    @rtype None:
+    """
+    limiter = make_limiter(redis_client)
+
+    for _ in range(3):
+        await limiter.hit("ratelimit:client")
+
+    sync_script = limiter._sync_script
+
+    async def fail(**kwargs):
+        raise ConnectionError("Redis недоступен")
+
+    limiter._sync_script = fail
+
+    with pytest.raises(ConnectionError):
+        await limiter.sync()
+
+    assert limiter._buckets["ratelimit:client"].pending == 3
+
+    limiter._sync_script = sync_script
+    await limiter.sync()
+
+    assert limiter._buckets["ratelimit:client"].pending == 0
+    keys = await redis_client.keys("ratelimit:client:*")
+
+    assert sum(map(int, await redis_client.mget(keys))) == 3
+
+
+def test_only_sliding_window_is_supported(
+    redis_client, make_limiter
+) -> None:
+    """
+    Проверяем, что стратегии, кроме sliding_window, отклоняются.
+
+    @type redis_client:
+    @param redis_client:
+    @type make_limiter:
+    @param make_limiter:
+    @rtype None:
+    """
+    with pytest.raises(ValueError):
+        make_limiter(redis_client, strategy="token_bucket")
@@ -0,0 +1,108 @@
+import uuid
+
+import pytest
+
+from src.core.config import settings
+from src.utils.cache_codec import decode_entry
+
+from .helpers import make_film
+
+
+@pytest.mark.asyncio
+async def test_missing_film_is_cached_as_tombstone(
+    film_service, es_service, redis_client, wait_background
+) -> None:
+    """
+    Проверяем, что отсутствующий фильм кешируется записью-надгробием с
+    коротким TTL, и повторный запрос не доходит до Elasticsearch.
+
+    @type film_service:
+    @param film_service:
+    @type es_service:
+    @param es_service:
+    @type redis_client:
+    @param redis_client:
+    @type wait_background:
+    @param wait_background:
+    @rtype None:
+    """
+    film_id = str(uuid.uuid4())
+
+    entry = await film_service.get_film_by_id(film_id, raw=True)
+    await wait_background()
+
+    assert entry.negative and entry.count == 0
+    assert 0 < await redis_client.ttl(f"film:{film_id}") <= (
+        settings.cache_negative_ttl
+    )
+
+    # Надгробие читается из Redis, а не только из локального кеша
+    film_service.local_cache.clear()
+
+    assert await film_service.get_film_by_id(film_id) == []
+    assert es_service.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_found_film_is_not_tombstone(
+    film_service, es_service, redis_client, wait_background
+) -> None:
+    """
+    Проверяем, что найденный фильм кешируется обычной записью.
+
+    @type film_service:
+    @param film_service:
+    @type es_service:
+    @param es_service:
+    @type redis_client:
+    @param redis_client:
+    @type wait_background:
+    @param wait_background:
+    @rtype None:
+    """
+    film_id = str(uuid.uuid4())
+    es_service.docs = [make_film(film_id)]
+
+    entry = await film_service.get_film_by_id(film_id, raw=True)
+    await wait_background()
+
+    assert not entry.negative and entry.count == 1
+    assert await redis_client.ttl(f"film:{film_id}") > (
+        settings.cache_negative_ttl
+    )
+
+
+@pytest.mark.asyncio
+async def test_batch_lookup_caches_missing_ids(
+    film_service, es_service, redis_client, wait_background
+) -> None:
+    """
+    Проверяем, что пакетный запрос кеширует надгробия для отсутствующих ID
+    и не запрашивает их повторно.
+
+    @type film_service:
+    @param film_service:
+    @type es_service:
+    @param es_service:
+    @type redis_client:
+    @param redis_client:
+    @type wait_background:
+    @param wait_background:
+    @rtype None:
+    """
+    found_id, missing_id = str(uuid.uuid4()), str(uuid.uuid4())
+    es_service.docs = [make_film(found_id)]
+
+    entry = await film_service.get_films_by_ids(
+        [found_id, missing_id], raw=True
+    )
+    await wait_background()
+
+    assert entry.count == 1
+    assert not decode_entry(await redis_client.get(f"film:{found_id}")).negative
+    assert decode_entry(await redis_client.get(f"film:{missing_id}")).negative
+
+    film_service.local_cache.clear()
+    await film_service.get_films_by_ids([found_id, missing_id], raw=True)
+
+    assert es_service.calls == 1
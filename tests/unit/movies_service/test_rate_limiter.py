@@ -0,0 +1,60 @@
+import pytest
+
+from src.utils.rate_limiter import RATE_LIMIT_STRATEGIES, RateLimiter
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", sorted(RATE_LIMIT_STRATEGIES))
+async def test_limit_is_enforced(redis_client, strategy: str) -> None:
+    """
+    Проверяем, что каждая стратегия пропускает limit запросов, а следующий
+    отклоняет с положительным временем до повтора.
+
+    @type redis_client:
+    @param redis_client:
+    @type strategy: str
+    @param strategy:
+    @rtype None:
+    """
+    limiter = RateLimiter(redis_client, limit=3, window=60, strategy=strategy)
+
+    for _ in range(3):
+        assert await limiter.hit("ratelimit:client") == (True, 0)
+
+    allowed, retry_after = await limiter.hit("ratelimit:client")
+
+    assert not allowed
+    assert 0 < retry_after <= 60
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("strategy", sorted(RATE_LIMIT_STRATEGIES))
+async def test_keys_are_limited_separately(
+    redis_client, strategy: str
+) -> None:
+    """
+    Проверяем, что лимит считается отдельно по каждому ключу.
+
+    @type redis_client:
+    @param redis_client:
+    @type strategy: str
+    @param strategy:
+    @rtype None:
+    """
+    limiter = RateLimiter(redis_client, limit=1, window=60, strategy=strategy)
+
+    assert (await limiter.hit("ratelimit:a"))[0]
+    assert not (await limiter.hit("ratelimit:a"))[0]
+    assert (await limiter.hit("ratelimit:b"))[0]
+
+
+def test_unknown_strategy(redis_client) -> None:
+    """
+    Проверяем, что неизвестная стратегия отклоняется при создании.
+
+    @type redis_client:
+    @param redis_client:
+    @rtype None:
+    """
+    with pytest.raises(ValueError):
+        RateLimiter(redis_client, limit=1, window=60, strategy="unknown")
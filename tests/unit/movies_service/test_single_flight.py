@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from src.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_coalesced() -> None:
+    """
+    Проверяем, что одновременные вызовы с одним ключом выполняют функцию
+    один раз и получают один и тот же результат.
+
+    @rtype None:
+    """
+    single_flight, calls = SingleFlight(), []
+
+    async def fetch() -> list[int]:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return [1, 2, 3]
+
+    results = await asyncio.gather(
+        *(single_flight.do("key", fetch) for _ in range(10))
+    )
+
+    assert len(calls) == 1, "Функция должна выполниться один раз"
+    assert all(result is results[0] for result in results)
+    assert single_flight.in_flight() == 0, "Запрос не удалён из реестра"
+
+
+@pytest.mark.asyncio
+async def test_different_keys_are_not_coalesced() -> None:
+    """
+    Проверяем, что вызовы с разными ключами выполняются независимо.
+
+    @rtype None:
+    """
+    single_flight, calls = SingleFlight(), []
+
+    async def fetch(key: str) -> str:
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return key
+
+    results = await asyncio.gather(
+        single_flight.do("a", lambda: fetch("a")),
+        single_flight.do("b", lambda: fetch("b")),
+    )
+
+    assert results == ["a", "b"]
+    assert sorted(calls) == ["a", "b"]
+
+
+@pytest.mark.asyncio
+async def test_exception_is_shared_and_not_cached() -> None:
+    """
+    Проверяем, что исключение получают все ожидающие, а следующий вызов
+    после ошибки выполняет функцию заново.
+
+    @rtype None:
+    """
+    single_flight, calls = SingleFlight(), []
+
+    async def fail() -> None:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("error")
+
+    results = await asyncio.gather(
+        *(single_flight.do("key", fail) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    assert len(calls) == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+    with pytest.raises(ValueError):
+        await single_flight.do("key", fail)
+
+    assert len(calls) == 2, "Ошибка не должна запоминаться"
+
+
+@pytest.mark.asyncio
+async def test_waiter_cancellation_does_not_cancel_flight() -> None:
+    """
+    Проверяем, что отмена одного из ожидающих не прерывает запрос для
+    остальных.
+
+    @rtype None:
+    """
+    single_flight = SingleFlight()
+
+    async def fetch() -> str:
+        await asyncio.sleep(0.05)
+        return "value"
+
+    first = asyncio.create_task(single_flight.do("key", fetch))
+    second = asyncio.create_task(single_flight.do("key", fetch))
+    await asyncio.sleep(0.01)
+    first.cancel()
+
+    assert await second == "value"
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
@@ -0,0 +1,97 @@
+from src.utils.local_cache import LocalCache
+from src.utils.tiny_lfu import TinyLFU
+
+
+def test_frequent_candidate_is_admitted() -> None:
+    """
+    Проверяем, что ключ допускается в кеш, только если он запрашивался
+    чаще вытесняемого.
+
+    @rtype None:
+    """
+    admission = TinyLFU(width=100)
+
+    for _ in range(3):
+        admission.record("hot")
+
+    admission.record("rare")
+
+    assert admission.admit("hot", "rare")
+    assert not admission.admit("rare", "hot")
+    assert not admission.admit("rare", "rare"), "При равенстве не допускается"
+
+
+def test_counters_are_limited_and_aged() -> None:
+    """
+    Проверяем, что счётчик ограничен max_count, а после sample_size
+    обращений счётчики делятся пополам.
+
+    @rtype None:
+    """
+    admission = TinyLFU(width=100, sample_size=1000, max_count=15)
+
+    for _ in range(20):
+        admission.record("key")
+
+    assert admission.estimate("key") == 15
+
+    admission = TinyLFU(width=100, sample_size=8)
+
+    for _ in range(8):
+        admission.record("key")
+
+    assert admission.estimate("key") == 4
+
+
+def test_local_cache_rejects_rare_keys_when_full() -> None:
+    """
+    Проверяем, что в заполненный локальный кеш не допускаются редкие ключи
+    семейств с фильтром допуска, а ключи других семейств допускаются.
+
+    @rtype None:
+    """
+    cache = LocalCache(
+        max_size=2,
+        ttl=60,
+        admission=TinyLFU(width=100),
+        admission_prefixes=("film_search",),
+    )
+
+    for key in ("film_search:a", "film_search:b"):
+        for _ in range(3):
+            cache.get(key)
+
+        cache.set(key, key)
+
+    cache.set("film_search:rare", "rare")
+
+    assert cache.get("film_search:rare") is None
+    assert cache.get("film_search:a") == "film_search:a"
+    assert cache.stats()["prefixes"]["film_search"]["rejected"] == 1
+
+    cache.set("film:1", "film")
+
+    assert cache.get("film:1") == "film", "Ключ без фильтра допускается"
+
+
+def test_local_cache_admits_frequent_key_when_full() -> None:
+    """
+    Проверяем, что часто запрашиваемый ключ вытесняет более редкий.
+
+    @rtype None:
+    """
+    cache = LocalCache(
+        max_size=1,
+        ttl=60,
+        admission=TinyLFU(width=100),
+        admission_prefixes=("film_search",),
+    )
+    cache.set("film_search:old", "old")
+
+    for _ in range(3):
+        cache.get("film_search:new")
+
+    cache.set("film_search:new", "new")
+
+    assert cache.get("film_search:new") == "new"
+    assert cache.get("film_search:old") is None
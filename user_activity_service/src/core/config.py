@@ -1,6 +1,6 @@
 import os
 from functools import cached_property
-from typing import Any
+from typing import Any, Literal
 
 from pydantic import Field, computed_field
 from pydantic_settings import BaseSettings
@@ -72,6 +72,27 @@ class Settings(BaseSettings):
 
     rate_limit: int = Field(5, alias="RATE_LIMIT")
     rate_limit_window: int = Field(60, alias="RATE_LIMIT_WINDOW")
+    # Стратегия RateLimit: fixed_window, sliding_window или token_bucket
+    rate_limit_strategy: Literal[
+        "fixed_window", "sliding_window", "token_bucket"
+    ] = Field("sliding_window", alias="RATE_LIMIT_STRATEGY")
+    # Локальные маркерные вёдра с пакетной синхронизацией в Redis (только
+    # для стратегии sliding_window)
+    rate_limit_local_enabled: bool = Field(
+        False, alias="RATE_LIMIT_LOCAL_ENABLED"
+    )
+    # Количество воркеров всех экземпляров сервиса: лимит делится между
+    # их локальными вёдрами
+    rate_limit_local_workers: int = Field(
+        1, alias="RATE_LIMIT_LOCAL_WORKERS"
+    )
+    rate_limit_sync_interval: float = Field(
+        0.2, alias="RATE_LIMIT_SYNC_INTERVAL"
+    )
+    rate_limit_hot_ratio: float = Field(0.8, alias="RATE_LIMIT_HOT_RATIO")
+    redis_rate_limit_max_connections: int = Field(
+        50, alias="REDIS_RATE_LIMIT_MAX_CONNECTIONS"
+    )
 
     @computed_field
     @property
@@ -8,7 +8,7 @@ from src.api.v1 import (bookmark, film_rating, film_rating_review, film_review,
                         healthcheck)
 from src.core.config import settings
 from src.db.mongo_client import get_mongo_client
-from src.db.redis_client import get_redis_cache
+from src.db.redis_client import close_redis_rate_limit, get_redis_cache
 from src.dependencies import check_request_id
 from src.middleware import AsyncRateLimitMiddleware
 
@@ -81,6 +81,9 @@ async def shutdown():
     if redis_cache:
         await redis_cache.close()
 
+    # Закрытие пула соединений с Redis для RateLimit
+    await close_redis_rate_limit()
+
     # Закрытие подключения к MongoDB
     mongo_client = await get_mongo_client()
     if mongo_client: